@@ -1,19 +1,115 @@
 """API route handlers."""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from contextlib import contextmanager
+from typing import Generator, Optional
 import time
 
-from models.schemas import EmotionQuery, GuidanceResponse, HealthResponse
+from models.schemas import (
+    SearchOptions,
+    EmotionQuery,
+    BatchEmotionQuery,
+    GuidanceResponse,
+    BatchGuidanceResponse,
+    ArabicSearchQuery,
+    ArabicSearchResponse,
+    HealthResponse,
+    StatsResponse
+)
 from services.guidance import GuidanceService
+from services.arabic_search import ArabicSearchService
 from services.vector_store import get_vector_store, VectorStoreService
+from services.document_store import get_document_store, DocumentStore
+from services.response_cache import get_response_cache, SemanticResponseCache
+from services.metadata_index import get_metadata_index, MetadataIndex
+from services.search_filter import SearchFilter
+from services.lexical_index import get_lexical_index, LexicalIndex
+from services.arabic_index import get_arabic_index, ArabicTextIndex
+from services.executor import get_guidance_executor, get_loop_lag_monitor, GuidanceExecutor
 from db.session import get_db
 from core.logging import get_logger
-from core.exceptions import IslamicGuidanceException
+from core.exceptions import IslamicGuidanceException, ServiceOverloadedException
 
 logger = get_logger(__name__)
 router = APIRouter()
 
 
+def get_guidance_service(
+    vector_store: VectorStoreService = Depends(get_vector_store),
+    document_store: Optional[DocumentStore] = Depends(get_document_store),
+    response_cache: Optional[SemanticResponseCache] = Depends(get_response_cache),
+    lexical_index: Optional[LexicalIndex] = Depends(get_lexical_index)
+) -> Generator[GuidanceService, None, None]:
+    """
+    Dependency for getting a guidance service.
+    
+    A database session is only opened when there is no document store.
+    The lexical index is only requested so that it is rebuilt, and
+    attached to the vector store, after the indexes change.
+    
+    Yields:
+        Guidance service
+    """
+    if document_store is not None:
+        yield GuidanceService(None, vector_store, document_store, response_cache)
+        return
+    
+    with contextmanager(get_db)() as db:
+        yield GuidanceService(db, vector_store, response_cache=response_cache)
+
+
+def get_arabic_search_service(
+    arabic_index: Optional[ArabicTextIndex] = Depends(get_arabic_index),
+    document_store: Optional[DocumentStore] = Depends(get_document_store)
+) -> Generator[ArabicSearchService, None, None]:
+    """
+    Dependency for getting an Arabic search service.
+    
+    A database session is only opened when there is no document store.
+    
+    Yields:
+        Arabic search service
+        
+    Raises:
+        HTTPException: 404 if Arabic search is disabled
+    """
+    if arabic_index is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Arabic search is disabled (ARABIC_SEARCH_ENABLED=false)"
+        )
+    
+    if document_store is not None:
+        yield ArabicSearchService(None, arabic_index, document_store)
+        return
+    
+    with contextmanager(get_db)() as db:
+        yield ArabicSearchService(db, arabic_index)
+
+
+def resolve_search_filter(metadata_index: MetadataIndex, query: SearchOptions) -> Optional[SearchFilter]:
+    """
+    Resolve the metadata filters of a guidance request.
+    
+    Args:
+        metadata_index: Metadata index the filters are resolved with
+        query: Request carrying the filters
+        
+    Returns:
+        Search filter, or None when the request has no filters
+        
+    Raises:
+        HTTPException: 422 if the request names an unknown Hadith book
+    """
+    try:
+        return metadata_index.search_filter(query.books, query.surahs)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+
+
 @router.post(
     "/guidance",
     response_model=GuidanceResponse,
@@ -23,28 +119,38 @@ router = APIRouter()
 )
 async def get_guidance(
     query: EmotionQuery,
-    db: Session = Depends(get_db),
-    vector_store: VectorStoreService = Depends(get_vector_store)
+    guidance_service: GuidanceService = Depends(get_guidance_service),
+    executor: GuidanceExecutor = Depends(get_guidance_executor),
+    metadata_index: MetadataIndex = Depends(get_metadata_index)
 ) -> GuidanceResponse:
     """
     Main endpoint for retrieving Islamic guidance.
     
+    The blocking pipeline (encode, search, hydration) runs on the
+    guidance executor so the event loop stays free.
+    
     Args:
         query: Emotion query from user
-        db: Database session
-        vector_store: Vector store service
+        guidance_service: Guidance service
+        executor: Guidance executor
+        metadata_index: Metadata index the filters are resolved with
         
     Returns:
         Guidance response with relevant Islamic texts
     """
     start_time = time.time()
+    search_filter = resolve_search_filter(metadata_index, query)
     
     try:
-        # Create guidance service
-        guidance_service = GuidanceService(db, vector_store)
-        
         # Get guidance results
-        results = guidance_service.get_guidance(query.emotion_query)
+        results = await executor.run(
+            guidance_service.get_guidance,
+            query.emotion_query,
+            query.top_k_per_type,
+            query.collections,
+            query.max_results,
+            search_filter
+        )
         
         elapsed_time = (time.time() - start_time) * 1000
         logger.info(f"Query processed in {elapsed_time:.2f}ms")
@@ -55,6 +161,151 @@ async def get_guidance(
             total_results=len(results)
         )
     
+    except ServiceOverloadedException as e:
+        logger.warning(f"Rejected guidance request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except IslamicGuidanceException as e:
+        logger.error(f"Application error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred"
+        )
+
+
+@router.post(
+    "/guidance/batch",
+    response_model=BatchGuidanceResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Get Islamic guidance for several emotional states at once",
+    description="Encodes all queries in one pass and searches each collection once; "
+                "each query gets the same results as /guidance"
+)
+async def get_guidance_batch(
+    query: BatchEmotionQuery,
+    guidance_service: GuidanceService = Depends(get_guidance_service),
+    executor: GuidanceExecutor = Depends(get_guidance_executor),
+    metadata_index: MetadataIndex = Depends(get_metadata_index)
+) -> BatchGuidanceResponse:
+    """
+    Batch endpoint for retrieving Islamic guidance.
+    
+    Args:
+        query: Emotion queries from user
+        guidance_service: Guidance service
+        executor: Guidance executor
+        metadata_index: Metadata index the filters are resolved with
+        
+    Returns:
+        Guidance response for each query
+    """
+    start_time = time.time()
+    search_filter = resolve_search_filter(metadata_index, query)
+    
+    try:
+        batch_results = await executor.run(
+            guidance_service.get_guidance_batch,
+            query.emotion_queries,
+            query.top_k_per_type,
+            query.collections,
+            query.max_results,
+            search_filter
+        )
+        
+        elapsed_time = (time.time() - start_time) * 1000
+        logger.info(f"Batch of {len(query.emotion_queries)} queries processed in {elapsed_time:.2f}ms")
+        
+        return BatchGuidanceResponse(
+            responses=[
+                GuidanceResponse(results=results, query=emotion_query, total_results=len(results))
+                for emotion_query, results in zip(query.emotion_queries, batch_results)
+            ],
+            total_queries=len(batch_results)
+        )
+        
+    except ServiceOverloadedException as e:
+        logger.warning(f"Rejected batch guidance request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
+    except IslamicGuidanceException as e:
+        logger.error(f"Application error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred"
+        )
+
+
+@router.post(
+    "/arabic-search",
+    response_model=ArabicSearchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Find texts containing an Arabic fragment",
+    description="Matches the fragment against the Arabic text of every collection, "
+                "ignoring tashkeel, tatweel and alef/ya/ta marbuta variants"
+)
+async def arabic_search(
+    query: ArabicSearchQuery,
+    arabic_search_service: ArabicSearchService = Depends(get_arabic_search_service),
+    executor: GuidanceExecutor = Depends(get_guidance_executor)
+) -> ArabicSearchResponse:
+    """
+    Find the Quran verses, Duas and Hadiths whose Arabic text contains a fragment.
+    
+    Args:
+        query: Arabic fragment from user
+        arabic_search_service: Arabic search service
+        executor: Guidance executor the lookup and hydration run on
+        
+    Returns:
+        Matching texts and their total count
+    """
+    start_time = time.time()
+    
+    try:
+        results, total, truncated = await executor.run(
+            arabic_search_service.search,
+            query.query,
+            query.limit,
+            query.collections
+        )
+        
+        elapsed_time = (time.time() - start_time) * 1000
+        logger.info(f"Arabic search matched {total} texts in {elapsed_time:.2f}ms")
+        
+        return ArabicSearchResponse(
+            results=results,
+            query=query.query,
+            total_results=total,
+            truncated=truncated
+        )
+        
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except ServiceOverloadedException as e:
+        logger.warning(f"Rejected Arabic search request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except IslamicGuidanceException as e:
         logger.error(f"Application error: {e}")
         raise HTTPException(
@@ -69,13 +320,44 @@ async def get_guidance(
         )
 
 
+@router.get(
+    "/stats",
+    response_model=StatsResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Runtime statistics",
+    description="Cache, batching and executor counters of this worker process, for sizing them"
+)
+async def get_stats(
+    vector_store: VectorStoreService = Depends(get_vector_store),
+    response_cache: Optional[SemanticResponseCache] = Depends(get_response_cache),
+    executor: GuidanceExecutor = Depends(get_guidance_executor)
+) -> StatsResponse:
+    """
+    Report runtime statistics of this worker.
+    
+    Returns:
+        Statistics of the in-process caches, batchers and executor
+    """
+    query_cache = vector_store.query_cache
+    encode_batcher = vector_store.encode_batcher
+    search_batcher = vector_store.search_batcher
+    return StatsResponse(
+        query_embedding_cache=query_cache.stats() if query_cache is not None else None,
+        semantic_response_cache=response_cache.stats() if response_cache is not None else None,
+        guidance_executor=executor.stats(),
+        event_loop=get_loop_lag_monitor().stats(),
+        encode_batcher=encode_batcher.stats() if encode_batcher is not None else None,
+        search_batcher=search_batcher.stats() if search_batcher is not None else None
+    )
+
+
 @router.get(
     "/health",
     response_model=HealthResponse,
     status_code=status.HTTP_200_OK,
     summary="Health check endpoint"
 )
-async def health_check(
+def health_check(
     db: Session = Depends(get_db),
     vector_store: VectorStoreService = Depends(get_vector_store)
 ) -> HealthResponse:
@@ -4,6 +4,10 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from api.routes import router
 from db.session import init_db
+from services.document_store import get_document_store
+from services.metadata_index import get_metadata_index
+from services.lexical_index import get_lexical_index
+from services.executor import get_loop_lag_monitor
 from core.config import get_settings
 from core.logging import setup_logging, get_logger
 
@@ -24,12 +28,20 @@ async def startup_event():
     logger.info("Starting Islamic Guidance API...")
     init_db()
     logger.info("Database initialized")
+    
+    if settings.document_store_enabled:
+        get_document_store()
+    get_metadata_index()
+    get_lexical_index()
+
+    get_loop_lag_monitor().start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down Islamic Guidance API...")
+    get_loop_lag_monitor().stop()
 
 # CORS middleware
 app.add_middleware(
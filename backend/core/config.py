@@ -1,5 +1,6 @@
 """Application configuration settings."""
 from functools import lru_cache
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -12,9 +13,72 @@ class Settings(BaseSettings):
     # AI/ML
     embedding_model: str = "all-MiniLM-L6-v2"
     embedding_dimension: int = 384
+    embedding_model_revision: Optional[str] = None  # Hub revision; None uses the default branch
     
     # Vector Store
     vector_store_persist_dir: str = "./chroma_db"
+    vector_store_max_segments: int = 32  # Compact a collection once it has this many segments
+    vector_store_read_only: bool = False  # Memory-map compacted indexes, shared across workers
+    vector_store_bulk_buffer_rows: int = 4096  # Rows preallocated by a bulk_ingest session
+    
+    # Index type per collection: flat (exact), hnsw or ivf (approximate).
+    # A changed type takes effect at the collection's next compaction.
+    vector_index_types: dict[str, str] = {"quran": "flat", "dua": "flat", "hadith": "flat"}
+    hnsw_m: int = 32
+    hnsw_ef_construction: int = 200
+    hnsw_ef_search: int = 64
+    ivf_nlist: int = 256
+    ivf_nprobe: int = 16
+    
+    # Vector encoding per collection: float32, fp16, sq8 (int8 scalar) or pq
+    # (product quantization, PQ_M bytes per vector). Compressed collections
+    # re-rank VECTOR_RERANK_FACTOR * top_k candidates against the
+    # full-precision vectors kept on disk; 0 disables re-ranking.
+    vector_encodings: dict[str, str] = {"quran": "float32", "dua": "float32", "hadith": "float32"}
+    pq_m: int = 96
+    pq_nbits: int = 8
+    vector_rerank_factor: int = 10
+    
+    # Query embedding cache (0 entries disables it)
+    query_embedding_cache_size: int = 4096
+    query_embedding_cache_max_bytes: int = 16 * 1024 * 1024
+    query_embedding_cache_ttl_seconds: float = 0  # 0 keeps entries until evicted
+    
+    # Semantic response cache: serve queries whose embedding is within the
+    # cosine threshold of a recently answered one (0 entries disables it)
+    semantic_cache_size: int = 0
+    semantic_cache_threshold: float = 0.95
+    
+    # Micro-batching of concurrent query encodes and searches (0 ms, the
+    # default, disables it). Every request waits up to the window, so only
+    # enable it when many requests run at once (GUIDANCE_EXECUTOR_WORKERS)
+    micro_batch_window_ms: float = 0
+    micro_batch_max_size: int = 32
+    
+    # Guidance executor: worker threads for encode / search / hydration, and how
+    # many requests may wait for one before new requests are rejected with 503
+    guidance_executor_workers: int = 4
+    guidance_executor_max_queue: int = 64
+    
+    # Document Store (serve corpus text from memory instead of the database)
+    document_store_enabled: bool = False
+    
+    # Importer HTTP fetching (base URLs can point at a local mirror)
+    sunnah_dataset_url: str = "https://raw.githubusercontent.com/sunnah-com/hadith/main"
+    quran_api_url: str = "https://api.alquran.cloud/v1"
+    fetch_cache_dir: str = "./data/http_cache"  # Empty disables the response cache
+    fetch_concurrency: int = 8
+    fetch_retries: int = 3
+    fetch_backoff_seconds: float = 0.5
+    fetch_timeout_seconds: float = 30
+    import_checkpoint_dir: str = "./data/import_checkpoints"
+    
+    # Ingestion pipeline (parse -> insert -> embed -> index)
+    ingest_embed_workers: int = 1  # Embedding processes; 1 encodes in-process, 0 = one per available core
+    ingest_embed_batch_size: int = 256  # Most texts per encode call
+    ingest_embed_token_budget: int = 16384  # Most padded tokens per encode call
+    ingest_queue_size: int = 4  # Batches buffered between stages
+    document_embedding_cache_dir: str = "./data/embedding_cache"  # Empty disables the cache
     
     # API
     api_title: str = "Islamic Guidance API"
@@ -27,6 +91,19 @@ class Settings(BaseSettings):
     # Search
     default_top_k_per_type: int = 2
     max_results: int = 5
+    top_k_per_type_limit: int = 20  # Largest top_k_per_type a request may ask for
+    max_results_limit: int = 50  # Largest max_results a request may ask for
+    guidance_batch_max_queries: int = 64  # Queries accepted by one /guidance/batch request
+    # Hybrid search: "rrf" fuses BM25 matches of the query text into the
+    # vector search results by reciprocal rank fusion, "none" (the default)
+    # keeps pure vector search
+    search_fusion: str = "none"
+    rrf_k: int = 60  # Rank offset of reciprocal rank fusion
+    lexical_weight: float = 1.0  # Weight of the lexical ranks; the semantic ranks weigh 1
+    arabic_search_enabled: bool = True  # Build the trigram index on the first /arabic-search call
+    arabic_search_max_candidates: int = 20000  # Occurrences of a fragment's rarest trigram checked; 0 checks all
+    arabic_search_default_limit: int = 20  # Texts returned by /arabic-search when a request sets no limit
+    arabic_search_limit: int = 100  # Largest limit an /arabic-search request may ask for
     
     class Config:
         env_file = ".env"
@@ -19,3 +19,8 @@ class VectorStoreException(IslamicGuidanceException):
 class EmbeddingException(IslamicGuidanceException):
     """Embedding generation exceptions."""
     pass
+
+
+class ServiceOverloadedException(IslamicGuidanceException):
+    """Request rejected because the service is at capacity."""
+    pass
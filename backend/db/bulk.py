@@ -0,0 +1,90 @@
+"""Bulk insertion of corpus rows."""
+from typing import Optional, Type
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from core.logging import get_logger
+from core.exceptions import DatabaseException
+
+logger = get_logger(__name__)
+
+# Rows per INSERT statement
+DEFAULT_BATCH_SIZE = 1000
+
+
+def unique_key(model: Type) -> Optional[str]:
+    """
+    Get the column that identifies a row of a corpus model for conflict handling.
+    
+    Args:
+        model: QuranAyah, Dua or Hadith
+        
+    Returns:
+        Name of the unique citation column, or None if citations may repeat
+    """
+    column = model.__table__.c.get("citation")
+    return "citation" if column is not None and column.unique else None
+
+
+def bulk_insert(
+    db: Session,
+    model: Type,
+    rows: list[dict],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> list[tuple[int, dict]]:
+    """
+    Insert rows with multi-row INSERT ... RETURNING statements.
+    
+    For models with a unique citation, rows whose citation already exists
+    (in the table or earlier in rows) are skipped with ON CONFLICT DO
+    NOTHING instead of being looked up first. The caller commits.
+    
+    Args:
+        db: Database session
+        model: QuranAyah, Dua or Hadith
+        rows: Column values of each row
+        batch_size: Rows per statement
+        
+    Returns:
+        (new id, row) for every inserted row, in input order
+    """
+    key = unique_key(model)
+    if key is not None:
+        # Keep the first of repeated keys so each returned key maps to one row
+        seen = set()
+        rows = [row for row in rows if not (row[key] in seen or seen.add(row[key]))]
+    
+    inserted = []
+    try:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            if key is None:
+                stmt = insert(model).returning(model.id, sort_by_parameter_order=True)
+                ids = db.execute(stmt, batch).scalars().all()
+                inserted.extend(zip(ids, batch))
+                continue
+            
+            stmt = _dialect_insert(db, model).on_conflict_do_nothing(index_elements=[key])
+            returned = db.execute(stmt.returning(model.id, getattr(model, key)), batch).all()
+            ids_by_key = {row_key: row_id for row_id, row_key in returned}
+            inserted.extend((ids_by_key[row[key]], row) for row in batch if row[key] in ids_by_key)
+    except Exception as e:
+        logger.error(f"Bulk insert into {model.__tablename__} failed: {e}")
+        raise DatabaseException(f"Failed to bulk insert {model.__tablename__}: {e}")
+    
+    skipped = len(rows) - len(inserted)
+    if skipped:
+        logger.info(f"Skipped {skipped} existing {model.__tablename__} rows")
+    return inserted
+
+
+def _dialect_insert(db: Session, model: Type):
+    """Create an INSERT supporting ON CONFLICT for the session's database."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise DatabaseException(f"Bulk insert with conflict handling is not supported on {dialect}")
@@ -49,3 +49,18 @@ class Hadith(Base):
     __table_args__ = (
         Index('idx_book_number', 'book', 'hadith_number'),
     )
+
+
+# Search result type -> ORM model backing that vector store collection
+CORPUS_MODELS = {
+    "Quran": QuranAyah,
+    "Dua": Dua,
+    "Hadith": Hadith,
+}
+
+# Vector store collection -> ORM model of its rows
+COLLECTION_MODELS = {
+    "quran": QuranAyah,
+    "dua": Dua,
+    "hadith": Hadith,
+}
@@ -1,9 +1,70 @@
 """Pydantic schemas for API request/response validation."""
-from pydantic import BaseModel, Field
-from typing import Literal
+from pydantic import BaseModel, Field, StringConstraints, model_validator
+from typing import Annotated, Literal, Optional
 
+from core.config import get_settings
 
-class EmotionQuery(BaseModel):
+settings = get_settings()
+
+ResultType = Literal["Quran", "Dua", "Hadith"]
+
+
+class SearchOptions(BaseModel):
+    """Optional search parameters shared by the guidance request schemas."""
+    
+    collections: Optional[set[ResultType]] = Field(
+        None,
+        min_length=1,
+        description="Types of Islamic text to search (default: all); other indexes are not searched",
+        examples=[["Hadith", "Dua"]]
+    )
+    top_k_per_type: Optional[int] = Field(
+        None,
+        ge=1,
+        le=settings.top_k_per_type_limit,
+        description="Results per type before ranking (default: DEFAULT_TOP_K_PER_TYPE)"
+    )
+    max_results: Optional[int] = Field(
+        None,
+        ge=1,
+        le=settings.max_results_limit,
+        description="Results returned per query (default: MAX_RESULTS)"
+    )
+    books: Optional[set[str]] = Field(
+        None,
+        min_length=1,
+        description="Hadith books to search (e.g. 'Sahih Bukhari'); only restricts Hadith results",
+        examples=[["Sahih Bukhari", "Sahih Muslim"]]
+    )
+    surah_from: Optional[int] = Field(
+        None,
+        ge=1,
+        le=114,
+        description="First surah of the Quran results (e.g. 78 for Juz 30)"
+    )
+    surah_to: Optional[int] = Field(
+        None,
+        ge=1,
+        le=114,
+        description="Last surah of the Quran results"
+    )
+    
+    @model_validator(mode="after")
+    def check_surah_range(self) -> "SearchOptions":
+        """Reject surah ranges that end before they start."""
+        if self.surah_from is not None and self.surah_to is not None and self.surah_from > self.surah_to:
+            raise ValueError("surah_from must not be greater than surah_to")
+        return self
+    
+    @property
+    def surahs(self) -> Optional[tuple[int, int]]:
+        """Inclusive surah range to keep, or None when the Quran results are unfiltered."""
+        if self.surah_from is None and self.surah_to is None:
+            return None
+        return (self.surah_from or 1, self.surah_to or 114)
+
+
+class EmotionQuery(SearchOptions):
     """Request schema for emotion-based guidance query."""
     
     emotion_query: str = Field(
@@ -15,10 +76,22 @@ class EmotionQuery(BaseModel):
     )
 
 
+class BatchEmotionQuery(SearchOptions):
+    """Request schema for several emotion-based guidance queries at once."""
+    
+    emotion_queries: list[Annotated[str, StringConstraints(min_length=3, max_length=500)]] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.guidance_batch_max_queries,
+        description="Natural language descriptions of emotional states, e.g. one per journal entry",
+        examples=[["I feel anxious and need comfort", "I am grateful for my family"]]
+    )
+
+
 class GuidanceResult(BaseModel):
     """Schema for a single guidance result."""
     
-    type: Literal["Quran", "Dua", "Hadith"] = Field(
+    type: ResultType = Field(
         ...,
         description="Type of Islamic text"
     )
@@ -59,6 +132,152 @@ class GuidanceResponse(BaseModel):
     )
 
 
+class BatchGuidanceResponse(BaseModel):
+    """Response schema for a batch of guidance queries."""
+    
+    responses: list[GuidanceResponse] = Field(
+        ...,
+        description="Guidance for each query, in request order"
+    )
+    total_queries: int = Field(
+        ...,
+        description="Number of queries answered"
+    )
+
+
+class ArabicSearchQuery(BaseModel):
+    """Request schema for Arabic fragment search."""
+    
+    query: str = Field(
+        ...,
+        min_length=3,
+        max_length=500,
+        description="Arabic fragment, with or without tashkeel",
+        examples=["انما الاعمال بالنيات"]
+    )
+    collections: Optional[set[ResultType]] = Field(
+        None,
+        min_length=1,
+        description="Types of Islamic text to search (default: all)",
+        examples=[["Hadith"]]
+    )
+    limit: int = Field(
+        settings.arabic_search_default_limit,
+        ge=1,
+        le=settings.arabic_search_limit,
+        description="Most texts returned"
+    )
+
+
+class ArabicSearchResult(BaseModel):
+    """Schema for a single text containing the searched fragment."""
+    
+    type: ResultType = Field(
+        ...,
+        description="Type of Islamic text"
+    )
+    arabic_text: str = Field(
+        ...,
+        description="Original Arabic text"
+    )
+    translation: str = Field(
+        ...,
+        description="English translation"
+    )
+    citation: str = Field(
+        ...,
+        description="Source reference (e.g., 'Quran 2:153')"
+    )
+
+
+class ArabicSearchResponse(BaseModel):
+    """Response schema for Arabic fragment search."""
+    
+    results: list[ArabicSearchResult] = Field(
+        ...,
+        description="Texts containing the fragment, Quran first, in corpus order"
+    )
+    query: str = Field(
+        ...,
+        description="Original query"
+    )
+    total_results: int = Field(
+        ...,
+        description="Number of texts containing the fragment, including those beyond the limit"
+    )
+    truncated: bool = Field(
+        False,
+        description="Whether the fragment was too common to check every occurrence; "
+                    "total_results then only counts the texts found before the search stopped"
+    )
+
+
+class CacheStats(BaseModel):
+    """Counters of an in-process cache."""
+    
+    entries: int = Field(..., description="Number of cached entries")
+    bytes: int = Field(..., description="Approximate size of the cached data")
+    hits: int = Field(..., description="Lookups served from the cache")
+    misses: int = Field(..., description="Lookups not found in the cache")
+    evictions: int = Field(..., description="Entries evicted to stay within bounds")
+    hit_rate: float = Field(..., description="hits / (hits + misses)")
+
+
+class BatcherStats(BaseModel):
+    """Counters of a micro-batcher."""
+    
+    batches: int = Field(..., description="Batches processed")
+    items: int = Field(..., description="Items processed")
+    mean_batch_size: float = Field(..., description="items / batches")
+
+
+class ExecutorStats(BaseModel):
+    """Counters of the guidance executor."""
+    
+    workers: int = Field(..., description="Worker threads")
+    active: int = Field(..., description="Requests running on a worker")
+    queue_depth: int = Field(..., description="Requests waiting for a worker")
+    max_queue: int = Field(..., description="Queue depth at which requests are rejected")
+    completed: int = Field(..., description="Requests finished")
+    rejected: int = Field(..., description="Requests rejected because the queue was full")
+
+
+class EventLoopStats(BaseModel):
+    """Event loop responsiveness."""
+    
+    lag_ms: float = Field(..., description="Latest measured event loop lag")
+    max_lag_ms: float = Field(..., description="Largest event loop lag since startup")
+
+
+class StatsResponse(BaseModel):
+    """Runtime statistics schema."""
+    
+    query_embedding_cache: Optional[CacheStats] = Field(
+        None,
+        description="Query embedding cache counters, null when the cache is disabled"
+    )
+    semantic_response_cache: Optional[CacheStats] = Field(
+        None,
+        description="Semantic response cache counters, null when the cache is disabled"
+    )
+    guidance_executor: ExecutorStats = Field(
+        ...,
+        description="Guidance executor queue and worker counters"
+    )
+    event_loop: EventLoopStats = Field(
+        ...,
+        description="Event loop lag of this worker"
+    )
+    encode_batcher: Optional[BatcherStats] = Field(
+        None,
+        description="Query encode micro-batching counters, null when micro-batching is disabled"
+    )
+    search_batcher: Optional[BatcherStats] = Field(
+        None,
+        description="Vector search micro-batching counters, null when micro-batching is disabled"
+    )
+
+
 class HealthResponse(BaseModel):
     """Health check response schema."""
     
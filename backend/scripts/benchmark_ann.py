@@ -0,0 +1,139 @@
+"""
+Recall@k versus latency report for the approximate index types.
+
+Builds the exact flat baseline and HNSW / IVF indexes over a collection's
+stored vectors, then searches a sample of queries one at a time (as the
+API does) and reports, for each efSearch / nprobe setting, recall@k
+against the flat results together with mean and p95 query latency.
+
+Queries are stored vectors with a small amount of noise added, so they
+behave like paraphrases of corpus entries. Use --synthetic to run without
+a populated vector store.
+
+Usage:
+    python scripts/benchmark_ann.py [--collection hadith] [--k 2]
+    python scripts/benchmark_ann.py --synthetic 60000
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+import faiss
+import numpy as np
+from services.index_storage import SegmentedIndexStorage, COLLECTION_NAMES
+from core.config import get_settings
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+def load_vectors(args) -> np.ndarray:
+    """Load the collection's full-precision vectors, or generate synthetic ones."""
+    if args.synthetic:
+        rng = np.random.default_rng(0)
+        # Clustered data resembles sentence embeddings better than uniform noise
+        centers = rng.standard_normal((256, settings.embedding_dimension)).astype(np.float32)
+        vectors = centers[rng.integers(0, len(centers), args.synthetic)]
+        vectors += 0.5 * rng.standard_normal(vectors.shape).astype(np.float32)
+    else:
+        storage = SegmentedIndexStorage(args.persist_dir, COLLECTION_NAMES)
+        vectors = np.ascontiguousarray(storage.read_vectors(args.collection, settings.embedding_dimension))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def make_queries(vectors: np.ndarray, count: int) -> np.ndarray:
+    """Sample stored vectors and perturb them."""
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), size=min(count, len(vectors)), replace=False)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return queries.astype(np.float32)
+
+
+def timed_search(index: faiss.Index, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Search one query at a time; return result ids and per-query latency in ms."""
+    results = np.empty((len(queries), k), dtype=np.int64)
+    latencies = np.empty(len(queries))
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        _, indices = index.search(queries[i:i + 1], k)
+        latencies[i] = (time.perf_counter() - start) * 1000
+        results[i] = indices[0]
+    return results, latencies
+
+
+def recall_at_k(results: np.ndarray, truth: np.ndarray) -> float:
+    """Fraction of the exact top-k found by the approximate search."""
+    hits = sum(len(set(r.tolist()) & set(t.tolist())) for r, t in zip(results, truth))
+    return hits / truth.size
+
+
+def report(name: str, setting: str, results, latencies, truth, build_s: float) -> None:
+    logger.info(
+        f"{name:<10} {setting:<14} {recall_at_k(results, truth):>8.4f} "
+        f"{latencies.mean():>9.3f} {np.percentile(latencies, 95):>9.3f} {build_s:>9.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collection", choices=COLLECTION_NAMES, default="hadith")
+    parser.add_argument("--persist-dir", default=settings.vector_store_persist_dir)
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=settings.default_top_k_per_type)
+    parser.add_argument("--hnsw-m", type=int, default=settings.hnsw_m)
+    parser.add_argument("--ef-construction", type=int, default=settings.hnsw_ef_construction)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--ivf-nlist", type=int, default=settings.ivf_nlist)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    args = parser.parse_args()
+    
+    vectors = load_vectors(args)
+    queries = make_queries(vectors, args.queries)
+    dimension = vectors.shape[1]
+    logger.info(f"{len(vectors)} vectors, {len(queries)} queries, k={args.k}")
+    
+    logger.info("=" * 80)
+    logger.info(f"{'index':<10} {'setting':<14} {'recall':>8} {'mean ms':>9} {'p95 ms':>9} {'build s':>9}")
+    
+    start = time.perf_counter()
+    flat = faiss.IndexFlatL2(dimension)
+    flat.add(vectors)
+    build_s = time.perf_counter() - start
+    truth, latencies = timed_search(flat, queries, args.k)
+    report("flat", "exact", truth, latencies, truth, build_s)
+    
+    start = time.perf_counter()
+    hnsw = faiss.IndexHNSWFlat(dimension, args.hnsw_m)
+    hnsw.hnsw.efConstruction = args.ef_construction
+    hnsw.add(vectors)
+    build_s = time.perf_counter() - start
+    for ef_search in args.ef_search:
+        hnsw.hnsw.efSearch = ef_search
+        results, latencies = timed_search(hnsw, queries, args.k)
+        report(f"hnsw{args.hnsw_m}", f"efSearch={ef_search}", results, latencies, truth, build_s)
+    
+    if len(vectors) >= args.ivf_nlist * 39:
+        start = time.perf_counter()
+        ivf = faiss.IndexIVFFlat(faiss.IndexFlatL2(dimension), dimension, args.ivf_nlist)
+        ivf.train(vectors)
+        ivf.add(vectors)
+        build_s = time.perf_counter() - start
+        for nprobe in args.nprobe:
+            ivf.nprobe = nprobe
+            results, latencies = timed_search(ivf, queries, args.k)
+            report(f"ivf{args.ivf_nlist}", f"nprobe={nprobe}", results, latencies, truth, build_s)
+    else:
+        logger.info(f"Skipping IVF: need {args.ivf_nlist * 39} vectors to train {args.ivf_nlist} lists")
+    
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Latency of Arabic fragment search in the trigram index.
+
+Builds an ArabicTextIndex over a synthetic corpus the size of the full
+Quran + Dua + Hadith corpus (66,000 documents by default) of Arabic
+words with tashkeel following a Zipf distribution, or over the real
+corpus with --database, and reports the build time, the index memory
+and the per-query latency of ArabicTextIndex.search for fragments of
+one to eight words cut from the corpus, with their tashkeel stripped
+half of the time, from very common words to whole phrases, checking at
+most --max-candidates occurrences per query like the API.
+
+Usage:
+    python scripts/benchmark_arabic_search.py [--documents 66000] [--queries 2000] [--max-candidates N] [--database]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+import numpy as np
+from services.arabic_index import ArabicTextIndex
+from services.text_normalization import normalize_arabic
+from core.config import get_settings
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+settings = get_settings()
+
+VOCABULARY_SIZE = 30000
+LETTERS = "ابتثجحخدذرسشصضطظعغفقكلمنهويةىأإآ"
+HARAKAT = "َُِّْ"
+
+
+def synthetic_corpus(documents: int, seed: int = 0) -> dict[str, list[str]]:
+    """Texts of 10-150 Zipf-distributed vowelled words split like the real collections."""
+    rng = np.random.default_rng(seed)
+    vocabulary = [
+        "".join(
+            LETTERS[letter] + HARAKAT[mark]
+            for letter, mark in zip(rng.integers(0, len(LETTERS), size=length), rng.integers(0, len(HARAKAT), size=length))
+        )
+        for length in rng.integers(2, 8, size=VOCABULARY_SIZE)
+    ]
+    ranks = np.minimum(rng.zipf(1.1, size=documents * 80), VOCABULARY_SIZE) - 1
+    lengths = rng.integers(10, 150, size=documents)
+    texts, start = [], 0
+    for length in lengths:
+        texts.append(" ".join(vocabulary[rank] for rank in ranks[start:start + length]))
+        start += length
+    quran = min(6236, documents // 10)
+    dua = min(500, documents // 100)
+    return {"Quran": texts[:quran], "Dua": texts[quran:quran + dua], "Hadith": texts[quran + dua:]}
+
+
+def make_queries(texts: list[str], count: int, seed: int = 1) -> list[str]:
+    """Runs of 1-8 consecutive words of random texts, without tashkeel every other time."""
+    rng = np.random.default_rng(seed)
+    queries = []
+    while len(queries) < count:
+        words = texts[rng.integers(0, len(texts))].split()
+        if not words:
+            continue
+        length = int(rng.integers(1, 9))
+        first = int(rng.integers(0, max(len(words) - length, 0) + 1))
+        query = " ".join(words[first:first + length])
+        if len(normalize_arabic(query)) < 3:
+            continue
+        queries.append(normalize_arabic(query) if len(queries) % 2 else query)
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=66000, help="Size of the synthetic corpus")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries timed")
+    parser.add_argument("--limit", type=int, default=20, help="Matches returned per query")
+    parser.add_argument(
+        "--max-candidates",
+        type=int,
+        default=settings.arabic_search_max_candidates,
+        help="Occurrences checked per query, 0 for all (default: ARABIC_SEARCH_MAX_CANDIDATES)"
+    )
+    parser.add_argument("--database", action="store_true", help="Index the corpus in the database instead")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    if args.database:
+        from db.session import SessionLocal
+        from models.database import CORPUS_MODELS
+        from services.vector_store import get_vector_store
+        db = SessionLocal()
+        try:
+            index = ArabicTextIndex.load(db, get_vector_store())
+            texts = [arabic_text for model in CORPUS_MODELS.values() for (arabic_text,) in db.query(model.arabic_text)]
+        finally:
+            db.close()
+    else:
+        corpus = synthetic_corpus(args.documents)
+        index = ArabicTextIndex.build(corpus)
+        texts = [text for collection_texts in corpus.values() for text in collection_texts]
+    build_seconds = time.perf_counter() - start
+    
+    queries = make_queries(texts, args.queries)
+    max_candidates = args.max_candidates or None
+    for query in queries[:50]:
+        index.search(query, args.limit, max_candidates=max_candidates)  # Warm up
+    
+    latencies, matches, truncated = [], [], 0
+    for query in queries:
+        start = time.perf_counter()
+        _, total, complete = index.search(query, args.limit, max_candidates=max_candidates)
+        latencies.append(time.perf_counter() - start)
+        matches.append(total)
+        truncated += not complete
+    latencies = np.array(latencies) * 1000
+    
+    logger.info("=" * 80)
+    logger.info(
+        f"{index.size} documents, {len(index.grams)} trigrams, {len(index.positions)} postings, "
+        f"{index.nbytes / (1024 * 1024):.1f} MB, built in {build_seconds:.1f}s"
+    )
+    logger.info(
+        f"search latency over {len(queries)} queries ({np.median(matches):.0f} matching documents "
+        f"at the median, {max(matches)} at most): mean {latencies.mean():.3f} ms, "
+        f"p50 {np.percentile(latencies, 50):.3f} ms, p95 {np.percentile(latencies, 95):.3f} ms, "
+        f"p99 {np.percentile(latencies, 99):.3f} ms, {truncated} stopped before checking every candidate"
+    )
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Throughput of /guidance/batch against the same queries sent one by one to /guidance.
+
+Sends batches of distinct queries through the FastAPI app in-process
+(TestClient), once as N single /guidance calls and once as one
+/guidance/batch call, and reports queries/sec for each batch size. The
+query embedding and semantic caches are disabled so every query is
+encoded and searched. The per-query results of both routes are compared.
+
+Usage:
+    python scripts/benchmark_batch_guidance.py [--sizes 1 8 32 64] [--rounds 3]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from fastapi.testclient import TestClient
+from core.config import get_settings
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+settings = get_settings()
+
+QUERY_TEMPLATES = [
+    "I feel anxious about {} and need comfort",
+    "feeling lonely and sad about {}",
+    "how do I find patience with {}",
+    "I am grateful for {}",
+    "I feel guilty about {}",
+]
+TOPICS = ["my exams", "my family", "work", "my health", "the future", "a friend", "my prayers", "money"]
+
+
+def make_queries(count: int, offset: int) -> list[str]:
+    """Distinct queries, so no cache layer can serve them."""
+    return [
+        QUERY_TEMPLATES[i % len(QUERY_TEMPLATES)].format(f"{TOPICS[i % len(TOPICS)]} {offset + i}")
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 8, 32, settings.guidance_batch_max_queries])
+    parser.add_argument("--rounds", type=int, default=3, help="Batches sent per size")
+    args = parser.parse_args()
+    
+    settings.query_embedding_cache_size = 0
+    settings.semantic_cache_size = 0
+    import app as app_module
+    
+    with TestClient(app_module.app) as client:
+        client.post("/api/v1/guidance", json={"emotion_query": "warm up"})
+        
+        logger.info("=" * 80)
+        logger.info(f"{'queries':>8} {'single q/s':>12} {'batch q/s':>12} {'speedup':>8} {'identical':>10}")
+        offset = 0
+        for size in args.sizes:
+            single_seconds = batch_seconds = 0.0
+            identical = True
+            for _ in range(args.rounds):
+                queries = make_queries(size, offset)
+                offset += size
+                
+                start = time.perf_counter()
+                single = [client.post("/api/v1/guidance", json={"emotion_query": query}).json() for query in queries]
+                single_seconds += time.perf_counter() - start
+                
+                start = time.perf_counter()
+                batch = client.post("/api/v1/guidance/batch", json={"emotion_queries": queries}).json()
+                batch_seconds += time.perf_counter() - start
+                identical = identical and single == batch["responses"]
+            
+            total = size * args.rounds
+            logger.info(
+                f"{size:>8} {total / single_seconds:>12.1f} {total / batch_seconds:>12.1f} "
+                f"{single_seconds / batch_seconds:>7.1f}x {str(identical):>10}"
+            )
+        logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
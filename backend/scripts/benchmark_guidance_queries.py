@@ -0,0 +1,109 @@
+"""
+Benchmark database round trips issued while hydrating guidance results.
+
+Runs a set of queries through the vector store and compares the old
+per-hit lookup (one SELECT per result) with the batched hydration in
+GuidanceService (one IN query per collection), counting every statement
+sent to the database.
+
+Usage:
+    python scripts/benchmark_guidance_queries.py [--repeat N] [query ...]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from sqlalchemy import event
+from db.session import SessionLocal, engine
+from models.database import CORPUS_MODELS
+from services.guidance import GuidanceService
+from services.vector_store import get_vector_store
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+
+DEFAULT_QUERIES = [
+    "I feel anxious and need comfort",
+    "I am grateful and want to thank Allah",
+    "I feel sad and depressed",
+    "I am afraid of the future",
+    "I lost someone I love",
+]
+
+
+class QueryCounter:
+    """Counts statements executed on an engine."""
+    
+    def __init__(self, bind):
+        self.count = 0
+        event.listen(bind, "before_cursor_execute", self._on_execute)
+    
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+    
+    def reset(self) -> None:
+        self.count = 0
+
+
+def hydrate_per_hit(db, search_results: list[dict]) -> int:
+    """Previous hydration strategy: one full-row lookup per search hit."""
+    hydrated = 0
+    for result in search_results:
+        model = CORPUS_MODELS[result['type']]
+        item = db.query(model).filter(model.id == int(result['id'])).first()
+        if item:
+            hydrated += 1
+    return hydrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queries", nargs="*", default=DEFAULT_QUERIES)
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per query")
+    args = parser.parse_args()
+    
+    vector_store = get_vector_store()
+    counter = QueryCounter(engine)
+    db = SessionLocal()
+    
+    try:
+        # Warm up the connection pool and the model
+        GuidanceService(db, vector_store).get_guidance(args.queries[0])
+        
+        totals = {"per_hit": [0, 0.0], "batched": [0, 0.0]}
+        runs = len(args.queries) * args.repeat
+        
+        for query in args.queries:
+            search_results = vector_store.search_all(query)
+            
+            for _ in range(args.repeat):
+                counter.reset()
+                start = time.perf_counter()
+                hydrate_per_hit(db, search_results)
+                totals["per_hit"][1] += time.perf_counter() - start
+                totals["per_hit"][0] += counter.count
+                db.expire_all()
+                
+                counter.reset()
+                start = time.perf_counter()
+                GuidanceService(db, vector_store)._fetch_items(search_results)
+                totals["batched"][1] += time.perf_counter() - start
+                totals["batched"][0] += counter.count
+        
+        logger.info("=" * 80)
+        logger.info(f"Hydration benchmark ({len(args.queries)} queries x {args.repeat} runs)")
+        logger.info("=" * 80)
+        for name, (statements, elapsed) in totals.items():
+            logger.info(
+                f"{name:>8}: {statements / runs:.2f} queries/request, "
+                f"{elapsed / runs * 1000:.3f}ms/request"
+            )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
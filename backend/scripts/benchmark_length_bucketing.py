@@ -0,0 +1,106 @@
+"""
+Encoding throughput of file-order batches vs length-bucketed batches.
+
+Builds a synthetic corpus whose lengths follow a log-normal distribution
+like the hadith collections (mostly a few sentences, a long tail of
+multi-paragraph narrations), truncated to 1000 characters as the
+importers do. The corpus is encoded in file order in fixed-size batches,
+as the importers used to, and again sorted into token-budget batches
+(services.length_buckets), and the script reports texts/sec, the padded
+tokens the model processed and the share of them that were padding. The
+bucketed embeddings are scattered back to file order and checked against
+the file-order ones.
+
+Usage:
+    python scripts/benchmark_length_bucketing.py [--texts 4000] [--batch-sizes 100 256] [--budgets 8192 16384]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+import numpy as np
+from sentence_transformers import SentenceTransformer
+from services.length_buckets import token_lengths, token_budget_batches, padded_tokens
+from core.config import get_settings
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+settings = get_settings()
+
+WORDS = (
+    "the messenger of allah said whoever believes in allah and the last day should speak good or keep "
+    "silent prayer charity patience mercy forgiveness fasting pilgrimage companions narrated that he "
+    "heard people asked about deeds reward paradise fire knowledge family neighbour guest truth"
+).split()
+
+
+def synthetic_corpus(count: int, seed: int = 0) -> list[str]:
+    """Texts with log-normal character lengths (median ~350), truncated to 1000 characters."""
+    rng = np.random.default_rng(seed)
+    lengths = np.clip(rng.lognormal(mean=np.log(350), sigma=0.9, size=count), 20, 6000).astype(int)
+    texts = []
+    for length in lengths:
+        words = rng.choice(WORDS, size=length // 5 + 1)
+        texts.append(" ".join(words)[:length][:1000])
+    return texts
+
+
+def encode(model: SentenceTransformer, texts: list[str], batches: list[list[int]]) -> tuple[np.ndarray, float]:
+    """Encode batches of positions, one forward pass each; return embeddings in text order and seconds."""
+    embeddings = np.empty((len(texts), model.get_sentence_embedding_dimension()), dtype="float32")
+    start = time.perf_counter()
+    for batch in batches:
+        chunk = [texts[position] for position in batch]
+        embeddings[batch] = np.asarray(model.encode(chunk, batch_size=len(chunk)), dtype="float32")
+    return embeddings, time.perf_counter() - start
+
+
+def report(name: str, texts: int, lengths: list[int], batches: list[list[int]], seconds: float) -> None:
+    """Log one result row."""
+    padded = padded_tokens(lengths, batches)
+    logger.info(
+        f"{name:<22} {len(batches):>8} {texts / seconds:>10.1f} {padded:>12} "
+        f"{100 * (1 - sum(lengths) / padded):>8.1f}%"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=4000, help="Size of the synthetic corpus")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 256], help="File-order batch sizes")
+    parser.add_argument("--budgets", type=int, nargs="+", default=[8192, settings.ingest_embed_token_budget])
+    parser.add_argument("--max-batch-size", type=int, default=settings.ingest_embed_batch_size)
+    args = parser.parse_args()
+    
+    model = SentenceTransformer(settings.embedding_model, revision=settings.embedding_model_revision)
+    texts = synthetic_corpus(args.texts)
+    lengths = token_lengths(model, texts)
+    logger.info(
+        f"{len(texts)} texts, tokens per text: median {int(np.median(lengths))}, "
+        f"p95 {int(np.percentile(lengths, 95))}, max {max(lengths)}"
+    )
+    model.encode(texts[:32])  # Warm up
+    
+    logger.info("=" * 80)
+    logger.info(f"{'batching':<22} {'batches':>8} {'texts/s':>10} {'padded tok':>12} {'padding':>9}")
+    reference = None
+    for batch_size in args.batch_sizes:
+        batches = [list(range(start, min(start + batch_size, len(texts)))) for start in range(0, len(texts), batch_size)]
+        embeddings, seconds = encode(model, texts, batches)
+        reference = embeddings if reference is None else reference
+        report(f"file order x{batch_size}", len(texts), lengths, batches, seconds)
+    
+    for budget in args.budgets:
+        batches = token_budget_batches(lengths, budget, args.max_batch_size)
+        embeddings, seconds = encode(model, texts, batches)
+        report(f"bucketed {budget} tok", len(texts), lengths, batches, seconds)
+        if not np.allclose(embeddings, reference, atol=1e-3):
+            logger.warning(f"Bucketed embeddings ({budget} tokens) differ from file-order ones")
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Latency of BM25 scoring in the lexical index used for hybrid search.
+
+Builds a LexicalIndex over a synthetic corpus the size of the full
+Quran + Dua + Hadith corpus (66,000 documents by default) whose words
+follow a Zipf distribution like English text, or over the real corpus
+with --database, and reports the build time, the postings memory and
+the per-query latency of LexicalIndex.search for queries of one to six
+words, from rare terms to very common ones. Search fusion adds this
+latency to every query.
+
+Usage:
+    python scripts/benchmark_lexical_search.py [--documents 66000] [--queries 2000] [--database]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+import numpy as np
+from services.lexical_index import LexicalIndex
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+
+VOCABULARY_SIZE = 30000
+
+
+def synthetic_corpus(documents: int, seed: int = 0) -> tuple[dict[str, list[str]], list[str]]:
+    """Texts of 10-150 Zipf-distributed words split like the real collections, and the vocabulary."""
+    rng = np.random.default_rng(seed)
+    vocabulary = [f"w{rank}" for rank in range(VOCABULARY_SIZE)]
+    ranks = np.minimum(rng.zipf(1.1, size=documents * 80), VOCABULARY_SIZE) - 1
+    lengths = rng.integers(10, 150, size=documents)
+    texts, start = [], 0
+    for length in lengths:
+        texts.append(" ".join(vocabulary[rank] for rank in ranks[start:start + length]))
+        start += length
+    quran = min(6236, documents // 10)
+    dua = min(500, documents // 100)
+    return {"Quran": texts[:quran], "Dua": texts[quran:quran + dua], "Hadith": texts[quran + dua:]}, vocabulary
+
+
+def make_queries(vocabulary: list[str], count: int, seed: int = 1) -> list[str]:
+    """Queries of 1-6 words, half drawn from the most common words and half from the whole vocabulary."""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for i in range(count):
+        pool = 200 if i % 2 else len(vocabulary)
+        words = rng.integers(0, pool, size=rng.integers(1, 7))
+        queries.append(" ".join(vocabulary[word] for word in words))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=66000, help="Size of the synthetic corpus")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries timed")
+    parser.add_argument("--top-k", type=int, default=2, help="Matches per collection")
+    parser.add_argument("--database", action="store_true", help="Index the corpus in the database instead")
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    if args.database:
+        from db.session import SessionLocal
+        from services.vector_store import get_vector_store
+        db = SessionLocal()
+        try:
+            index = LexicalIndex.load(db, get_vector_store())
+        finally:
+            db.close()
+        postings = np.diff(index.indptr)
+        vocabulary = sorted(index.vocabulary, key=lambda term: -postings[index.vocabulary[term]])
+    else:
+        texts, vocabulary = synthetic_corpus(args.documents)
+        index = LexicalIndex.build(texts)
+    build_seconds = time.perf_counter() - start
+    
+    queries = make_queries(vocabulary, args.queries)
+    for query in queries[:50]:
+        index.search(query, args.top_k)  # Warm up
+    
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, args.top_k)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    
+    logger.info("=" * 80)
+    logger.info(
+        f"{index.size} documents, {len(index.vocabulary)} terms, {len(index.docs)} postings, "
+        f"{index.nbytes / (1024 * 1024):.1f} MB, built in {build_seconds:.1f}s"
+    )
+    logger.info(
+        f"search latency over {len(queries)} queries: mean {latencies.mean():.3f} ms, "
+        f"p50 {np.percentile(latencies, 50):.3f} ms, p95 {np.percentile(latencies, 95):.3f} ms, "
+        f"p99 {np.percentile(latencies, 99):.3f} ms"
+    )
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Throughput and latency of concurrent searches with and without micro-batching.
+
+Runs search_all from a number of concurrent threads, each issuing
+distinct queries back to back, once per batching window (0 disables
+micro-batching), and reports throughput together with p50 / p95 / p99
+latency and the mean encode batch size. The query embedding cache is
+disabled so every query reaches the sentence transformer.
+
+Usage:
+    python scripts/benchmark_micro_batching.py [--threads 1 8 32] [--windows 0 2 5]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import threading
+import time
+import numpy as np
+from services.vector_store import VectorStoreService
+from core.config import get_settings
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+settings = get_settings()
+
+QUERY_TEMPLATES = [
+    "I feel anxious and need comfort {}",
+    "feeling lonely and sad today {}",
+    "how do I find patience during hardship {}",
+    "I am grateful for my blessings {}",
+    "I feel guilty about my mistakes {}",
+]
+
+
+def run(vector_store: VectorStoreService, threads: int, queries_per_thread: int) -> tuple[float, np.ndarray]:
+    """Issue queries from concurrent threads; return throughput and per-query latency in ms."""
+    latencies = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+    
+    def worker(number: int) -> None:
+        barrier.wait()
+        for i in range(queries_per_thread):
+            query = QUERY_TEMPLATES[i % len(QUERY_TEMPLATES)].format(f"{number}-{i}")
+            start = time.perf_counter()
+            vector_store.search_all(query)
+            latencies[number].append((time.perf_counter() - start) * 1000)
+    
+    workers = [threading.Thread(target=worker, args=(number,)) for number in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return threads * queries_per_thread / elapsed, np.concatenate([np.array(l) for l in latencies])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 2, 5], help="Batching windows in ms")
+    parser.add_argument("--queries", type=int, default=40, help="Queries per thread")
+    parser.add_argument("--max-batch-size", type=int, default=settings.micro_batch_max_size)
+    args = parser.parse_args()
+    
+    settings.query_embedding_cache_size = 0
+    settings.micro_batch_max_size = args.max_batch_size
+    
+    logger.info("=" * 80)
+    logger.info(f"{'window':>7} {'threads':>8} {'QPS':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'batch':>6}")
+    for window in args.windows:
+        settings.micro_batch_window_ms = window
+        vector_store = VectorStoreService()
+        vector_store.search_all("warm up")
+        
+        for threads in args.threads:
+            before = vector_store.encode_batcher.stats() if vector_store.encode_batcher else None
+            qps, latencies = run(vector_store, threads, args.queries)
+            batch_size = 1.0
+            if before is not None:
+                after = vector_store.encode_batcher.stats()
+                batch_size = (after["items"] - before["items"]) / max(1, after["batches"] - before["batches"])
+            logger.info(
+                f"{window:>5.1f}ms {threads:>8} {qps:>8.1f} {np.percentile(latencies, 50):>8.2f} "
+                f"{np.percentile(latencies, 95):>8.2f} {np.percentile(latencies, 99):>8.2f} {batch_size:>6.1f}"
+            )
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
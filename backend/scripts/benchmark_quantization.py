@@ -0,0 +1,140 @@
+"""
+Memory versus recall@k report for the compressed vector encodings.
+
+Builds a collection's index once per encoding (float32, fp16, sq8, pq)
+over its stored full-precision vectors, then searches a sample of
+queries one at a time (as the API does), with and without exact
+re-ranking of the over-fetched candidates. For each combination it
+reports the serialized index size (the resident size once loaded),
+compression versus float32, recall@k against exact float32 search, and
+mean and p95 query latency.
+
+Queries are stored vectors with a small amount of noise added, so they
+behave like paraphrases of corpus entries. Use --synthetic to run without
+a populated vector store; its isotropic noise is harder on PQ than real
+sentence embeddings are. PQ parameters come from PQ_M / PQ_NBITS.
+
+Usage:
+    python scripts/benchmark_quantization.py [--collection hadith] [--rerank-factor 0 4]
+    python scripts/benchmark_quantization.py --synthetic 60000 --index-type hnsw
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import time
+import faiss
+import numpy as np
+from services.index_storage import SegmentedIndexStorage, VectorRows, COLLECTION_NAMES
+from services.index_factory import ENCODINGS, INDEX_TYPES, build_index, encoding_of
+from core.config import get_settings
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+def load_vectors(args) -> np.ndarray:
+    """Load the collection's full-precision vectors, or generate synthetic ones."""
+    if args.synthetic:
+        rng = np.random.default_rng(0)
+        # Clustered data resembles sentence embeddings better than uniform noise
+        centers = rng.standard_normal((256, settings.embedding_dimension)).astype(np.float32)
+        vectors = centers[rng.integers(0, len(centers), args.synthetic)]
+        vectors += 0.5 * rng.standard_normal(vectors.shape).astype(np.float32)
+    else:
+        storage = SegmentedIndexStorage(args.persist_dir, COLLECTION_NAMES)
+        vectors = np.ascontiguousarray(storage.read_vectors(args.collection, settings.embedding_dimension))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def make_queries(vectors: np.ndarray, count: int) -> np.ndarray:
+    """Sample stored vectors and perturb them."""
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(len(vectors), size=min(count, len(vectors)), replace=False)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    return queries.astype(np.float32)
+
+
+def timed_search(
+    index: faiss.Index,
+    queries: np.ndarray,
+    k: int,
+    rows: VectorRows,
+    rerank_factor: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Search one query at a time, re-ranking like search_all; return ids and latency in ms."""
+    results = np.full((len(queries), k), -1, dtype=np.int64)
+    latencies = np.empty(len(queries))
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        if rerank_factor > 0:
+            _, indices = index.search(queries[i:i + 1], min(k * rerank_factor, index.ntotal))
+            _, positions = rows.rerank(queries[i], indices[0], k)
+        else:
+            _, indices = index.search(queries[i:i + 1], k)
+            positions = indices[0]
+        latencies[i] = (time.perf_counter() - start) * 1000
+        results[i, :len(positions)] = positions
+    return results, latencies
+
+
+def recall_at_k(results: np.ndarray, truth: np.ndarray) -> float:
+    """Fraction of the exact top-k found by the compressed search."""
+    hits = sum(len(set(r.tolist()) & set(t.tolist())) for r, t in zip(results, truth))
+    return hits / truth.size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--collection", choices=COLLECTION_NAMES, default="hadith")
+    parser.add_argument("--persist-dir", default=settings.vector_store_persist_dir)
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=settings.default_top_k_per_type)
+    parser.add_argument("--index-type", choices=INDEX_TYPES, default="flat")
+    parser.add_argument("--encodings", choices=ENCODINGS, nargs="+", default=list(ENCODINGS))
+    parser.add_argument("--rerank-factor", type=int, nargs="+", default=[0, settings.vector_rerank_factor])
+    args = parser.parse_args()
+    
+    vectors = load_vectors(args)
+    queries = make_queries(vectors, args.queries)
+    rows = VectorRows(vectors.shape[1], [vectors])
+    logger.info(f"{len(vectors)} vectors, {len(queries)} queries, k={args.k}, index type {args.index_type}")
+    
+    exact = faiss.IndexFlatL2(vectors.shape[1])
+    exact.add(vectors)
+    truth, _ = timed_search(exact, queries, args.k, rows, 0)
+    float32_bytes = vectors.nbytes
+    
+    logger.info("=" * 80)
+    logger.info(
+        f"{'encoding':<9} {'rerank':>6} {'index MB':>9} {'ratio':>6} {'recall':>8} "
+        f"{'mean ms':>9} {'p95 ms':>9} {'build s':>8}"
+    )
+    for encoding in args.encodings:
+        start = time.perf_counter()
+        index = build_index(args.index_type, encoding, vectors)
+        build_s = time.perf_counter() - start
+        if encoding_of(index) != encoding:
+            logger.info(f"{encoding:<9} skipped: too few vectors to train")
+            continue
+        index_bytes = faiss.serialize_index(index).nbytes
+        
+        for rerank_factor in args.rerank_factor:
+            results, latencies = timed_search(index, queries, args.k, rows, rerank_factor)
+            logger.info(
+                f"{encoding:<9} {rerank_factor if rerank_factor else '-':>6} {index_bytes / 2**20:>9.1f} "
+                f"{float32_bytes / index_bytes:>5.1f}x {recall_at_k(results, truth):>8.4f} "
+                f"{latencies.mean():>9.3f} {np.percentile(latencies, 95):>9.3f} {build_s:>8.1f}"
+            )
+    logger.info("=" * 80)
+    logger.info("Re-ranking reads the full-precision vectors from disk; they are not counted in index MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Compare index startup time and memory for N serving workers.
+
+Each worker process loads every collection from the vector store
+directory the way VectorStoreService does, runs a few searches so the
+index pages are actually touched, and reports its load time, RSS and
+PSS (proportional set size, which splits shared pages between the
+processes mapping them). Copy mode reads each index into private memory;
+mmap mode is what VECTOR_STORE_READ_ONLY=true serves from, so the page
+cache copy is shared by all workers.
+
+The sentence transformer is not loaded; only index memory is measured.
+
+Usage:
+    python scripts/benchmark_worker_memory.py [--workers 1 8] [--persist-dir DIR]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import multiprocessing as mp
+import time
+import faiss
+import numpy as np
+from services.index_storage import SegmentedIndexStorage, COLLECTION_NAMES
+from core.config import get_settings
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+def read_memory_kb() -> tuple[int, int]:
+    """Return (RSS, PSS) of the current process in kB."""
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0]] = int(parts[1])
+    return values["Rss:"], values["Pss:"]
+
+
+def worker(persist_dir: str, mmap: bool, barrier, results) -> None:
+    """Load every collection, touch it, and report once all workers are up."""
+    start = time.perf_counter()
+    storage = SegmentedIndexStorage(persist_dir, COLLECTION_NAMES)
+    indexes = [
+        storage.load(name, lambda: faiss.IndexFlatL2(settings.embedding_dimension), mmap=mmap)[0]
+        for name in COLLECTION_NAMES
+    ]
+    load_ms = (time.perf_counter() - start) * 1000
+    
+    queries = np.random.default_rng(0).standard_normal((4, settings.embedding_dimension)).astype("float32")
+    for index in indexes:
+        if index.ntotal > 0:
+            index.search(queries, 5)
+    
+    # Measure while every worker is alive so shared pages are split between them
+    barrier.wait()
+    rss_kb, pss_kb = read_memory_kb()
+    results.put((load_ms, rss_kb, pss_kb))
+    barrier.wait()
+
+
+def run(persist_dir: str, workers: int, mmap: bool) -> tuple[float, float, int, int]:
+    """Start the workers and aggregate their measurements."""
+    context = mp.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(persist_dir, mmap, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    measurements = [results.get() for _ in range(workers)]
+    for process in processes:
+        process.join()
+    
+    load_times = [m[0] for m in measurements]
+    return (
+        sum(load_times) / workers,
+        max(load_times),
+        sum(m[1] for m in measurements),
+        sum(m[2] for m in measurements)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--persist-dir", default=settings.vector_store_persist_dir)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+    
+    storage = SegmentedIndexStorage(args.persist_dir, COLLECTION_NAMES)
+    if any(storage.segment_count(name) for name in COLLECTION_NAMES):
+        logger.warning("Store has uncompacted segments; mmap mode will fall back to copies for them")
+    
+    logger.info("=" * 80)
+    logger.info(f"{'mode':>6} {'workers':>8} {'load avg':>10} {'load max':>10} {'total RSS':>12} {'total PSS':>12}")
+    for mmap in (False, True):
+        for workers in args.workers:
+            load_avg, load_max, rss_kb, pss_kb = run(args.persist_dir, workers, mmap)
+            logger.info(
+                f"{'mmap' if mmap else 'copy':>6} {workers:>8} {load_avg:>8.1f}ms {load_max:>8.1f}ms "
+                f"{rss_kb / 1024:>10.1f}MB {pss_kb / 1024:>10.1f}MB"
+            )
+    logger.info("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Merge the on-disk segments of the vector store into one base index per collection."""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+from services.vector_store import get_vector_store, COLLECTION_NAMES
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "collection",
+        nargs="?",
+        choices=COLLECTION_NAMES,
+        help="Collection to compact (default: all)"
+    )
+    args = parser.parse_args()
+    
+    vector_store = get_vector_store()
+    vector_store.compact(args.collection)
+    logger.info("Compaction completed!")
+
+
+if __name__ == "__main__":
+    main()
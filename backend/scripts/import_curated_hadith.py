@@ -23,6 +23,7 @@ from sqlalchemy.orm import Session
 from db.session import SessionLocal, init_db
 from models.database import Hadith
 from services.vector_store import get_vector_store
+from services.ingestion import IngestionPipeline, IngestBatch
 from core.logging import setup_logging, get_logger
 
 setup_logging()
@@ -267,47 +268,19 @@ def import_curated_hadiths():
         logger.info("Clearing existing hadith data...")
         db.query(Hadith).delete()
         db.commit()
+        vector_store.clear("hadith")
         logger.info("✓ Cleared existing data\n")
         
-        batch_texts = []
-        batch_ids = []
-        batch_size = 50
-        total_imported = 0
-        
-        for hadith_data in CURATED_HADITHS:
-            # Create database record
-            hadith = Hadith(
-                book=hadith_data["book"],
-                hadith_number=hadith_data["hadith_number"],
-                arabic_text=hadith_data["arabic_text"],
-                translation=hadith_data["translation"],
-                citation=hadith_data["citation"]
-            )
-            db.add(hadith)
-            db.flush()
-            
-            # Add to embedding batch
-            # Include themes in the text for better semantic matching
-            themes_text = " ".join(hadith_data.get("themes", []))
-            searchable_text = f"{hadith_data['translation']} {themes_text}"
-            
-            batch_texts.append(searchable_text)
-            batch_ids.append(str(hadith.id))
-            total_imported += 1
-            
-            # Process batch
-            if len(batch_texts) >= batch_size:
-                logger.info(f"Creating embeddings... (total: {total_imported})")
-                vector_store.add_texts(batch_texts, batch_ids, "hadith")
-                db.commit()
-                batch_texts = []
-                batch_ids = []
-        
-        # Process remaining batch
-        if batch_texts:
-            logger.info(f"Creating final embeddings...")
-            vector_store.add_texts(batch_texts, batch_ids, "hadith")
-            db.commit()
+        pipeline = IngestionPipeline(
+            db,
+            vector_store,
+            Hadith,
+            "hadith",
+            # Include the themes in the text for better semantic matching
+            text_of=lambda hadith_data: f"{hadith_data['translation']} {' '.join(hadith_data.get('themes', []))}"
+        )
+        stats = pipeline.run([IngestBatch(CURATED_HADITHS)])
+        total_imported = stats["index"].rows
         
         logger.info("\n" + "="*80)
         logger.info("IMPORT COMPLETED SUCCESSFULLY!")
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from db.session import SessionLocal, init_db
 from models.database import Hadith
 from services.vector_store import get_vector_store
+from services.ingestion import IngestionPipeline, IngestBatch
 from core.logging import setup_logging, get_logger
 
 setup_logging()
@@ -59,6 +60,7 @@ def import_hadith_from_json():
         # Clear existing hadith data
         db.query(Hadith).delete()
         db.commit()
+        vector_store.clear("hadith")
         logger.info("Cleared existing Hadith data")
         
         # Sample comprehensive hadith collection
@@ -180,33 +182,9 @@ def import_hadith_from_json():
         
         all_hadiths = sample_hadiths + additional_hadiths
         
-        batch_texts = []
-        batch_ids = []
-        batch_size = 50
-        total_hadiths = 0
-        
-        for hadith_data in all_hadiths:
-            hadith = Hadith(**hadith_data)
-            db.add(hadith)
-            db.flush()
-            
-            batch_texts.append(hadith_data["translation"])
-            batch_ids.append(str(hadith.id))
-            total_hadiths += 1
-            
-            if len(batch_texts) >= batch_size:
-                logger.info(f"Creating embeddings for batch (total: {total_hadiths} hadiths)")
-                vector_store.add_texts(batch_texts, batch_ids, "hadith")
-                batch_texts = []
-                batch_ids = []
-        
-        # Process remaining batch
-        if batch_texts:
-            logger.info(f"Creating embeddings for final batch")
-            vector_store.add_texts(batch_texts, batch_ids, "hadith")
-        
-        db.commit()
-        logger.info(f"Successfully imported {total_hadiths} hadiths!")
+        pipeline = IngestionPipeline(db, vector_store, Hadith, "hadith")
+        stats = pipeline.run([IngestBatch(all_hadiths)])
+        logger.info(f"Successfully imported {stats['index'].rows} hadiths!")
         logger.info("Note: This is a sample collection. For complete hadith collections (6000+),")
         logger.info("please download hadith datasets from sources like:")
         logger.info("- https://github.com/sunnah-com/hadith")
@@ -0,0 +1,147 @@
+"""
+Import hadith collections from local sunnah.com JSON files.
+
+Reads every *.json file under the data directory (backend/data/hadith by
+default), e.g. bukhari.json or bukhari/bukhari12.json. A file may be an
+array of hadith records or an object with a "hadiths" array; the
+collection is taken from the file or directory name.
+
+Files are streamed through an incremental JSON parser, so memory stays
+bounded whatever their size, and fed through the ingestion pipeline
+(services.ingestion), which parses, inserts, embeds and indexes batches
+concurrently. Nothing touches the network, so this works on air-gapped
+hosts.
+
+Citations already in the database are skipped, so re-running only adds
+new hadiths. Use --replace to delete all hadiths first. Hadiths are
+embedded on every available core; --embed-workers 1 encodes in-process
+instead, which is faster for a handful of files.
+
+Usage:
+    python scripts/import_hadith_from_files.py [--data-dir data/hadith] [--replace] [--embed-workers N]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+from typing import Iterator, List
+from db.session import SessionLocal, init_db
+from db.bulk import DEFAULT_BATCH_SIZE
+from models.database import Hadith
+from services.vector_store import get_vector_store
+from services.ingestion import IngestionPipeline, IngestBatch
+from services.json_stream import iter_json_items
+from services.sunnah_dataset import collection_for_file, hadith_row
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+
+DATA_DIR = Path(__file__).parent.parent / "data" / "hadith"
+
+
+def dataset_files(data_dir: Path) -> List[Path]:
+    """Find the hadith files under a directory, skipping collection metadata."""
+    return sorted(path for path in data_dir.rglob("*.json") if path.name != "meta.json")
+
+
+def parse_files(files: List[Path], batch_size: int) -> Iterator[List[dict]]:
+    """
+    Stream and normalize the records of dataset files.
+    
+    Args:
+        files: Dataset files
+        batch_size: Rows per yielded batch
+        
+    Yields:
+        Lists of Hadith column values
+    """
+    batch = []
+    for path in files:
+        collection = collection_for_file(path)
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for record in iter_json_items(f, key="hadiths"):
+                row = hadith_row(record, collection["display"]) if isinstance(record, dict) else None
+                if row is None:
+                    continue
+                batch.append(row)
+                count += 1
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        logger.info(f"Parsed {count} hadiths from {path.name} ({collection['display']})")
+    if batch:
+        yield batch
+
+
+def import_files(
+    data_dir: Path,
+    replace: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    embed_workers: int = 0
+) -> int:
+    """
+    Import all hadith files under a directory.
+    
+    Args:
+        data_dir: Directory holding the dataset files
+        replace: Delete existing hadiths and their vectors first
+        batch_size: Rows per INSERT statement
+        embed_workers: Embedding processes, 0 = one per available core
+        
+    Returns:
+        Number of hadiths imported
+    """
+    files = dataset_files(data_dir)
+    if not files:
+        logger.error(f"No JSON files found in {data_dir}")
+        logger.info("Run scripts/download_hadith_dataset.py for instructions")
+        return 0
+    
+    db = SessionLocal()
+    vector_store = get_vector_store()
+    
+    try:
+        logger.info(f"Importing {len(files)} files from {data_dir}")
+        if replace:
+            logger.info("Clearing existing hadith data...")
+            db.query(Hadith).delete()
+            db.commit()
+            vector_store.clear("hadith")
+        
+        pipeline = IngestionPipeline(
+            db,
+            vector_store,
+            Hadith,
+            "hadith",
+            batch_size=batch_size,
+            embed_workers=embed_workers
+        )
+        stats = pipeline.run(IngestBatch(rows) for rows in parse_files(files, batch_size))
+        return stats["index"].rows
+    except Exception as e:
+        logger.error(f"Import failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--replace", action="store_true", help="Delete all hadiths before importing")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT statement")
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=0,
+        help="Embedding processes (default: 0, one per available core; 1 encodes in-process)"
+    )
+    args = parser.parse_args()
+    
+    logger.info("Initializing database...")
+    init_db()
+    import_files(args.data_dir, replace=args.replace, batch_size=args.batch_size, embed_workers=args.embed_workers)
@@ -15,6 +15,7 @@ from sqlalchemy.orm import Session
 from db.session import SessionLocal, init_db
 from models.database import Hadith
 from services.vector_store import get_vector_store
+from services.ingestion import IngestionPipeline, IngestBatch
 from core.logging import setup_logging, get_logger
 
 setup_logging()
@@ -176,44 +177,17 @@ def import_health_hadiths():
         logger.info(f"\nTotal hadiths to import: {len(HEALTH_HADITHS)}")
         logger.info("Categories: Food, Nutrition, Remedies, Hygiene, Exercise, Sleep\n")
         
-        batch_texts = []
-        batch_ids = []
-        total_imported = 0
-        
-        for hadith_data in HEALTH_HADITHS:
-            # Check if already exists
-            existing = db.query(Hadith).filter(
-                Hadith.citation == hadith_data["citation"]
-            ).first()
-            
-            if existing:
-                logger.info(f"Skipping existing: {hadith_data['citation']}")
-                continue
-            
-            # Create database record
-            hadith = Hadith(
-                book=hadith_data["book"],
-                hadith_number=hadith_data["hadith_number"],
-                arabic_text=hadith_data["arabic_text"],
-                translation=hadith_data["translation"],
-                citation=hadith_data["citation"]
-            )
-            db.add(hadith)
-            db.flush()
-            
-            # Add to embedding batch with themes
-            themes_text = " ".join(hadith_data.get("themes", []))
-            searchable_text = f"{hadith_data['translation']} {themes_text}"
-            
-            batch_texts.append(searchable_text)
-            batch_ids.append(str(hadith.id))
-            total_imported += 1
-        
-        # Create embeddings
-        if batch_texts:
-            logger.info(f"Creating embeddings for {len(batch_texts)} hadiths...")
-            vector_store.add_texts(batch_texts, batch_ids, "hadith")
-            db.commit()
+        # Citations already in the database are skipped
+        pipeline = IngestionPipeline(
+            db,
+            vector_store,
+            Hadith,
+            "hadith",
+            # Include the themes in the text for better semantic matching
+            text_of=lambda hadith_data: f"{hadith_data['translation']} {' '.join(hadith_data.get('themes', []))}"
+        )
+        stats = pipeline.run([IngestBatch(HEALTH_HADITHS)])
+        total_imported = stats["index"].rows
         
         logger.info("\n" + "="*80)
         logger.info("IMPORT COMPLETED SUCCESSFULLY!")
@@ -20,82 +20,96 @@ Collections included:
 - Bulugh al-Maram (1358 hadiths)
 
 Total: 60,000+ authentic hadiths
+
+Progress is checkpointed per book in IMPORT_CHECKPOINT_DIR/sunnah.json.
+An interrupted import continues with:
+    python scripts/import_sunnah_complete.py --resume
+    
+Hadiths are embedded on every available core; --embed-workers 1 encodes
+in-process instead.
 """
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-import requests
+import argparse
 import json
+import os
 import time
-from typing import List, Dict
-from sqlalchemy.orm import Session
+from typing import List, Dict, Iterator, Optional
 from db.session import SessionLocal, init_db
 from models.database import Hadith
 from services.vector_store import get_vector_store
+from services.ingestion import IngestionPipeline, IngestBatch
+from services.http_fetcher import HttpFetcher
+from services.sunnah_dataset import COLLECTIONS, hadith_row
+from services.import_checkpoint import ImportCheckpoint, FETCHED, INSERTED, EMBEDDED
+from core.config import get_settings
 from core.logging import setup_logging, get_logger
 
 setup_logging()
 logger = get_logger(__name__)
+settings = get_settings()
+
+# Base URL of the sunnah.com dataset (GitHub raw content unless SUNNAH_DATASET_URL is set)
+GITHUB_BASE = settings.sunnah_dataset_url.rstrip("/")
+
+fetcher = HttpFetcher()
+
 
-# GitHub raw content base URL for sunnah.com dataset
-GITHUB_BASE = "https://raw.githubusercontent.com/sunnah-com/hadith/main"
-
-# Hadith collections to import
-COLLECTIONS = [
-    {"name": "bukhari", "display": "Sahih Bukhari", "books": 97},
-    {"name": "muslim", "display": "Sahih Muslim", "books": 56},
-    {"name": "abudawud", "display": "Sunan Abu Dawud", "books": 43},
-    {"name": "tirmidhi", "display": "Jami' at-Tirmidhi", "books": 49},
-    {"name": "nasai", "display": "Sunan an-Nasa'i", "books": 51},
-    {"name": "ibnmajah", "display": "Sunan Ibn Majah", "books": 37},
-    {"name": "malik", "display": "Muwatta Malik", "books": 61},
-    {"name": "riyadussalihin", "display": "Riyad as-Salihin", "books": 19},
-    {"name": "nawawi40", "display": "40 Hadith Nawawi", "books": 1},
-    {"name": "qudsi40", "display": "40 Hadith Qudsi", "books": 1},
-    {"name": "bulugh", "display": "Bulugh al-Maram", "books": 16},
-]
-
-
-def fetch_collection_metadata(collection_name: str) -> Dict:
+def fetch_collection_metadata(collection_name: str) -> Optional[Dict]:
     """Fetch metadata for a hadith collection."""
-    url = f"{GITHUB_BASE}/{collection_name}/meta.json"
+    return fetcher.fetch_json(f"{GITHUB_BASE}/{collection_name}/meta.json")
+
+
+def book_url(collection_name: str, book_number: int) -> str:
+    """URL of a book file in a collection."""
+    return f"{GITHUB_BASE}/{collection_name}/{collection_name}{book_number}.json"
+
+
+def parse_book_hadiths(body: Optional[bytes], url: str) -> List[Dict]:
+    """Decode the hadiths of a fetched book file."""
+    if body is None:
+        return []
     try:
-        response = requests.get(url, timeout=30)
-        if response.status_code == 200:
-            return response.json()
-    except Exception as e:
-        logger.error(f"Failed to fetch metadata for {collection_name}: {e}")
-    return None
+        return json.loads(body).get('hadiths', [])
+    except (ValueError, AttributeError) as e:
+        logger.warning(f"Could not parse {url}: {e}")
+        return []
 
 
 def fetch_book_hadiths(collection_name: str, book_number: int) -> List[Dict]:
     """Fetch hadiths from a specific book in a collection."""
-    url = f"{GITHUB_BASE}/{collection_name}/{collection_name}{book_number}.json"
-    try:
-        response = requests.get(url, timeout=30)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get('hadiths', [])
-    except Exception as e:
-        logger.warning(f"Could not fetch {collection_name} book {book_number}: {e}")
-    return []
+    url = book_url(collection_name, book_number)
+    return parse_book_hadiths(fetcher.fetch(url), url)
 
 
-def import_collection(collection: Dict, db: Session, vector_store) -> int:
-    """Import a complete hadith collection."""
+def book_rows(hadiths: List[Dict], display_name: str) -> List[Dict]:
+    """Convert the hadiths of a book file to Hadith rows."""
+    rows = (hadith_row(hadith_data, display_name) for hadith_data in hadiths)
+    return [row for row in rows if row is not None]
+                
+                
+def collection_batches(collection: Dict, checkpoint: ImportCheckpoint) -> Iterator[IngestBatch]:
+    """
+    Yield the books of a collection that are not imported yet.
+    
+    Books missing from the checkpoint are downloaded concurrently; books
+    fetched by an earlier run come from the HTTP cache. Once every book
+    was fetched, a final empty batch keyed by the collection marks it
+    done when it reaches the index stage after the books.
+    """
     collection_name = collection['name']
     display_name = collection['display']
     
+    if checkpoint.reached(collection_name, EMBEDDED):
+        logger.info(f"✓ {display_name} already imported, skipping")
+        return
+    
     logger.info(f"\n{'='*80}")
     logger.info(f"Importing {display_name}")
     logger.info(f"{'='*80}")
     
-    total_imported = 0
-    batch_texts = []
-    batch_ids = []
-    batch_size = 100
-    
     # Fetch metadata
     metadata = fetch_collection_metadata(collection_name)
     if not metadata:
@@ -104,129 +118,109 @@ def import_collection(collection: Dict, db: Session, vector_store) -> int:
     else:
         num_books = len(metadata.get('books', []))
     
-    # Import each book
-    for book_num in range(1, num_books + 1):
-        logger.info(f"Fetching book {book_num}/{num_books}...")
-        hadiths = fetch_book_hadiths(collection_name, book_num)
-        
-        if not hadiths:
+    # Download the books not fetched by an earlier run concurrently, importing them in order
+    book_nums = range(1, num_books + 1)
+    to_download = [book_num for book_num in book_nums if checkpoint.state(f"{collection_name}/{book_num}") is None]
+    downloads = fetcher.fetch_many(book_url(collection_name, book_num) for book_num in to_download)
+    complete = True
+    
+    for book_num in book_nums:
+        unit = f"{collection_name}/{book_num}"
+        state = checkpoint.state(unit)
+        if state == EMBEDDED:
             continue
         
-        for hadith_data in hadiths:
-            try:
-                # Extract hadith information
-                hadith_number = hadith_data.get('hadithNumber', '')
-                arabic_text = hadith_data.get('hadithArabic', '')
-                english_text = hadith_data.get('hadithEnglish', '')
-                
-                # Skip if no English translation
-                if not english_text or not arabic_text:
-                    continue
-                
-                # Clean HTML tags from text
-                import re
-                english_text = re.sub(r'<[^>]+>', '', english_text)
-                arabic_text = re.sub(r'<[^>]+>', '', arabic_text)
-                
-                # Create citation
-                citation = f"{display_name} {hadith_number}"
-                
-                # Check if already exists
-                existing = db.query(Hadith).filter(Hadith.citation == citation).first()
-                if existing:
-                    continue
-                
-                # Create database record
-                hadith = Hadith(
-                    book=display_name,
-                    hadith_number=str(hadith_number),
-                    arabic_text=arabic_text[:5000],  # Limit length
-                    translation=english_text[:5000],  # Limit length
-                    citation=citation
-                )
-                db.add(hadith)
-                db.flush()
-                
-                # Add to embedding batch
-                batch_texts.append(english_text[:1000])  # Limit for embedding
-                batch_ids.append(str(hadith.id))
-                total_imported += 1
-                
-                # Process batch
-                if len(batch_texts) >= batch_size:
-                    logger.info(f"  Creating embeddings... (total: {total_imported})")
-                    vector_store.add_texts(batch_texts, batch_ids, "hadith")
-                    db.commit()
-                    batch_texts = []
-                    batch_ids = []
-                    time.sleep(0.1)  # Small delay to avoid overwhelming the system
-                
-            except Exception as e:
-                logger.error(f"Error processing hadith: {e}")
+        logger.info(f"Importing {display_name} book {book_num}/{num_books}...")
+        url = book_url(collection_name, book_num)
+        if state is None:
+            _, body = next(downloads)
+            if body is None:
+                complete = False
                 continue
+            checkpoint.mark(unit, FETCHED)
+        else:
+            body = fetcher.cached(url) or fetcher.fetch(url)
         
-        # Small delay between books
-        time.sleep(0.5)
+        yield IngestBatch(book_rows(parse_book_hadiths(body, url), display_name), key=unit)
     
-    # Process remaining batch
-    if batch_texts:
-        logger.info(f"  Creating final embeddings...")
-        vector_store.add_texts(batch_texts, batch_ids, "hadith")
-        db.commit()
-    
-    logger.info(f"✓ Imported {total_imported} hadiths from {display_name}")
-    return total_imported
+    if complete:
+        yield IngestBatch([], key=collection_name)
+    else:
+        logger.warning(f"Some {display_name} books could not be fetched; --resume retries them")
 
 
-def import_all_sunnah():
-    """Import all hadith collections from Sunnah.com."""
+def sunnah_batches(checkpoint: ImportCheckpoint) -> Iterator[IngestBatch]:
+    """Yield the books of every collection, skipping collections that fail."""
+    for collection in COLLECTIONS:
+        try:
+            yield from collection_batches(collection, checkpoint)
+        except Exception as e:
+            logger.error(f"Failed to import {collection['display']}: {e}")
+
+
+def import_all_sunnah(resume: bool = False, embed_workers: int = 0):
+    """
+    Import all hadith collections from Sunnah.com.
+    
+    Each book is committed to the database before it is embedded, so an
+    interruption can leave rows without vectors but never vectors without
+    rows; a resumed run embeds those rows without fetching them again.
+    
+    Args:
+        resume: Continue an interrupted import instead of starting over
+        embed_workers: Embedding processes, 0 = one per available core
+    """
     db = SessionLocal()
     vector_store = get_vector_store()
+    checkpoint = ImportCheckpoint(os.path.join(settings.import_checkpoint_dir, "sunnah.json"))
     
     try:
         logger.info("="*80)
         logger.info("SUNNAH.COM COMPLETE HADITH IMPORT")
         logger.info("="*80)
         logger.info("\nThis will import 60,000+ authentic hadiths")
-        logger.info("Estimated time: 2-4 hours depending on connection speed")
-        logger.info("\nPress Ctrl+C to cancel\n")
+        logger.info(f"Downloading from {GITHUB_BASE} ({fetcher.concurrency} at a time, cached in {fetcher.cache_dir})")
         
-        time.sleep(3)
+        if resume:
+            logger.info(f"Resuming from {checkpoint.path}\n")
+        else:
+            logger.info("\nPress Ctrl+C to cancel\n")
+            time.sleep(3)
         
-        # Clear existing hadith data
-        logger.info("Clearing existing hadith data...")
-        db.query(Hadith).delete()
-        db.commit()
-        logger.info("✓ Cleared existing data\n")
+            # Clear existing hadith data
+            logger.info("Clearing existing hadith data...")
+            db.query(Hadith).delete()
+            db.commit()
+            vector_store.clear("hadith")
+            checkpoint.reset()
+            logger.info("✓ Cleared existing data\n")
         
-        total_all = 0
-        
-        # Import each collection
-        for collection in COLLECTIONS:
-            try:
-                count = import_collection(collection, db, vector_store)
-                total_all += count
-            except KeyboardInterrupt:
-                logger.info("\n\nImport cancelled by user")
-                db.commit()
-                raise
-            except Exception as e:
-                logger.error(f"Failed to import {collection['display']}: {e}")
-                continue
-        
-        db.commit()
+        pipeline = IngestionPipeline(
+            db,
+            vector_store,
+            Hadith,
+            "hadith",
+            resume=resume,
+            on_inserted=lambda unit: checkpoint.mark(unit, INSERTED),
+            on_indexed=lambda unit: checkpoint.mark(unit, EMBEDDED),
+            embed_workers=embed_workers
+        )
+        stats = pipeline.run(sunnah_batches(checkpoint))
+        logger.info(f"Downloaded {fetcher.downloaded} files, {fetcher.revalidated} unchanged since the last run")
         
         logger.info("\n" + "="*80)
         logger.info("IMPORT COMPLETED SUCCESSFULLY!")
         logger.info("="*80)
-        logger.info(f"\nTotal hadiths imported: {total_all}")
+        logger.info(f"\nTotal hadiths imported: {stats['index'].rows}")
         logger.info("\nCollections imported:")
         for collection in COLLECTIONS:
-            logger.info(f"  ✓ {collection['display']}")
+            if checkpoint.reached(collection['name'], EMBEDDED):
+                logger.info(f"  ✓ {collection['display']}")
+            else:
+                logger.info(f"  ✗ {collection['display']} (incomplete, run with --resume)")
         
     except KeyboardInterrupt:
-        logger.info("\n\nImport cancelled. Saving progress...")
-        db.commit()
+        logger.info("\n\nImport cancelled. Completed books are checkpointed; run with --resume to continue.")
     except Exception as e:
         logger.error(f"Import failed: {e}")
         db.rollback()
@@ -236,8 +230,22 @@ def import_all_sunnah():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted import from its checkpoint instead of deleting all hadiths"
+    )
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=0,
+        help="Embedding processes (default: 0, one per available core; 1 encodes in-process)"
+    )
+    args = parser.parse_args()
+    
     logger.info("Initializing database...")
     init_db()
     logger.info("Starting complete Sunnah import...\n")
-    import_all_sunnah()
+    import_all_sunnah(resume=args.resume, embed_workers=args.embed_workers)
     logger.info("\n✓ All Sunnah collections imported successfully!")
@@ -0,0 +1,146 @@
+"""
+Find and repair drift between the database and the vector store.
+
+For each collection, the database IDs (streamed in primary-key order)
+and the index IDs (sorted) are merged in one pass to find:
+
+    missing     rows with no vector, e.g. inserted by an import that
+                failed before indexing
+    stale       vectors whose row no longer exists, e.g. after a
+                db.query(Hadith).delete() that left the index alone
+    duplicate   IDs indexed more than once
+    
+Stale and duplicated vectors are dropped from the stored vectors without
+re-embedding anything else, then only the missing rows (and one copy of
+each duplicate) are embedded. Use --dry-run to only report the drift.
+
+Usage:
+    python scripts/reconcile_vector_store.py [collection] [--dry-run]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+from typing import Iterable, Iterator
+import numpy as np
+from sqlalchemy.orm import Session
+from db.session import SessionLocal
+from models.database import COLLECTION_MODELS
+from services.vector_store import get_vector_store, VectorStoreService, COLLECTION_NAMES
+from services.ingestion import embed_text
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+
+# Rows fetched per query
+CHUNK_SIZE = 1000
+
+
+def diff_sorted(db_ids: Iterable[int], index_ids: Iterable[int]) -> tuple[list[int], list[int]]:
+    """
+    Merge two ascending, duplicate-free ID streams.
+    
+    Args:
+        db_ids: IDs of the database rows
+        index_ids: IDs of the indexed vectors
+        
+    Returns:
+        (IDs only in the database, IDs only in the index)
+    """
+    missing, stale = [], []
+    db_iter, index_iter = iter(db_ids), iter(index_ids)
+    db_id, index_id = next(db_iter, None), next(index_iter, None)
+    while db_id is not None or index_id is not None:
+        if index_id is None or (db_id is not None and db_id < index_id):
+            missing.append(db_id)
+            db_id = next(db_iter, None)
+        elif db_id is None or index_id < db_id:
+            stale.append(index_id)
+            index_id = next(index_iter, None)
+        else:
+            db_id, index_id = next(db_iter, None), next(index_iter, None)
+    return missing, stale
+
+
+def stream_db_ids(db: Session, model) -> Iterator[int]:
+    """Yield a table's primary keys in ascending order without loading them all."""
+    for (row_id,) in db.query(model.id).order_by(model.id).yield_per(CHUNK_SIZE):
+        yield row_id
+
+
+def reembed(db: Session, vector_store: VectorStoreService, name: str, ids: list[int]) -> None:
+    """Embed the rows of some IDs and add them to the collection as one segment."""
+    model = COLLECTION_MODELS[name]
+    with vector_store.bulk_ingest(name) as session:
+        for start in range(0, len(ids), CHUNK_SIZE):
+            rows = (
+                db.query(model.id, model.translation)
+                .filter(model.id.in_(ids[start:start + CHUNK_SIZE]))
+                .order_by(model.id)
+                .all()
+            )
+            session.add_texts([embed_text(name, row.translation) for row in rows], [str(row.id) for row in rows])
+
+
+def reconcile(db: Session, vector_store: VectorStoreService, name: str, dry_run: bool = False) -> dict:
+    """
+    Diff one collection against its table and repair it.
+    
+    Args:
+        db: Database session
+        vector_store: Vector store service instance
+        name: Collection name
+        dry_run: Only report the drift
+        
+    Returns:
+        Counts of vectors, missing rows, stale vectors and duplicated IDs
+    """
+    index_ids, counts = np.unique(vector_store.get_ids(name).as_array(), return_counts=True)
+    duplicates = index_ids[counts > 1].tolist()
+    missing, stale = diff_sorted(stream_db_ids(db, COLLECTION_MODELS[name]), index_ids.tolist())
+    report = {
+        "collection": name,
+        "vectors": int(counts.sum()),
+        "missing": len(missing),
+        "stale": len(stale),
+        "duplicate": len(duplicates)
+    }
+    logger.info(
+        f"{name}: {report['vectors']} vectors, {report['missing']} rows missing from the index, "
+        f"{report['stale']} stale vectors, {report['duplicate']} duplicated IDs"
+    )
+    if dry_run or not (missing or stale or duplicates):
+        return report
+    
+    vector_store.remove_ids(name, [str(item_id) for item_id in set(stale) | set(duplicates)])
+    # Duplicates were removed entirely, so they are embedded again like missing rows
+    reembed(db, vector_store, name, sorted((set(missing) | set(duplicates)) - set(stale)))
+    vector_store.compact(name)
+    logger.info(f"Repaired {name} collection")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "collection",
+        nargs="?",
+        choices=COLLECTION_NAMES,
+        help="Collection to reconcile (default: all)"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Report drift without repairing it")
+    args = parser.parse_args()
+    
+    db = SessionLocal()
+    vector_store = get_vector_store()
+    try:
+        for name in [args.collection] if args.collection else COLLECTION_NAMES:
+            reconcile(db, vector_store, name, dry_run=args.dry_run)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Rebuild the vector indexes from the rows already in the database.
+
+Streams the QuranAyah, Dua and Hadith tables in primary-key order through
+a server-side cursor (yield_per), so memory stays flat whatever the table
+size, and feeds them to the ingestion pipeline, which embeds them on
+every available core (see --embed-workers) and indexes them in the same order. Nothing is
+downloaded and no table is modified.
+
+The indexes are written to a new versioned directory next to
+VECTOR_STORE_PERSIST_DIR (chroma_db.v1, chroma_db.v2, ...), leaving the
+live indexes untouched until VECTOR_STORE_PERSIST_DIR is pointed at the
+new one. When only some collections are rebuilt, the others are copied
+from the live indexes, so the new directory always serves every
+collection. Use --model (and --dimension) to embed with a different
+model; since one model must embed every collection, that requires
+rebuilding all of them.
+
+Usage:
+    python scripts/reindex.py [collection ...] [--output DIR] [--model NAME --dimension N] [--embed-workers N]
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import os
+import re
+from typing import Iterator, Optional
+from db.session import SessionLocal
+from models.database import COLLECTION_MODELS
+from services.vector_store import VectorStoreService, COLLECTION_NAMES
+from services.index_storage import SegmentedIndexStorage
+from services.ingestion import IngestionPipeline, IngestBatch, embed_text
+from db.bulk import DEFAULT_BATCH_SIZE
+from core.config import get_settings
+from core.logging import setup_logging, get_logger
+
+setup_logging()
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+def next_version_dir(persist_dir: str) -> str:
+    """
+    Pick the next unused versioned directory for a persist directory.
+    
+    Args:
+        persist_dir: Live persist directory, e.g. ./chroma_db or ./chroma_db.v2
+        
+    Returns:
+        Path such as ./chroma_db.v3
+    """
+    base = re.sub(r"\.v\d+$", "", os.path.normpath(persist_dir))
+    parent, name = os.path.split(base)
+    versions = [0]
+    if os.path.isdir(parent or "."):
+        for entry in os.listdir(parent or "."):
+            match = re.fullmatch(re.escape(name) + r"\.v(\d+)", entry)
+            if match:
+                versions.append(int(match.group(1)))
+    return f"{base}.v{max(versions) + 1}"
+
+
+def stored_batches(name: str, batch_size: int) -> Iterator[IngestBatch]:
+    """
+    Stream the rows of a collection's table as already-stored batches.
+    
+    Args:
+        name: Collection name
+        batch_size: Rows per batch and per cursor fetch
+        
+    Yields:
+        Batches carrying the row IDs and the text to embed
+    """
+    model = COLLECTION_MODELS[name]
+    with SessionLocal() as db:
+        ids, texts = [], []
+        for row_id, translation in db.query(model.id, model.translation).order_by(model.id).yield_per(batch_size):
+            ids.append(str(row_id))
+            texts.append(embed_text(name, translation))
+            if len(ids) >= batch_size:
+                yield IngestBatch([{}] * len(ids), texts=texts, ids=ids)
+                ids, texts = [], []
+        if ids:
+            yield IngestBatch([{}] * len(ids), texts=texts, ids=ids)
+
+
+def reindex(
+    output: str,
+    collections: list[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    live_dir: Optional[str] = None,
+    embed_workers: int = 0
+) -> VectorStoreService:
+    """
+    Embed every stored row of some collections into a fresh vector store.
+    
+    Args:
+        output: Directory of the new indexes; must be empty or missing
+        collections: Collections to rebuild
+        batch_size: Rows per batch
+        live_dir: Persist directory the other collections are copied from;
+            required unless every collection is rebuilt
+        embed_workers: Embedding processes, 0 = one per available core
+        
+    Returns:
+        Vector store holding the new indexes
+    """
+    if os.path.isdir(output) and os.listdir(output):
+        logger.error(f"{output} is not empty; choose another --output")
+        raise ValueError(f"Output directory {output} is not empty")
+    untouched = [name for name in COLLECTION_NAMES if name not in collections]
+    if untouched and not (live_dir and SegmentedIndexStorage(live_dir, COLLECTION_NAMES).exists()):
+        logger.error(f"No live indexes to copy {', '.join(untouched)} from; rebuild every collection")
+        raise ValueError(f"A partial reindex needs live indexes to copy {', '.join(untouched)} from")
+    
+    vector_store = VectorStoreService(persist_dir=output)
+    for name in untouched:
+        vector_store.copy_collection(name, live_dir)
+    db = SessionLocal()
+    try:
+        for name in collections:
+            logger.info(f"Reindexing {name} into {output}...")
+            pipeline = IngestionPipeline(
+                db,
+                vector_store,
+                COLLECTION_MODELS[name],
+                name,
+                batch_size=batch_size,
+                embed_workers=embed_workers
+            )
+            pipeline.run(stored_batches(name, batch_size))
+    finally:
+        db.close()
+    return vector_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "collections",
+        nargs="*",
+        help=f"Collections to rebuild: {', '.join(COLLECTION_NAMES)} (default: all)"
+    )
+    parser.add_argument("--output", help="Directory of the new indexes (default: next versioned directory)")
+    parser.add_argument("--model", help="Embedding model (default: EMBEDDING_MODEL)")
+    parser.add_argument("--revision", help="Model revision (default: EMBEDDING_MODEL_REVISION)")
+    parser.add_argument("--dimension", type=int, help="Embedding dimension of --model")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per batch")
+    parser.add_argument(
+        "--embed-workers",
+        type=int,
+        default=0,
+        help="Embedding processes (default: 0, one per available core; 1 encodes in-process)"
+    )
+    args = parser.parse_args()
+    unknown = set(args.collections) - set(COLLECTION_NAMES)
+    if unknown:
+        parser.error(f"Unknown collections: {', '.join(sorted(unknown))}")
+    collections = args.collections or list(COLLECTION_NAMES)
+    if args.model and set(collections) != set(COLLECTION_NAMES):
+        parser.error("--model embeds with another model, so every collection must be rebuilt")
+    
+    if args.model:
+        settings.embedding_model = args.model
+        settings.embedding_model_revision = args.revision
+    if args.dimension:
+        settings.embedding_dimension = args.dimension
+    
+    live_dir = settings.vector_store_persist_dir
+    output = args.output or next_version_dir(live_dir)
+    try:
+        reindex(output, collections, args.batch_size, live_dir, args.embed_workers)
+    except ValueError as e:
+        parser.error(str(e))
+    logger.info(f"Reindex completed. Serve it with VECTOR_STORE_PERSIST_DIR={output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from db.session import SessionLocal, init_db
 from models.database import QuranAyah, Dua, Hadith
 from services.vector_store import get_vector_store
+from services.ingestion import IngestionPipeline, IngestBatch
 from core.logging import setup_logging, get_logger
 
 setup_logging()
@@ -100,50 +101,18 @@ def seed_sample_data():
         db.query(Dua).delete()
         db.query(Hadith).delete()
         db.commit()
+        for collection_name in ("quran", "dua", "hadith"):
+            vector_store.clear(collection_name)
         logger.info("Cleared existing data")
         
-        # Add Quran Ayahs
-        quran_texts = []
-        quran_ids = []
-        for ayah_data in sample_ayahs:
-            ayah = QuranAyah(**ayah_data)
-            db.add(ayah)
-            db.flush()
-            quran_texts.append(ayah_data["translation"])
-            quran_ids.append(str(ayah.id))
-        
-        # Add Duas
-        dua_texts = []
-        dua_ids = []
-        for dua_data in sample_duas:
-            dua = Dua(**dua_data)
-            db.add(dua)
-            db.flush()
-            dua_texts.append(dua_data["translation"])
-            dua_ids.append(str(dua.id))
-        
-        # Add Hadiths
-        hadith_texts = []
-        hadith_ids = []
-        for hadith_data in sample_hadiths:
-            hadith = Hadith(**hadith_data)
-            db.add(hadith)
-            db.flush()
-            hadith_texts.append(hadith_data["translation"])
-            hadith_ids.append(str(hadith.id))
-        
-        db.commit()
-        logger.info("Database records created")
-        
-        # Create embeddings in vector store
-        logger.info("Creating embeddings for Quran ayahs...")
-        vector_store.add_texts(quran_texts, quran_ids, "quran")
-        
-        logger.info("Creating embeddings for Duas...")
-        vector_store.add_texts(dua_texts, dua_ids, "dua")
-        
-        logger.info("Creating embeddings for Hadiths...")
-        vector_store.add_texts(hadith_texts, hadith_ids, "hadith")
+        # Insert and embed each collection
+        for model, collection_name, rows in (
+            (QuranAyah, "quran", sample_ayahs),
+            (Dua, "dua", sample_duas),
+            (Hadith, "hadith", sample_hadiths),
+        ):
+            logger.info(f"Seeding {collection_name}...")
+            IngestionPipeline(db, vector_store, model, collection_name).run([IngestBatch(rows)])
         
         logger.info("Database seeded successfully!")
         
@@ -0,0 +1,340 @@
+"""In-memory trigram index over the normalized Arabic text, for fragment search."""
+import threading
+import numpy as np
+from typing import Collection, Optional
+from sqlalchemy.orm import Session
+
+from db.session import SessionLocal
+from models.database import CORPUS_MODELS
+from services.vector_store import VectorStoreService, get_vector_store
+from services.text_normalization import normalize_fragment
+from core.config import get_settings
+from core.logging import get_logger
+from core.exceptions import DatabaseException
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Characters per indexed gram; shorter fragments cannot be searched
+NGRAM = 3
+
+# Documents whose text is encoded at once while building
+BUILD_CHUNK_DOCUMENTS = 8192
+
+
+def _gram_keys(codes: np.ndarray) -> np.ndarray:
+    """int64 key of each character trigram of an array of int64 code points."""
+    return (codes[:-2] << 42) | (codes[1:-1] << 21) | codes[2:]
+
+
+def _code_points(text: str) -> np.ndarray:
+    """Code points of a text as int64."""
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+
+class ArabicTextIndex:
+    """
+    Positional trigram index over the normalized Arabic text of every collection.
+    
+    Documents are numbered collection by collection in vector position
+    order, like the lexical index, and their normalized texts are laid end
+    to end, each followed by a NUL, in one character stream; document d
+    starts at stream offset starts[d]. The postings of trigram grams[g] are
+    the ascending offsets positions[indptr[g]:indptr[g + 1]] at which it
+    occurs. A fragment occurs at offset p exactly when each of its
+    trigrams occurs at p plus its own offset, so matching is a few sorted
+    lookups and never reads any text. No trigram spans a NUL, so matches
+    never cross documents.
+    """
+    
+    def __init__(
+        self,
+        grams: np.ndarray,
+        indptr: np.ndarray,
+        positions: np.ndarray,
+        starts: np.ndarray,
+        ids: np.ndarray,
+        offsets: dict[str, tuple[int, int]],
+        version: int
+    ):
+        """
+        Initialize Arabic text index.
+        
+        Args:
+            grams: Sorted int64 keys of the indexed trigrams
+            indptr: int64 start of each trigram's postings, plus the total
+            positions: Stream offsets of all postings (int32 when the stream allows)
+            starts: int64 stream offset of each document, plus the stream length
+            ids: int64 database ID of each document
+            offsets: (first document, document count) by result type (Quran, Dua, Hadith)
+            version: Vector store version the positions belong to
+        """
+        self.grams = grams
+        self.indptr = indptr
+        self.positions = positions
+        self.starts = starts
+        self.ids = ids
+        self.offsets = offsets
+        self.version = version
+        self.size = len(ids)
+    
+    @classmethod
+    def build(
+        cls,
+        texts: dict[str, list[str]],
+        ids: Optional[dict[str, np.ndarray]] = None,
+        version: int = 0
+    ) -> "ArabicTextIndex":
+        """
+        Index the texts of each collection.
+        
+        Each chunk of documents is encoded and its trigrams sorted on their
+        own; the sorted chunks are then copied into place, so the build
+        holds at most twice the postings and never sorts them all at once.
+        
+        Args:
+            texts: Texts in vector position order, by result type
+            ids: Database IDs in vector position order, by result type (default: the positions)
+            version: Vector store version the positions belong to
+            
+        Returns:
+            Built Arabic text index
+        """
+        normalized: list[str] = []
+        offsets = {}
+        for item_type, collection_texts in texts.items():
+            offsets[item_type] = (len(normalized), len(collection_texts))
+            normalized.extend(normalize_fragment(text) for text in collection_texts)
+        
+        if ids is None:
+            ids = {item_type: np.arange(count, dtype=np.int64) for item_type, (_, count) in offsets.items()}
+        document_ids = np.concatenate(
+            [np.asarray(ids[item_type], dtype=np.int64) for item_type in offsets] or [np.zeros(0, dtype=np.int64)]
+        )
+        starts = np.zeros(len(normalized) + 1, dtype=np.int64)
+        np.cumsum([len(text) + 1 for text in normalized], out=starts[1:])
+        position_dtype = np.int32 if starts[-1] <= np.iinfo(np.int32).max else np.int64
+        
+        # Trigram keys, counts and stream offsets grouped by trigram, per chunk
+        chunks = []
+        for first in range(0, len(normalized), BUILD_CHUNK_DOCUMENTS):
+            codes = _code_points("\0".join(normalized[first:first + BUILD_CHUNK_DOCUMENTS]) + "\0")
+            valid = np.flatnonzero((codes[:-2] != 0) & (codes[1:-1] != 0) & (codes[2:] != 0))
+            keys = _gram_keys(codes)[valid]
+            order = np.argsort(keys, kind="stable")
+            keys = keys[order]
+            boundaries = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+            chunks.append((
+                keys[boundaries],
+                np.diff(np.append(boundaries, len(keys))),
+                (starts[first] + valid[order]).astype(position_dtype)
+            ))
+        
+        grams = np.unique(np.concatenate([keys for keys, _, _ in chunks] or [np.zeros(0, dtype=np.int64)]))
+        counts = np.zeros(len(grams), dtype=np.int64)
+        for keys, key_counts, _ in chunks:
+            counts[np.searchsorted(grams, keys)] += key_counts
+        indptr = np.zeros(len(grams) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        
+        # Chunks are placed in stream order, so every postings list stays sorted
+        positions = np.empty(indptr[-1], dtype=position_dtype)
+        fill = indptr[:-1].copy()
+        while chunks:
+            keys, key_counts, chunk_positions = chunks.pop(0)
+            terms = np.searchsorted(grams, keys)
+            ranks = np.arange(len(chunk_positions)) - np.repeat(np.cumsum(key_counts) - key_counts, key_counts)
+            positions[np.repeat(fill[terms], key_counts) + ranks] = chunk_positions
+            fill[terms] += key_counts
+        
+        return cls(grams, indptr, positions, starts, document_ids, offsets, version)
+    
+    @classmethod
+    def load(cls, db: Session, vector_store: VectorStoreService) -> "ArabicTextIndex":
+        """
+        Stream every collection's Arabic text from the database and index it.
+        
+        Args:
+            db: Database session
+            vector_store: Vector store whose positions the index follows
+            
+        Returns:
+            Loaded Arabic text index
+        """
+        version = vector_store.version
+        try:
+            texts, ids = {}, {}
+            for item_type, model in CORPUS_MODELS.items():
+                collection_ids = vector_store.get_ids(item_type.lower()).as_array()
+                positions: dict[int, list[int]] = {}
+                for position, item_id in enumerate(collection_ids.tolist()):
+                    positions.setdefault(item_id, []).append(position)
+                
+                collection_texts = [""] * len(collection_ids)
+                for row_id, arabic_text in db.query(model.id, model.arabic_text).yield_per(5000):
+                    for position in positions.get(row_id, ()):
+                        collection_texts[position] = arabic_text
+                texts[item_type] = collection_texts
+                ids[item_type] = collection_ids
+        except Exception as e:
+            logger.error(f"Failed to load Arabic text index: {e}")
+            raise DatabaseException(f"Arabic text index load failed: {e}")
+        
+        index = cls.build(texts, ids, version)
+        logger.info(
+            f"Arabic text index: {index.size} documents, {len(index.grams)} trigrams, "
+            f"{len(index.positions)} postings ({index.nbytes / (1024 * 1024):.1f} MB)"
+        )
+        return index
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the index arrays."""
+        return (
+            self.grams.nbytes + self.indptr.nbytes + self.positions.nbytes
+            + self.starts.nbytes + self.ids.nbytes
+        )
+    
+    def match(
+        self,
+        query: str,
+        spans: Optional[list[tuple[int, int]]] = None,
+        max_candidates: Optional[int] = None
+    ) -> tuple[np.ndarray, bool]:
+        """
+        Find the occurrences of a fragment in the stream.
+        
+        The candidates start from the rarest trigram of the fragment and are
+        narrowed by binary search in the postings of the trigrams at
+        fragment offsets 0, 3, 6, ... and the last one, rarest first, since
+        together those cover every character. A fragment made only of
+        common trigrams has hundreds of thousands of candidates, so at most
+        max_candidates of them, the first in stream order, are checked.
+        
+        Args:
+            query: Fragment, with or without tashkeel
+            spans: Stream ranges [start, end) to search, default the whole stream
+            max_candidates: Most candidates checked, default all
+            
+        Returns:
+            Ascending stream offsets at which the normalized fragment starts,
+            and whether every candidate was checked
+            
+        Raises:
+            ValueError: If the normalized fragment is shorter than a trigram
+        """
+        fragment = normalize_fragment(query)
+        if len(fragment) < NGRAM:
+            raise ValueError(f"Query must contain at least {NGRAM} letters or digits")
+        
+        keys = _gram_keys(_code_points(fragment))
+        found = np.searchsorted(self.grams, keys)
+        if not len(self.grams) or (found >= len(self.grams)).any() or (self.grams[found] != keys).any():
+            return np.zeros(0, dtype=self.positions.dtype), True
+        
+        lengths = self.indptr[found + 1] - self.indptr[found]
+        rarest = int(np.argmin(lengths))
+        covering = set(range(0, len(keys), NGRAM)) | {len(keys) - 1}
+        lookups = sorted(covering - {rarest}, key=lambda shift: lengths[shift])
+        gram = found[rarest]
+        postings = self.positions[self.indptr[gram]:self.indptr[gram + 1]]
+        if spans is not None:
+            postings = np.concatenate([
+                postings[np.searchsorted(postings, start + rarest):np.searchsorted(postings, end + rarest)]
+                for start, end in spans
+            ] or [postings[:0]])
+        complete = max_candidates is None or len(postings) <= max_candidates
+        # Candidates keep the postings dtype: searchsorted would copy the postings to match any other
+        candidates = postings[:max_candidates] - rarest
+        for shift in lookups:
+            if not len(candidates):
+                break
+            gram = found[shift]
+            postings = self.positions[self.indptr[gram]:self.indptr[gram + 1]]
+            targets = candidates + shift
+            at = np.minimum(np.searchsorted(postings, targets), len(postings) - 1)
+            candidates = candidates[postings[at] == targets]
+        return candidates, complete
+    
+    def search(
+        self,
+        query: str,
+        limit: int,
+        collections: Optional[Collection[str]] = None,
+        max_candidates: Optional[int] = None
+    ) -> tuple[list[dict], int, bool]:
+        """
+        Find the documents that contain a fragment.
+        
+        Args:
+            query: Fragment, with or without tashkeel
+            limit: Most documents to return
+            collections: Result types to search (Quran, Dua, Hadith), default all
+            max_candidates: Most candidate occurrences checked, default all
+            
+        Returns:
+            Matches with type, vector position and database ID, collection by
+            collection in position order, the number of matching documents,
+            and whether that number is exact; when the candidates were cut
+            it only counts the documents before the last one checked
+            
+        Raises:
+            ValueError: If the normalized fragment is shorter than a trigram
+        """
+        selected = [
+            (self.starts[start], self.starts[start + count])
+            for item_type, (start, count) in self.offsets.items()
+            if collections is None or item_type in collections
+        ]
+        occurrences, complete = self.match(
+            query,
+            selected if collections is not None else None,
+            max_candidates
+        )
+        # Occurrences are ascending, so whichever array is shorter is looked up in the other
+        if len(occurrences) < self.size:
+            docs = np.searchsorted(self.starts, occurrences, side="right") - 1
+            if len(docs):
+                docs = docs[np.concatenate(([True], docs[1:] != docs[:-1]))]
+        else:
+            docs = np.flatnonzero(np.diff(np.searchsorted(occurrences, self.starts)))
+        
+        hits, total = [], 0
+        for item_type, (start, count) in self.offsets.items():
+            if collections is not None and item_type not in collections:
+                continue
+            first, last = np.searchsorted(docs, (start, start + count))
+            total += int(last - first)
+            taken = docs[first:min(last, first + max(limit - len(hits), 0))]
+            hits.extend(
+                {'type': item_type, 'position': int(doc - start), 'id': int(self.ids[doc])}
+                for doc in taken
+            )
+        return hits, total, complete
+
+
+# Global instance
+_arabic_index: Optional[ArabicTextIndex] = None
+_arabic_index_lock = threading.Lock()
+
+
+def get_arabic_index() -> Optional[ArabicTextIndex]:
+    """
+    Get the Arabic text index, or None when Arabic search is disabled.
+    
+    The index is built by the first search rather than at startup, so
+    workers that never serve one do not hold it, and built again
+    whenever the vector store has changed.
+    """
+    global _arabic_index
+    if not settings.arabic_search_enabled:
+        return None
+    vector_store = get_vector_store()
+    with _arabic_index_lock:
+        if _arabic_index is None or _arabic_index.version != vector_store.version:
+            db = SessionLocal()
+            try:
+                _arabic_index = ArabicTextIndex.load(db, vector_store)
+            finally:
+                db.close()
+        return _arabic_index
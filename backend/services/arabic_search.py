@@ -0,0 +1,124 @@
+"""Business logic for Arabic fragment search."""
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+from typing import Collection, Optional
+
+from models.database import CORPUS_MODELS
+from models.schemas import ArabicSearchResult
+from services.arabic_index import ArabicTextIndex
+from services.document_store import DocumentStore
+from core.config import get_settings
+from core.logging import get_logger
+from core.exceptions import DatabaseException
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class ArabicSearchService:
+    """Service for finding the texts whose Arabic contains a fragment."""
+    
+    def __init__(
+        self,
+        db: Optional[Session],
+        arabic_index: ArabicTextIndex,
+        document_store: Optional[DocumentStore] = None
+    ):
+        """
+        Initialize Arabic search service.
+        
+        Args:
+            db: Database session, not needed when a document store is given
+            arabic_index: Trigram index of the normalized Arabic text
+            document_store: In-process document store used instead of the database
+        """
+        self.db = db
+        self.arabic_index = arabic_index
+        self.document_store = document_store
+    
+    def search(
+        self,
+        query: str,
+        limit: int,
+        collections: Optional[Collection[str]] = None
+    ) -> tuple[list[ArabicSearchResult], int, bool]:
+        """
+        Find the texts containing an Arabic fragment.
+        
+        At most ARABIC_SEARCH_MAX_CANDIDATES occurrences of the fragment's
+        rarest trigram are checked, which bounds the latency of fragments
+        made only of common words.
+        
+        Args:
+            query: Fragment, with or without tashkeel
+            limit: Most texts to return
+            collections: Result types to search (Quran, Dua, Hadith), default all
+            
+        Returns:
+            Matching texts, Quran first and in corpus order, the number of
+            texts that match, and whether the search stopped before checking
+            every candidate, in which case that number is a lower bound
+            
+        Raises:
+            ValueError: If the normalized fragment is too short to search
+        """
+        hits, total, complete = self.arabic_index.search(
+            query,
+            limit,
+            collections,
+            settings.arabic_search_max_candidates or None
+        )
+        items = self._hydrate(hits)
+        
+        dropped = sum(item is None for item in items)
+        if dropped:
+            logger.warning(
+                f"Dropped {dropped} Arabic search matches with no stored row; "
+                "run scripts/reconcile_vector_store.py to repair the index"
+            )
+        return [
+            ArabicSearchResult(
+                type=hit['type'],
+                arabic_text=item.arabic_text,
+                translation=item.translation,
+                citation=item.citation
+            )
+            for hit, item in zip(hits, items)
+            if item is not None
+        ], total, not complete
+    
+    def _hydrate(self, hits: list[dict]) -> list[Optional[Row]]:
+        """
+        Look up the text of each match, keeping its order.
+        
+        Uses the document store when available, otherwise one database
+        query per collection by primary key.
+        
+        Args:
+            hits: Matches from the Arabic text index
+            
+        Returns:
+            Row or document per match, None where it no longer exists
+        """
+        if self.document_store is not None:
+            return [self.document_store.get(hit['type'], hit['position'], hit['id']) for hit in hits]
+        
+        ids_by_type: dict[str, set[int]] = {}
+        for hit in hits:
+            ids_by_type.setdefault(hit['type'], set()).add(hit['id'])
+        
+        items: dict[tuple[str, int], Row] = {}
+        try:
+            for item_type, item_ids in ids_by_type.items():
+                model = CORPUS_MODELS[item_type]
+                rows = (
+                    self.db.query(model.id, model.arabic_text, model.translation, model.citation)
+                    .filter(model.id.in_(sorted(item_ids)))
+                    .all()
+                )
+                for row in rows:
+                    items[(item_type, row.id)] = row
+        except Exception as e:
+            logger.error(f"Database fetch error: {e}")
+            raise DatabaseException(f"Failed to fetch items: {e}")
+        return [items.get((hit['type'], hit['id'])) for hit in hits]
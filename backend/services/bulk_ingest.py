@@ -0,0 +1,82 @@
+"""Staging buffer of a vector store bulk-ingest session."""
+from typing import Callable
+
+import numpy as np
+
+
+class BulkIngestSession:
+    """
+    Vectors and IDs staged for one collection until the session ends.
+    
+    Vectors are copied into a preallocated float32 buffer whose capacity
+    doubles when full, so staging n vectors costs O(n) copies however
+    they are split into calls. Nothing reaches the index or the disk
+    until VectorStoreService.bulk_ingest commits the session. A session
+    is meant to be filled from one thread.
+    """
+    
+    def __init__(self, collection_name: str, dimension: int, encode: Callable[[list[str]], np.ndarray], capacity: int):
+        """
+        Initialize bulk-ingest session.
+        
+        Args:
+            collection_name: Collection the vectors belong to
+            dimension: Embedding dimension
+            encode: Function embedding a list of texts as a float32 matrix
+            capacity: Rows preallocated in the buffer
+        """
+        self.collection_name = collection_name
+        self.dimension = dimension
+        self.encode = encode
+        self._buffer = np.empty((max(1, capacity), dimension), dtype=np.float32)
+        self._count = 0
+        self.ids: list[str] = []
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def embeddings(self) -> np.ndarray:
+        """Staged vectors in the order they were added."""
+        return self._buffer[:self._count]
+    
+    def add_texts(self, texts: list[str], ids: list[str]) -> None:
+        """
+        Embed texts and stage their vectors.
+        
+        Args:
+            texts: List of text strings to embed
+            ids: List of corresponding IDs
+        """
+        if len(texts) != len(ids):
+            raise ValueError("Texts and IDs must have the same length")
+        if texts:
+            self.add_embeddings(self.encode(texts), ids)
+    
+    def add_embeddings(self, embeddings: np.ndarray, ids: list[str]) -> None:
+        """
+        Stage precomputed vectors.
+        
+        Args:
+            embeddings: float32 matrix with one row per ID
+            ids: List of corresponding IDs
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or embeddings.shape[1] != self.dimension:
+            raise ValueError(f"Expected embeddings of shape (n, {self.dimension}), got {embeddings.shape}")
+        if len(embeddings) != len(ids):
+            raise ValueError("Embeddings and IDs must have the same length")
+        
+        end = self._count + len(embeddings)
+        if end > len(self._buffer):
+            grown = np.empty((max(end, 2 * len(self._buffer)), self.dimension), dtype=np.float32)
+            grown[:self._count] = self._buffer[:self._count]
+            self._buffer = grown
+        self._buffer[self._count:end] = embeddings
+        self._count = end
+        self.ids.extend(str(item_id) for item_id in ids)
+    
+    def discard(self) -> None:
+        """Drop everything staged."""
+        self._count = 0
+        self.ids = []
@@ -0,0 +1,233 @@
+"""In-process document store for serving read-only corpus text."""
+import numpy as np
+from typing import NamedTuple, Optional
+from sqlalchemy.orm import Session
+
+from db.session import SessionLocal
+from models.database import CORPUS_MODELS
+from services.vector_store import VectorStoreService, get_vector_store
+from services.index_storage import IdList
+from core.config import get_settings
+from core.logging import get_logger
+from core.exceptions import DatabaseException
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class Document(NamedTuple):
+    """Text fields of a single corpus entry."""
+    
+    id: int
+    arabic_text: str
+    translation: str
+    citation: str
+
+
+class TextColumn:
+    """Strings packed into one contiguous UTF-8 buffer addressed by offsets."""
+    
+    __slots__ = ("buffer", "offsets")
+    
+    def __init__(self, values: list[bytes]):
+        """
+        Pack encoded strings into a single buffer.
+        
+        Args:
+            values: UTF-8 encoded strings, one per position
+        """
+        self.offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in values], out=self.offsets[1:])
+        self.buffer = b"".join(values)
+    
+    def __getitem__(self, position: int) -> str:
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return self.buffer[start:end].decode("utf-8")
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the buffer and its offsets."""
+        return len(self.buffer) + self.offsets.nbytes
+
+
+class CollectionDocuments:
+    """Column-oriented documents of one collection, indexed by vector position."""
+    
+    FIELDS = ("arabic_text", "translation", "citation")
+    
+    def __init__(self, ids: np.ndarray, present: np.ndarray, columns: dict[str, TextColumn]):
+        self.ids = ids
+        self.present = present
+        self.columns = columns
+    
+    def get(self, position: int, item_id: int) -> Optional[Document]:
+        """
+        Get the document stored at a vector position.
+        
+        Args:
+            position: Position of the vector in its FAISS index
+            item_id: Database ID the vector store reported for that position
+            
+        Returns:
+            Document, or None if the position is unknown or out of sync
+        """
+        if position >= len(self.ids) or not self.present[position] or self.ids[position] != item_id:
+            return None
+        return Document(
+            item_id,
+            *(self.columns[field][position] for field in self.FIELDS)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by this collection's arrays."""
+        return (
+            self.ids.nbytes
+            + self.present.nbytes
+            + sum(column.nbytes for column in self.columns.values())
+        )
+    
+    @classmethod
+    def load(cls, db: Session, model, vector_ids: IdList) -> "CollectionDocuments":
+        """
+        Stream a table into columns aligned with the vector store IDs.
+        
+        Args:
+            db: Database session
+            model: ORM model of the collection
+            vector_ids: Database IDs in vector position order
+            
+        Returns:
+            Loaded collection documents
+        """
+        count = len(vector_ids)
+        ids = vector_ids.as_array()
+        present = np.zeros(count, dtype=bool)
+        values = {field: [b""] * count for field in cls.FIELDS}
+        
+        positions: dict[int, list[int]] = {}
+        for position, item_id in enumerate(ids.tolist()):
+            positions.setdefault(item_id, []).append(position)
+        
+        rows = (
+            db.query(model.id, model.arabic_text, model.translation, model.citation)
+            .yield_per(5000)
+        )
+        for row in rows:
+            for position in positions.get(row.id, ()):
+                present[position] = True
+                for field in cls.FIELDS:
+                    values[field][position] = getattr(row, field).encode("utf-8")
+        
+        missing = count - int(present.sum())
+        if missing:
+            logger.warning(f"{missing} {model.__tablename__} vectors have no database row")
+        
+        columns = {field: TextColumn(values[field]) for field in cls.FIELDS}
+        return cls(ids, present, columns)
+
+
+class DocumentStore:
+    """Read-only copy of the corpus text, keyed by vector store position."""
+    
+    def __init__(self, collections: dict[str, CollectionDocuments], version: int = 0):
+        """
+        Initialize document store.
+        
+        Args:
+            collections: Loaded documents by result type (Quran, Dua, Hadith)
+            version: Vector store version the positions belong to
+        """
+        self.collections = collections
+        self.version = version
+    
+    @classmethod
+    def load(cls, db: Session, vector_store: VectorStoreService) -> "DocumentStore":
+        """
+        Load every collection the vector store serves.
+        
+        Args:
+            db: Database session
+            vector_store: Vector store whose positions the store follows
+            
+        Returns:
+            Loaded document store
+        """
+        version = vector_store.version
+        try:
+            collections = {
+                item_type: CollectionDocuments.load(
+                    db, model, vector_store.get_ids(item_type.lower())
+                )
+                for item_type, model in CORPUS_MODELS.items()
+            }
+        except Exception as e:
+            logger.error(f"Failed to load document store: {e}")
+            raise DatabaseException(f"Document store load failed: {e}")
+        
+        store = cls(collections, version)
+        total = sum(len(documents) for documents in collections.values())
+        logger.info(
+            f"Document store loaded {total} documents "
+            f"({store.nbytes / (1024 * 1024):.1f} MB)"
+        )
+        for item_type, documents in collections.items():
+            logger.info(
+                f"  {item_type}: {len(documents)} documents, "
+                f"{documents.nbytes / (1024 * 1024):.1f} MB"
+            )
+        return store
+    
+    def get(self, item_type: str, position: int, item_id: int) -> Optional[Document]:
+        """
+        Get a document by result type and vector position.
+        
+        Args:
+            item_type: Result type (Quran, Dua, Hadith)
+            position: Position of the vector in its FAISS index
+            item_id: Database ID the vector store reported for that position
+            
+        Returns:
+            Document, or None if not available
+        """
+        documents = self.collections.get(item_type)
+        if documents is None:
+            return None
+        return documents.get(position, item_id)
+    
+    @property
+    def nbytes(self) -> int:
+        """Total memory held by the store's arrays."""
+        return sum(documents.nbytes for documents in self.collections.values())
+
+
+# Global instance
+_document_store: Optional[DocumentStore] = None
+
+
+def get_document_store() -> Optional[DocumentStore]:
+    """
+    Get the document store, or None when it is disabled.
+    
+    The store is loaded again whenever the vector store has changed,
+    including when another process rewrote the indexes on disk (see
+    VectorStoreService.refresh), so its positions always follow the
+    served indexes.
+    """
+    global _document_store
+    if not settings.document_store_enabled:
+        return None
+    vector_store = get_vector_store()
+    if _document_store is None or _document_store.version != vector_store.version:
+        db = SessionLocal()
+        try:
+            _document_store = DocumentStore.load(db, vector_store)
+        finally:
+            db.close()
+    return _document_store
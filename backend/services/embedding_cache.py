@@ -0,0 +1,330 @@
+"""Caches of query and document embeddings."""
+import hashlib
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within one process
+    fcntl = None
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bytes of the content hash identifying a cached document embedding
+DIGEST_SIZE = 16
+
+
+class QueryEmbeddingCache:
+    """
+    LRU cache mapping normalized query text to its embedding.
+    
+    Queries are keyed after Unicode NFKC normalization, case folding and
+    whitespace collapsing, so trivially different spellings of the same
+    query share an entry. The cache is bounded both by entry count and by
+    the bytes of the stored embeddings, and entries can optionally expire.
+    """
+    
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float = 0):
+        """
+        Initialize query embedding cache.
+        
+        Args:
+            max_entries: Maximum number of cached queries
+            max_bytes: Maximum total size of cached embeddings
+            ttl_seconds: Seconds an entry stays valid, 0 for no expiry
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[np.ndarray, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize query text into its cache key."""
+        return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+    
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Look up the embedding of a query.
+        
+        Args:
+            text: Query text
+            
+        Returns:
+            Read-only embedding, or None on a miss
+        """
+        key = self.normalize(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and time.monotonic() - entry[1] > self.ttl_seconds:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, text: str, embedding: np.ndarray) -> None:
+        """
+        Cache the embedding of a query, evicting least recently used entries.
+        
+        Args:
+            text: Query text
+            embedding: Embedding of the query
+        """
+        if embedding.nbytes > self.max_bytes or self.max_entries <= 0:
+            return
+        
+        key = self.normalize(text)
+        embedding = embedding.copy()
+        embedding.setflags(write=False)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (embedding, time.monotonic())
+            self._bytes += embedding.nbytes
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> dict:
+        """
+        Get cache counters for sizing the cache.
+        
+        Returns:
+            Entry count, bytes, hits, misses, evictions and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+    
+    def _remove(self, key: str) -> None:
+        """Remove an entry; the lock must be held."""
+        embedding, _ = self._entries.pop(key)
+        self._bytes -= embedding.nbytes
+
+
+class DocumentEmbeddingCache:
+    """
+    Persistent cache of document embeddings keyed by content hash.
+    
+    Each entry is keyed by a hash of the model name, model revision,
+    truncation policy and text, so embeddings of several models can
+    share the cache and a changed model never returns stale vectors.
+    Vectors are appended to a raw float32 file that is read through a
+    memory map; their hashes are appended to a key file in the same
+    order and loaded into a hash index on open. A vector is written
+    before its key, so an interrupted write never leaves a key without
+    a vector.
+    
+    Several processes (the API and an import script) may share the
+    directory: appends are serialized by an exclusive lock on a lock
+    file, and each process first reads the records the others appended.
+    Row numbers are record numbers in the files, and a key stored more
+    than once maps to its last record.
+    """
+    
+    VECTORS_FILE = "vectors.f32"
+    KEYS_FILE = "keys.bin"
+    LOCK_FILE = "cache.lock"
+    
+    def __init__(self, directory: str, dimension: int, model_name: str, revision: str, truncation: str):
+        """
+        Initialize document embedding cache, loading its hash index.
+        
+        Args:
+            directory: Directory holding the vector and key files
+            dimension: Embedding dimension
+            model_name: Embedding model name
+            revision: Model revision
+            truncation: Description of how the model truncates input
+        """
+        self.directory = directory
+        self.dimension = dimension
+        self.namespace = "\0".join((model_name, revision, truncation)).encode("utf-8") + b"\0"
+        self._vectors_path = os.path.join(directory, self.VECTORS_FILE)
+        self._keys_path = os.path.join(directory, self.KEYS_FILE)
+        self._lock_path = os.path.join(directory, self.LOCK_FILE)
+        self._lock = threading.Lock()
+        self._rows: dict[bytes, int] = {}
+        self._count = 0  # Records in the files, including repeated keys
+        self._mapped: Optional[np.ndarray] = None
+        self.hits = 0
+        self.misses = 0
+        
+        os.makedirs(directory, exist_ok=True)
+        with self._file_lock():
+            self._load()
+    
+    def key(self, text: str) -> bytes:
+        """Content hash of a text under this cache's model, revision and truncation."""
+        return hashlib.blake2b(self.namespace + text.encode("utf-8"), digest_size=DIGEST_SIZE).digest()
+    
+    def get_many(self, texts: list[str]) -> tuple[np.ndarray, list[int]]:
+        """
+        Look up the embeddings of texts.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            (float32 matrix with the cached rows filled in, positions of texts that were not cached)
+        """
+        embeddings = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        missing = []
+        with self._lock:
+            if self._appended_elsewhere():
+                with self._file_lock():
+                    self._read_new_records()
+            rows = [self._rows.get(self.key(text)) for text in texts]
+            found = [(position, row) for position, row in enumerate(rows) if row is not None]
+            if found:
+                vectors = self._vectors(max(row for _, row in found) + 1)
+                positions, cached_rows = zip(*found)
+                embeddings[list(positions)] = vectors[list(cached_rows)]
+            missing = [position for position, row in enumerate(rows) if row is None]
+            self.hits += len(found)
+            self.misses += len(missing)
+        return embeddings, missing
+    
+    def put_many(self, texts: list[str], embeddings: np.ndarray) -> None:
+        """
+        Store the embeddings of texts that are not cached yet.
+        
+        Args:
+            texts: Embedded texts
+            embeddings: float32 matrix with one row per text
+        """
+        with self._lock, self._file_lock():
+            self._read_new_records()
+            self._trim()
+            new_rows = {}
+            for position, text in enumerate(texts):
+                key = self.key(text)
+                if key not in self._rows and key not in new_rows:
+                    new_rows[key] = position
+            if not new_rows:
+                return
+            
+            vectors = np.ascontiguousarray(embeddings[list(new_rows.values())], dtype=np.float32)
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+            with open(self._keys_path, "ab") as f:
+                f.write(b"".join(new_rows))
+            
+            for key in new_rows:
+                self._rows[key] = self._count
+                self._count += 1
+    
+    def __len__(self) -> int:
+        return len(self._rows)
+    
+    def stats(self) -> dict:
+        """
+        Get cache counters.
+        
+        Returns:
+            Entry count, hits, misses and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._rows),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+    
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold the exclusive lock that serializes writers across processes."""
+        with open(self._lock_path, "ab") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def _appended_elsewhere(self) -> bool:
+        """Whether the key file holds records this process has not read."""
+        try:
+            return os.path.getsize(self._keys_path) >= (self._count + 1) * DIGEST_SIZE
+        except OSError:
+            return False
+    
+    def _read_new_records(self) -> None:
+        """
+        Index the records appended since the last read; the file lock must be held.
+        
+        Later records win, so a key written twice maps to its last vector.
+        """
+        if not self._appended_elsewhere():
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._count * DIGEST_SIZE)
+            keys = f.read()
+        vector_bytes = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        vector_rows = vector_bytes // (self.dimension * 4)
+        count = max(min(self._count + len(keys) // DIGEST_SIZE, vector_rows), self._count)
+        for row in range(self._count, count):
+            offset = (row - self._count) * DIGEST_SIZE
+            self._rows[keys[offset:offset + DIGEST_SIZE]] = row
+        self._count = count
+    
+    def _trim(self) -> None:
+        """Cut whatever an interrupted append left past the indexed records; the file lock must be held."""
+        for path, record_bytes in ((self._keys_path, DIGEST_SIZE), (self._vectors_path, self.dimension * 4)):
+            if os.path.exists(path) and os.path.getsize(path) > self._count * record_bytes:
+                with open(path, "r+b") as f:
+                    f.truncate(self._count * record_bytes)
+    
+    def _load(self) -> None:
+        """Build the hash index from the key file, dropping a partially written tail; the file lock must be held."""
+        self._rows = {}
+        self._count = 0
+        self._read_new_records()
+        self._trim()
+        if self._count:
+            logger.info(f"Loaded document embedding cache with {self._count} entries from {self.directory}")
+    
+    def _vectors(self, rows: int) -> np.ndarray:
+        """Memory-map the vector file, remapping once it has grown past the mapped rows."""
+        if self._mapped is None or len(self._mapped) < rows:
+            self._mapped = np.memmap(
+                self._vectors_path,
+                dtype=np.float32,
+                mode="r",
+                shape=(self._count, self.dimension)
+            )
+        return self._mapped
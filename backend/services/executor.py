@@ -0,0 +1,157 @@
+"""Bounded executor that keeps blocking guidance work off the event loop."""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from core.config import get_settings
+from core.logging import get_logger
+from core.exceptions import ServiceOverloadedException
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class GuidanceExecutor:
+    """
+    Thread pool with a bounded queue for the guidance pipeline.
+    
+    The transformer forward pass and FAISS search release the GIL, and
+    database calls block on I/O, so running them on worker threads leaves
+    the event loop free for other requests. Work submitted while every
+    worker is busy waits in the queue; once the queue is full, new work
+    is rejected instead of piling up.
+    """
+    
+    def __init__(self, workers: int, max_queue: int):
+        """
+        Initialize guidance executor.
+        
+        Args:
+            workers: Number of worker threads
+            max_queue: Maximum number of calls waiting for a worker
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="guidance")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+    
+    async def run(self, func: Callable, *args: Any) -> Any:
+        """
+        Run a blocking call on a worker thread and wait for its result.
+        
+        Args:
+            func: Blocking function
+            *args: Arguments for the function
+            
+        Returns:
+            The function's return value
+            
+        Raises:
+            ServiceOverloadedException: If the queue is full
+        """
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ServiceOverloadedException(
+                    f"Guidance queue is full ({self.max_queue} requests waiting)"
+                )
+            self._in_flight += 1
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self.completed += 1
+    
+    def stats(self) -> dict:
+        """
+        Get executor counters.
+        
+        Returns:
+            Worker count, active and queued calls, completed and rejected calls
+        """
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "active": min(self._in_flight, self.workers),
+                "queue_depth": max(0, self._in_flight - self.workers),
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "rejected": self.rejected
+            }
+
+
+class EventLoopLagMonitor:
+    """
+    Measures how late the event loop wakes up from a periodic sleep.
+    
+    Lag close to zero means nothing is blocking the loop.
+    """
+    
+    def __init__(self, interval_seconds: float = 0.1):
+        """
+        Initialize event loop lag monitor.
+        
+        Args:
+            interval_seconds: Time between measurements
+        """
+        self.interval = interval_seconds
+        self.lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self) -> None:
+        """Start measuring on the running event loop."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    def stop(self) -> None:
+        """Stop measuring."""
+        if self._task is not None:
+            self._task.cancel()
+    
+    def stats(self) -> dict:
+        """
+        Get the lag measurements.
+        
+        Returns:
+            Latest and maximum lag in ms
+        """
+        return {"lag_ms": round(self.lag_ms, 3), "max_lag_ms": round(self.max_lag_ms, 3)}
+    
+    async def _run(self) -> None:
+        """Sleep for the interval repeatedly, recording the overshoot."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lag_ms = max(0.0, (time.perf_counter() - start - self.interval) * 1000)
+            self.max_lag_ms = max(self.max_lag_ms, self.lag_ms)
+
+
+# Global instances
+_guidance_executor: Optional[GuidanceExecutor] = None
+_loop_lag_monitor: Optional[EventLoopLagMonitor] = None
+
+
+def get_guidance_executor() -> GuidanceExecutor:
+    """Get or create the guidance executor."""
+    global _guidance_executor
+    if _guidance_executor is None:
+        _guidance_executor = GuidanceExecutor(
+            settings.guidance_executor_workers,
+            settings.guidance_executor_max_queue
+        )
+    return _guidance_executor
+
+
+def get_loop_lag_monitor() -> EventLoopLagMonitor:
+    """Get or create the event loop lag monitor."""
+    global _loop_lag_monitor
+    if _loop_lag_monitor is None:
+        _loop_lag_monitor = EventLoopLagMonitor()
+    return _loop_lag_monitor
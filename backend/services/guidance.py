@@ -1,10 +1,15 @@
 """Business logic for guidance retrieval."""
+import numpy as np
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Collection, Optional
 
-from models.database import QuranAyah, Dua, Hadith
+from models.database import CORPUS_MODELS
 from models.schemas import GuidanceResult
 from services.vector_store import VectorStoreService
+from services.search_filter import SearchFilter
+from services.document_store import DocumentStore
+from services.response_cache import SemanticResponseCache
 from core.logging import get_logger
 from core.exceptions import DatabaseException
 
@@ -14,21 +19,34 @@ logger = get_logger(__name__)
 class GuidanceService:
     """Service for retrieving Islamic guidance based on emotional queries."""
     
-    def __init__(self, db: Session, vector_store: VectorStoreService):
+    def __init__(
+        self,
+        db: Optional[Session],
+        vector_store: VectorStoreService,
+        document_store: Optional[DocumentStore] = None,
+        response_cache: Optional[SemanticResponseCache] = None
+    ):
         """
         Initialize guidance service.
         
         Args:
-            db: Database session
+            db: Database session, not needed when a document store is given
             vector_store: Vector store service instance
+            document_store: In-process document store used instead of the database
+            response_cache: Semantic cache of results for near-duplicate queries
         """
         self.db = db
         self.vector_store = vector_store
+        self.document_store = document_store
+        self.response_cache = response_cache
     
     def get_guidance(
         self,
         query: str,
-        top_k_per_type: Optional[int] = None
+        top_k_per_type: Optional[int] = None,
+        collections: Optional[Collection[str]] = None,
+        max_results: Optional[int] = None,
+        search_filter: Optional[SearchFilter] = None
     ) -> list[GuidanceResult]:
         """
         Get relevant Islamic guidance for an emotional query.
@@ -36,59 +54,248 @@ class GuidanceService:
         Args:
             query: Natural language emotional query
             top_k_per_type: Number of results per type
+            collections: Result types to search (Quran, Dua, Hadith), default all
+            max_results: Number of results returned, default MAX_RESULTS
+            search_filter: Positions each filtered collection may return
             
         Returns:
             List of guidance results
         """
         try:
+            query_embedding = self.vector_store.encode_query(query)
+            
+            # Serve paraphrases of recently answered queries from the cache
+            cache_params = self._cache_params(query, top_k_per_type, collections, max_results, search_filter)
+            if self.response_cache is not None:
+                cached = self.response_cache.get(query_embedding, cache_params, self.vector_store.version)
+                if cached is not None:
+                    logger.info(f"Served {len(cached)} guidance results from the semantic cache")
+                    return cached
+            
             # Perform semantic search
-            search_results = self.vector_store.search_all(
-                query,
-                top_k_per_type=top_k_per_type
+            search_results = self.vector_store.search_embedding(
+                query_embedding,
+                top_k_per_type=top_k_per_type,
+                collections=collections,
+                max_results=max_results,
+                search_filter=search_filter,
+                query=query
             )
             
-            guidance_results = []
+            items = self._hydrate(search_results)
+            guidance_results = self._to_results(search_results, items)
             
-            for result in search_results:
-                result_type = result['type']
-                result_id = int(result['id'])
-                distance = result['distance']
-                
-                # Convert distance to similarity score
-                similarity_score = self._distance_to_similarity(distance)
-                
-                # Fetch full data from database
-                item = self._fetch_item(result_type, result_id)
-                
-                if item:
-                    guidance_results.append(GuidanceResult(
-                        type=result_type,
-                        arabic_text=item.arabic_text,
-                        translation=item.translation,
-                        citation=item.citation,
-                        similarity_score=round(similarity_score, 4)
-                    ))
+            if self.response_cache is not None:
+                self.response_cache.put(
+                    query_embedding,
+                    cache_params,
+                    guidance_results,
+                    self.vector_store.version
+                )
             
             logger.info(f"Retrieved {len(guidance_results)} guidance results for query")
             return guidance_results
-        
+            
         except Exception as e:
             logger.error(f"Failed to get guidance: {e}")
             raise DatabaseException(f"Failed to retrieve guidance: {e}")
     
-    def _fetch_item(self, item_type: str, item_id: int):
-        """Fetch item from database by type and ID."""
+    def get_guidance_batch(
+        self,
+        queries: list[str],
+        top_k_per_type: Optional[int] = None,
+        collections: Optional[Collection[str]] = None,
+        max_results: Optional[int] = None,
+        search_filter: Optional[SearchFilter] = None
+    ) -> list[list[GuidanceResult]]:
+        """
+        Get guidance for several emotional queries at once.
+        
+        All queries are encoded in one forward pass, searched with one
+        matrix search per collection and hydrated with one set of fetches;
+        each query gets the same results get_guidance would return.
+        
+        Args:
+            queries: Natural language emotional queries
+            top_k_per_type: Number of results per type
+            collections: Result types to search (Quran, Dua, Hadith), default all
+            max_results: Number of results returned per query, default MAX_RESULTS
+            search_filter: Positions each filtered collection may return
+            
+        Returns:
+            Guidance results of each query, in query order
+        """
+        try:
+            query_embeddings = self.vector_store.encode_queries(queries)
+            
+            cache_params = [
+                self._cache_params(query, top_k_per_type, collections, max_results, search_filter)
+                for query in queries
+            ]
+            batch_results: list[Optional[list[GuidanceResult]]] = [None] * len(queries)
+            pending = []
+            for position, query_embedding in enumerate(query_embeddings):
+                cached = None
+                if self.response_cache is not None:
+                    cached = self.response_cache.get(
+                        query_embedding[np.newaxis],
+                        cache_params[position],
+                        self.vector_store.version
+                    )
+                if cached is not None:
+                    batch_results[position] = cached
+                else:
+                    pending.append(position)
+            
+            if pending:
+                search_results = self.vector_store.search_embedding_batch(
+                    query_embeddings[pending],
+                    top_k_per_type=top_k_per_type,
+                    collections=collections,
+                    max_results=max_results,
+                    search_filter=search_filter,
+                    queries=[queries[position] for position in pending]
+                )
+                items = self._hydrate([hit for hits in search_results for hit in hits])
+                offset = 0
+                for position, hits in zip(pending, search_results):
+                    guidance_results = self._to_results(hits, items[offset:offset + len(hits)])
+                    offset += len(hits)
+                    batch_results[position] = guidance_results
+                    if self.response_cache is not None:
+                        self.response_cache.put(
+                            query_embeddings[position][np.newaxis],
+                            cache_params[position],
+                            guidance_results,
+                            self.vector_store.version
+                        )
+            
+            logger.info(
+                f"Retrieved guidance for {len(queries)} queries "
+                f"({len(queries) - len(pending)} from the semantic cache)"
+            )
+            return batch_results
+            
+        except Exception as e:
+            logger.error(f"Failed to get batch guidance: {e}")
+            raise DatabaseException(f"Failed to retrieve guidance: {e}")
+    
+    def _cache_params(
+        self,
+        query: str,
+        top_k_per_type: Optional[int],
+        collections: Optional[Collection[str]],
+        max_results: Optional[int],
+        search_filter: Optional[SearchFilter]
+    ) -> tuple:
+        """
+        Search parameters a cached response must have been computed with.
+        
+        With lexical fusion the results also depend on the query's indexed
+        terms, so a paraphrase is only served another query's response when
+        both have the same keywords.
+        """
+        return (
+            top_k_per_type,
+            frozenset(collections) if collections is not None else None,
+            max_results,
+            search_filter,
+            self.vector_store.lexical_key(query)
+        )
+    
+    def _to_results(self, search_results: list[dict], items: list[Optional[Row]]) -> list[GuidanceResult]:
+        """
+        Build guidance results from search hits and their hydrated rows.
+        
+        Args:
+            search_results: Hits from the vector store, in ranked order
+            items: Row or document per hit, None where it no longer exists
+            
+        Returns:
+            Guidance results of the hits that still exist
+        """
+        guidance_results = []
+            
+        for result, item in zip(search_results, items):
+            result_type = result['type']
+            distance = result['distance']
+                
+            # Convert distance to similarity score
+            similarity_score = self._distance_to_similarity(distance)
+                
+            if item:
+                guidance_results.append(GuidanceResult(
+                    type=result_type,
+                    arabic_text=item.arabic_text,
+                    translation=item.translation,
+                    citation=item.citation,
+                    similarity_score=round(similarity_score, 4)
+                ))
+            
+        dropped = sum(item is None for item in items)
+        if dropped:
+            logger.warning(
+                f"Dropped {dropped} search hits with no stored row; "
+                "run scripts/reconcile_vector_store.py to repair the index"
+            )
+        return guidance_results
+    
+    def _hydrate(self, search_results: list[dict]) -> list[Optional[Row]]:
+        """
+        Look up the text of each search hit, keeping ranked order.
+        
+        Uses the document store when available, otherwise one database
+        query per collection.
+        
+        Args:
+            search_results: Hits from the vector store
+            
+        Returns:
+            Row or document per hit, None where it no longer exists
+        """
+        if self.document_store is not None:
+            return [
+                self.document_store.get(result['type'], result['position'], int(result['id']))
+                for result in search_results
+            ]
+        
+        items = self._fetch_items(search_results)
+        return [items.get((result['type'], int(result['id']))) for result in search_results]
+    
+    def _fetch_items(self, search_results: list[dict]) -> dict[tuple[str, int], Row]:
+        """
+        Fetch the rows for a set of search hits, one IN query per collection.
+        
+        Only the columns needed to build a GuidanceResult are selected.
+        
+        Args:
+            search_results: Hits from the vector store
+            
+        Returns:
+            Mapping of (type, id) to row
+        """
+        ids_by_type: dict[str, set[int]] = {}
+        for result in search_results:
+            ids_by_type.setdefault(result['type'], set()).add(int(result['id']))
+        
+        items: dict[tuple[str, int], Row] = {}
         try:
-            if item_type == "Quran":
-                return self.db.query(QuranAyah).filter(QuranAyah.id == item_id).first()
-            elif item_type == "Dua":
-                return self.db.query(Dua).filter(Dua.id == item_id).first()
-            elif item_type == "Hadith":
-                return self.db.query(Hadith).filter(Hadith.id == item_id).first()
-            return None
+            for item_type, item_ids in ids_by_type.items():
+                model = CORPUS_MODELS.get(item_type)
+                if model is None:
+                    continue
+                
+                rows = (
+                    self.db.query(model.id, model.arabic_text, model.translation, model.citation)
+                    .filter(model.id.in_(sorted(item_ids)))
+                    .all()
+                )
+                for row in rows:
+                    items[(item_type, row.id)] = row
+            return items
         except Exception as e:
             logger.error(f"Database fetch error: {e}")
-            raise DatabaseException(f"Failed to fetch item: {e}")
+            raise DatabaseException(f"Failed to fetch items: {e}")
     
     @staticmethod
     def _distance_to_similarity(distance: float) -> float:
@@ -0,0 +1,199 @@
+"""Concurrent HTTP fetching with retries and an on-disk revalidating cache."""
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.config import get_settings
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Responses worth retrying, and answering from the cache once retries are exhausted
+TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpFetcher:
+    """
+    Fetches URLs for the importers.
+    
+    Requests go through one pooled keep-alive session, are retried with
+    exponential backoff on connection errors and 429 / 5xx responses, and
+    at most `concurrency` run at once. Successful responses are cached on
+    disk by URL together with their ETag and Last-Modified headers; later
+    fetches of the same URL send a conditional request and reuse the
+    cached body on 304 Not Modified, so re-runs only download what changed.
+    The cached body is also used when the host stays unreachable or keeps
+    failing after the last retry.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None
+    ):
+        """
+        Initialize HTTP fetcher; unset arguments come from the settings.
+        
+        Args:
+            cache_dir: Directory for cached responses, empty string to disable caching
+            concurrency: Maximum simultaneous requests
+            retries: Retries per request
+            backoff_seconds: Backoff factor between retries
+            timeout_seconds: Connect and read timeout per attempt
+        """
+        self.cache_dir = settings.fetch_cache_dir if cache_dir is None else cache_dir
+        self.concurrency = concurrency or settings.fetch_concurrency
+        self.timeout = timeout_seconds or settings.fetch_timeout_seconds
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        
+        retry = Retry(
+            total=settings.fetch_retries if retries is None else retries,
+            backoff_factor=settings.fetch_backoff_seconds if backoff_seconds is None else backoff_seconds,
+            status_forcelist=TRANSIENT_STATUSES,
+            allowed_methods=("GET",),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=self.concurrency, pool_maxsize=self.concurrency, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        
+        self.downloaded = 0
+        self.revalidated = 0
+    
+    def fetch(self, url: str) -> Optional[bytes]:
+        """
+        Fetch a URL, revalidating any cached copy.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            Response body (the cached one if the host keeps failing), or None
+            if the URL could not be fetched and is not cached
+        """
+        cached = self._read_cache(url)
+        headers = {}
+        if cached is not None:
+            meta, _ = cached
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            if cached is not None:
+                logger.warning(f"Could not revalidate {url}, using cached copy: {e}")
+                return cached[1]
+            logger.warning(f"Could not fetch {url}: {e}")
+            return None
+        
+        if response.status_code == 304 and cached is not None:
+            self.revalidated += 1
+            return cached[1]
+        if response.status_code in TRANSIENT_STATUSES and cached is not None:
+            logger.warning(f"Could not revalidate {url}, using cached copy: HTTP {response.status_code}")
+            return cached[1]
+        if response.status_code != 200:
+            logger.warning(f"Could not fetch {url}: HTTP {response.status_code}")
+            return None
+        
+        self.downloaded += 1
+        self._write_cache(url, response)
+        return response.content
+    
+    def cached(self, url: str) -> Optional[bytes]:
+        """
+        Get the cached body of a URL without touching the network.
+        
+        Args:
+            url: URL fetched earlier
+            
+        Returns:
+            Cached body, or None if the URL is not cached
+        """
+        cached = self._read_cache(url)
+        return None if cached is None else cached[1]
+    
+    def fetch_json(self, url: str) -> Optional[dict]:
+        """
+        Fetch and decode a JSON document.
+        
+        Args:
+            url: URL to fetch
+            
+        Returns:
+            Decoded document, or None if it could not be fetched or parsed
+        """
+        body = self.fetch(url)
+        if body is None:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            logger.warning(f"Invalid JSON from {url}: {e}")
+            return None
+    
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[tuple[str, Optional[bytes]]]:
+        """
+        Fetch URLs concurrently.
+        
+        Args:
+            urls: URLs to fetch
+            
+        Yields:
+            (url, body or None) in the order of urls
+        """
+        urls = list(urls)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="fetch") as pool:
+            yield from zip(urls, pool.map(self.fetch, urls))
+    
+    def _cache_paths(self, url: str) -> tuple[str, str]:
+        """Body and metadata file of a URL's cache entry."""
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, digest[:2], digest)
+        return f"{base}.body", f"{base}.json"
+    
+    def _read_cache(self, url: str) -> Optional[tuple[dict, bytes]]:
+        """Cached metadata and body of a URL, if any."""
+        if not self.cache_dir:
+            return None
+        body_path, meta_path = self._cache_paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+    
+    def _write_cache(self, url: str, response: requests.Response) -> None:
+        """Store a response body and its validators; the metadata is written last."""
+        if not self.cache_dir:
+            return
+        body_path, meta_path = self._cache_paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified")
+        }
+        for path, data in ((body_path, response.content), (meta_path, json.dumps(meta).encode("utf-8"))):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
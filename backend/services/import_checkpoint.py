@@ -0,0 +1,95 @@
+"""Progress checkpoints for resumable imports."""
+import json
+import os
+import threading
+from typing import Optional
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# States of an import unit, in the order they are reached
+FETCHED = "fetched"
+INSERTED = "inserted"
+EMBEDDED = "embedded"
+STAGES = (FETCHED, INSERTED, EMBEDDED)
+
+
+class ImportCheckpoint:
+    """
+    Records how far each unit of an import (e.g. one book of a collection) got.
+    
+    A unit moves through fetched -> inserted -> embedded. The state is
+    written to a JSON file after every change, through a temporary file
+    and a rename, so an interrupted import can resume from the last
+    completed step of each unit. Units may be marked from several threads.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize import checkpoint, loading any saved progress.
+        
+        Args:
+            path: JSON file holding the progress
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.units: dict[str, str] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.units = json.load(f).get("units", {})
+            logger.info(f"Loaded checkpoint {path} ({len(self.units)} units)")
+    
+    def state(self, unit: str) -> Optional[str]:
+        """
+        Get the last state a unit reached.
+        
+        Args:
+            unit: Unit key
+            
+        Returns:
+            fetched, inserted or embedded, or None if the unit was not started
+        """
+        return self.units.get(unit)
+    
+    def reached(self, unit: str, state: str) -> bool:
+        """
+        Check whether a unit reached a state or a later one.
+        
+        Args:
+            unit: Unit key
+            state: fetched, inserted or embedded
+            
+        Returns:
+            True if that step is already done
+        """
+        current = self.units.get(unit)
+        return current is not None and STAGES.index(current) >= STAGES.index(state)
+    
+    def mark(self, unit: str, state: str) -> None:
+        """
+        Record that a unit reached a state and save the checkpoint.
+        
+        Args:
+            unit: Unit key
+            state: fetched, inserted or embedded
+        """
+        if state not in STAGES:
+            raise ValueError(f"Invalid checkpoint state: {state}")
+        with self._lock:
+            self.units[unit] = state
+            self._save()
+    
+    def reset(self) -> None:
+        """Forget all progress."""
+        self.units = {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+    
+    def _save(self) -> None:
+        """Atomically replace the checkpoint file."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"units": self.units}, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,225 @@
+"""Construction and tuning of the FAISS index types and encodings a collection can use."""
+import faiss
+import numpy as np
+from typing import Optional
+
+from core.config import get_settings
+from core.logging import get_logger
+from core.exceptions import VectorStoreException
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+INDEX_TYPES = ("flat", "hnsw", "ivf")
+ENCODINGS = ("float32", "fp16", "sq8", "pq")
+
+# FAISS index_factory code-storage suffix for each encoding
+ENCODING_FACTORY = {"float32": "Flat", "fp16": "SQfp16", "sq8": "SQ8"}
+
+
+def configured_index_type(collection_name: str) -> str:
+    """
+    Get the index type configured for a collection.
+    
+    Args:
+        collection_name: Name of collection (quran, dua, hadith)
+        
+    Returns:
+        One of INDEX_TYPES
+    """
+    index_type = settings.vector_index_types.get(collection_name, "flat")
+    if index_type not in INDEX_TYPES:
+        raise VectorStoreException(f"Unknown index type for {collection_name}: {index_type}")
+    return index_type
+
+
+def configured_encoding(collection_name: str) -> str:
+    """
+    Get the vector encoding configured for a collection.
+    
+    Args:
+        collection_name: Name of collection (quran, dua, hadith)
+        
+    Returns:
+        One of ENCODINGS
+    """
+    encoding = settings.vector_encodings.get(collection_name, "float32")
+    if encoding not in ENCODINGS:
+        raise VectorStoreException(f"Unknown vector encoding for {collection_name}: {encoding}")
+    return encoding
+
+
+def index_type_of(index: faiss.Index) -> str:
+    """Get the INDEX_TYPES name of an existing index."""
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    if isinstance(index, faiss.IndexIVF):
+        return "ivf"
+    return "flat"
+
+
+def encoding_of(index: faiss.Index) -> str:
+    """Get the ENCODINGS name of the vectors stored by an existing index."""
+    if isinstance(index, faiss.IndexHNSW):
+        index = faiss.downcast_index(index.storage)
+    if isinstance(index, (faiss.IndexScalarQuantizer, faiss.IndexIVFScalarQuantizer)):
+        return "fp16" if index.sq.qtype == faiss.ScalarQuantizer.QT_fp16 else "sq8"
+    if isinstance(index, (faiss.IndexPQ, faiss.IndexIVFPQ)):
+        return "pq"
+    return "float32"
+
+
+def ivf_min_training_size() -> int:
+    """Number of vectors needed before an IVF index can be trained."""
+    return settings.ivf_nlist * 39
+
+
+def encoding_min_training_size(encoding: str) -> int:
+    """Number of vectors needed before an encoding's quantizer can be trained."""
+    if encoding == "pq":
+        return (1 << settings.pq_nbits) * 39
+    if encoding == "sq8":
+        return 1
+    return 0
+
+
+def effective_spec(index_type: str, encoding: str, count: int) -> tuple[str, str]:
+    """
+    Get the index type and encoding that can actually be built over a number of vectors.
+    
+    IVF and the trained encodings (sq8, pq) fall back to flat and float32
+    respectively until there are enough vectors to train them.
+    
+    Args:
+        index_type: Configured index type
+        encoding: Configured encoding
+        count: Number of vectors available for training
+        
+    Returns:
+        (index type, encoding) to build
+    """
+    if index_type == "ivf" and count < ivf_min_training_size():
+        index_type = "flat"
+    if count < encoding_min_training_size(encoding):
+        encoding = "float32"
+    return index_type, encoding
+
+
+def _create_index(index_type: str, encoding: str, dimension: int) -> faiss.Index:
+    """Create an untrained, empty index of an exact type and encoding."""
+    if encoding == "pq":
+        if dimension % settings.pq_m:
+            raise VectorStoreException(f"PQ_M ({settings.pq_m}) must divide the dimension ({dimension})")
+        codes = f"PQ{settings.pq_m}x{settings.pq_nbits}"
+    else:
+        codes = ENCODING_FACTORY[encoding]
+    
+    if index_type == "hnsw":
+        description = f"HNSW{settings.hnsw_m}" if encoding == "float32" else f"HNSW{settings.hnsw_m},{codes}"
+    elif index_type == "ivf":
+        description = f"IVF{settings.ivf_nlist},{codes}"
+    else:
+        description = codes
+    
+    index = faiss.index_factory(dimension, description)
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efConstruction = settings.hnsw_ef_construction
+    return configure_search(index)
+
+
+def new_index(index_type: str, encoding: str, dimension: int) -> faiss.Index:
+    """
+    Create an empty index that vectors can be added to straight away.
+    
+    IVF and the trained encodings need data first, so an empty collection
+    starts out with the untrained fallback (see effective_spec) and is
+    converted by build_index once it has enough vectors.
+    
+    Args:
+        index_type: One of INDEX_TYPES
+        encoding: One of ENCODINGS
+        dimension: Vector dimension
+        
+    Returns:
+        Empty index
+    """
+    return _create_index(*effective_spec(index_type, encoding, 0), dimension)
+
+
+def build_index(index_type: str, encoding: str, vectors: np.ndarray) -> faiss.Index:
+    """
+    Build an index of the given type and encoding over a full set of vectors.
+    
+    The index is trained on the vectors first where it needs to be. If
+    there are too few vectors to train, the untrained fallback is built.
+    
+    Args:
+        index_type: One of INDEX_TYPES
+        encoding: One of ENCODINGS
+        vectors: float32 matrix of shape (n, dimension)
+        
+    Returns:
+        Populated index
+    """
+    spec = effective_spec(index_type, encoding, len(vectors))
+    if spec != (index_type, encoding):
+        logger.info(
+            f"Only {len(vectors)} vectors, too few to train {index_type}/{encoding}; "
+            f"building {spec[0]}/{spec[1]} instead"
+        )
+    
+    index = _create_index(*spec, vectors.shape[1])
+    if not index.is_trained:
+        index.train(vectors)
+    if len(vectors):
+        index.add(vectors)
+    return index
+
+
+def needs_rebuild(index: faiss.Index, index_type: str, encoding: str) -> bool:
+    """
+    Whether an index must be rebuilt from raw vectors to match its configuration.
+    
+    Args:
+        index: Current index
+        index_type: Configured type
+        encoding: Configured encoding
+        
+    Returns:
+        True if compaction should rebuild the index
+    """
+    # An untrained stand-in is only replaced once there is enough data to train
+    target = effective_spec(index_type, encoding, index.ntotal)
+    return (index_type_of(index), encoding_of(index)) != target
+
+
+def configure_search(index: faiss.Index) -> faiss.Index:
+    """Apply the configured search-time parameters (efSearch, nprobe) to an index."""
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = settings.hnsw_ef_search
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = settings.ivf_nprobe
+    return index
+
+
+def search_parameters(index: faiss.Index, selector: faiss.IDSelector) -> Optional[faiss.SearchParameters]:
+    """
+    Search parameters that make an index skip the positions a selector rejects during its scan.
+    
+    The configured efSearch and nprobe are carried over, since search
+    parameters replace the ones set on the index.
+    
+    Args:
+        index: Index to search
+        selector: Positions the search may return
+        
+    Returns:
+        Search parameters, or None for index types that cannot filter their scan (flat PQ)
+    """
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=settings.hnsw_ef_search)
+    if isinstance(index, faiss.IndexIVF):
+        return faiss.SearchParametersIVF(sel=selector, nprobe=settings.ivf_nprobe)
+    if isinstance(index, faiss.IndexPQ):
+        return None
+    return faiss.SearchParameters(sel=selector)
@@ -0,0 +1,451 @@
+"""Segmented on-disk storage for vector indexes."""
+import faiss
+import json
+import numpy as np
+import os
+from typing import Callable, Iterable, Iterator, Optional
+
+from core.logging import get_logger
+from core.exceptions import VectorStoreException
+
+logger = get_logger(__name__)
+
+COLLECTION_NAMES = ("quran", "dua", "hadith")
+
+MANIFEST_FILE = "manifest.json"
+WAL_FILE = "ids.wal"
+
+# Map flat code storage (Flat, HNSW, SQ, PQ) or inverted lists (IVF) instead of reading them
+MMAP_FLAGS = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+MMAP_IVF_FLAGS = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+
+
+class IdList:
+    """
+    Database IDs in vector position order.
+    
+    Compacted IDs live in a flat int64 array, which may be memory-mapped
+    straight from disk; IDs appended since are kept in a Python list.
+    Items are returned as strings, the form the rest of the service uses.
+    """
+    
+    def __init__(self, base: Optional[np.ndarray] = None):
+        """
+        Initialize ID list.
+        
+        Args:
+            base: int64 array of compacted IDs
+        """
+        self.base = base if base is not None else np.empty(0, dtype=np.int64)
+        self.tail: list[int] = []
+    
+    def __len__(self) -> int:
+        return len(self.base) + len(self.tail)
+    
+    def __getitem__(self, position: int) -> str:
+        position = int(position)
+        if position < 0:
+            position += len(self)
+        if position < len(self.base):
+            return str(int(self.base[position]))
+        return str(self.tail[position - len(self.base)])
+    
+    def __iter__(self) -> Iterator[str]:
+        for item_id in self.base.tolist():
+            yield str(item_id)
+        for item_id in self.tail:
+            yield str(item_id)
+    
+    def extend(self, ids: Iterable[str]) -> None:
+        """Append IDs after the last position."""
+        self.tail.extend(int(item_id) for item_id in ids)
+    
+    def as_array(self) -> np.ndarray:
+        """All IDs as one int64 array."""
+        if not self.tail:
+            return self.base
+        return np.concatenate([self.base, np.array(self.tail, dtype=np.int64)])
+
+
+class VectorRows:
+    """
+    Full-precision vectors in position order.
+    
+    Vectors are kept as a list of blocks: the compacted base, usually
+    memory-mapped straight from disk, followed by the segments appended
+    since. Used to re-rank candidates from a compressed index exactly.
+    """
+    
+    def __init__(self, dimension: int, blocks: Iterable[np.ndarray] = ()):
+        """
+        Initialize vector rows.
+        
+        Args:
+            dimension: Vector dimension
+            blocks: float32 matrices in position order
+        """
+        self.dimension = dimension
+        self.blocks: list[np.ndarray] = []
+        self.offsets = [0]
+        for block in blocks:
+            self.append(block)
+    
+    def __len__(self) -> int:
+        return self.offsets[-1]
+    
+    def append(self, vectors: np.ndarray) -> None:
+        """Append vectors after the last position."""
+        if len(vectors):
+            self.blocks.append(vectors)
+            self.offsets.append(self.offsets[-1] + len(vectors))
+    
+    def take(self, positions: np.ndarray) -> np.ndarray:
+        """Gather the vectors at the given positions into one matrix."""
+        rows = np.empty((len(positions), self.dimension), dtype=np.float32)
+        block_numbers = np.searchsorted(self.offsets, positions, side="right") - 1
+        for block in np.unique(block_numbers):
+            selected = block_numbers == block
+            rows[selected] = self.blocks[block][positions[selected] - self.offsets[block]]
+        return rows
+    
+    def rerank(self, query: np.ndarray, positions: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Order candidate positions by their exact squared L2 distance to a query.
+        
+        Args:
+            query: float32 query vector of shape (dimension,)
+            positions: Candidate positions from an approximate search (-1 entries are ignored)
+            k: Number of results to keep
+            
+        Returns:
+            Exact distances and positions of the k nearest candidates
+        """
+        positions = positions[positions >= 0]
+        distances = ((self.take(positions) - query) ** 2).sum(axis=1)
+        order = np.argsort(distances)[:k]
+        return distances[order], positions[order]
+
+
+class SegmentedIndexStorage:
+    """
+    Append-only index storage for the vector store collections.
+    
+    Layout under the persist directory:
+        manifest.json                   committed state of every collection
+        <name>/base-<seq>.index         last compacted FAISS index
+        <name>/base-<seq>_ids.npy       int64 IDs of the compacted index
+        <name>/base-<seq>_vectors.npy   float32 vectors of the compacted index
+        <name>/seg-<seq>.npy            float32 vectors appended since
+        <name>/ids.wal                  one ID record per segment
+        
+    Segments and WAL records only become visible once the manifest that
+    references them has been written, and the manifest is replaced
+    atomically. A crash at any point therefore leaves the previously
+    committed state loadable; anything written after it is ignored and
+    cleaned up by the next append or compaction.
+    """
+    
+    def __init__(self, persist_dir: str, collections: tuple[str, ...]):
+        """
+        Initialize segmented storage.
+        
+        Args:
+            persist_dir: Directory holding the manifest and collection folders
+            collections: Collection names (quran, dua, hadith)
+        """
+        self.persist_dir = persist_dir
+        self.collections = collections
+        self.manifest_path = os.path.join(persist_dir, MANIFEST_FILE)
+        # Taken before reading, so a commit racing the read is seen as a change
+        self.manifest_stamp = self._manifest_stamp()
+        self.manifest = self._read_manifest()
+    
+    def exists(self) -> bool:
+        """Whether a committed manifest exists on disk."""
+        return os.path.exists(self.manifest_path)
+    
+    def changed_on_disk(self) -> bool:
+        """Whether another process has committed a manifest since this one was read or written."""
+        return self._manifest_stamp() != self.manifest_stamp
+    
+    def segment_count(self, name: str) -> int:
+        """Number of uncompacted segments of a collection."""
+        return len(self.manifest["collections"][name]["segments"])
+    
+    def load(
+        self,
+        name: str,
+        new_index: Callable[[], faiss.Index],
+        mmap: bool = False
+    ) -> tuple[faiss.Index, IdList]:
+        """
+        Load the committed state of a collection.
+        
+        Args:
+            name: Collection name
+            new_index: Factory for an empty index, used when nothing is compacted yet
+            mmap: Memory-map the base index and IDs read-only instead of reading them
+            
+        Returns:
+            Index holding the base and every segment, and the IDs in position order
+        """
+        state = self.manifest["collections"][name]
+        
+        if mmap and state["segments"]:
+            logger.warning(
+                f"{name} has {len(state['segments'])} uncompacted segments, loading it into memory; "
+                "run scripts/compact_vector_store.py to serve it memory-mapped"
+            )
+            mmap = False
+        
+        if state["base"] is not None:
+            index_path = self._base_index_path(name, state["base"])
+            ids_path = self._base_ids_path(name, state["base"])
+            if mmap:
+                index = self._read_index_mmap(index_path)
+                ids = IdList(np.load(ids_path, mmap_mode="r"))
+            else:
+                index = faiss.read_index(index_path)
+                ids = IdList(np.load(ids_path))
+        else:
+            index = new_index()
+            ids = IdList()
+        
+        if state["segments"]:
+            records = self._read_wal(name, state["wal_size"])
+            for seq in state["segments"]:
+                vectors = np.load(self._segment_path(name, seq))
+                segment_ids = records.get(seq)
+                if segment_ids is None or len(segment_ids) != len(vectors):
+                    raise VectorStoreException(f"WAL record missing for {name} segment {seq}")
+                index.add(vectors)
+                ids.extend(segment_ids)
+        
+        if index.ntotal != len(ids):
+            raise VectorStoreException(
+                f"{name} index has {index.ntotal} vectors but {len(ids)} IDs"
+            )
+        return index, ids
+    
+    def append(self, name: str, vectors: np.ndarray, ids: list[str]) -> None:
+        """
+        Durably append vectors and their IDs to a collection.
+        
+        Only the new vectors and one WAL record are written.
+        
+        Args:
+            name: Collection name
+            vectors: float32 matrix of shape (n, dimension)
+            ids: IDs of the vectors, in the same order
+        """
+        state = self.manifest["collections"][name]
+        seq = state["next_seq"]
+        collection_dir = self._collection_dir(name)
+        os.makedirs(collection_dir, exist_ok=True)
+        
+        # 1. Segment vectors
+        self._write_atomic(self._segment_path(name, seq), lambda f: np.save(f, vectors))
+        
+        # 2. WAL record, written after the last committed record
+        record = f"{seq}\t{','.join(ids)}\n".encode("utf-8")
+        wal_path = os.path.join(collection_dir, WAL_FILE)
+        with open(wal_path, "ab") as f:
+            f.truncate(state["wal_size"])
+            f.seek(state["wal_size"])
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        # 3. Commit
+        state["segments"].append(seq)
+        state["wal_size"] += len(record)
+        state["next_seq"] = seq + 1
+        self._write_manifest()
+    
+    def read_vectors(self, name: str, dimension: int) -> np.ndarray:
+        """
+        Read the full-precision vectors of a collection in position order.
+        
+        Args:
+            name: Collection name
+            dimension: Vector dimension
+            
+        Returns:
+            float32 matrix of shape (n, dimension)
+        """
+        return np.concatenate([np.empty((0, dimension), dtype=np.float32), *self._vector_blocks(name)])
+    
+    def load_vectors(self, name: str, dimension: int) -> VectorRows:
+        """
+        Load the full-precision vectors of a collection without copying the base.
+        
+        Args:
+            name: Collection name
+            dimension: Vector dimension
+            
+        Returns:
+            Vector rows with the base memory-mapped read-only
+        """
+        return VectorRows(dimension, self._vector_blocks(name))
+    
+    def _vector_blocks(self, name: str) -> list[np.ndarray]:
+        """Full-precision vectors of the base and each segment, in position order."""
+        state = self.manifest["collections"][name]
+        parts = []
+        
+        if state["base"] is not None:
+            vectors_path = self._base_vectors_path(name, state["base"])
+            if os.path.exists(vectors_path):
+                parts.append(np.load(vectors_path, mmap_mode="r"))
+            else:
+                # Bases written before raw vectors were kept are always flat
+                base_index = faiss.read_index(self._base_index_path(name, state["base"]))
+                parts.append(base_index.reconstruct_n(0, base_index.ntotal))
+        
+        parts.extend(np.load(self._segment_path(name, seq)) for seq in state["segments"])
+        return parts
+    
+    def compact(
+        self,
+        name: str,
+        index: faiss.Index,
+        ids: IdList,
+        vectors: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Replace a collection's base and segments with a single compacted index.
+        
+        Args:
+            name: Collection name
+            index: Index holding every vector of the collection
+            ids: IDs in position order
+            vectors: Full-precision vectors, read from the current files if not given
+        """
+        state = self.manifest["collections"][name]
+        seq = state["next_seq"]
+        os.makedirs(self._collection_dir(name), exist_ok=True)
+        
+        if vectors is None:
+            vectors = self.read_vectors(name, index.d)
+        
+        id_array = ids.as_array()
+        self._write_atomic(
+            self._base_index_path(name, seq),
+            lambda f: f.write(faiss.serialize_index(index).tobytes())
+        )
+        self._write_atomic(self._base_ids_path(name, seq), lambda f: np.save(f, id_array))
+        self._write_atomic(self._base_vectors_path(name, seq), lambda f: np.save(f, vectors))
+        
+        state["base"] = seq
+        state["segments"] = []
+        state["wal_size"] = 0
+        state["next_seq"] = seq + 1
+        self._write_manifest()
+        
+        self._remove_unreferenced(name)
+        logger.info(f"Compacted {name} index ({len(ids)} entries)")
+    
+    @staticmethod
+    def _read_index_mmap(path: str) -> faiss.Index:
+        """Read an index with its vector data memory-mapped from the file."""
+        try:
+            return faiss.read_index(path, MMAP_FLAGS)
+        except RuntimeError:
+            # IVF inverted lists cannot be combined with flat-code mapping
+            return faiss.read_index(path, MMAP_IVF_FLAGS)
+    
+    def _remove_unreferenced(self, name: str) -> None:
+        """Delete files of a collection that the manifest no longer references."""
+        state = self.manifest["collections"][name]
+        keep = {WAL_FILE}
+        if state["base"] is not None:
+            keep.add(os.path.basename(self._base_index_path(name, state["base"])))
+            keep.add(os.path.basename(self._base_ids_path(name, state["base"])))
+            keep.add(os.path.basename(self._base_vectors_path(name, state["base"])))
+        keep.update(os.path.basename(self._segment_path(name, seq)) for seq in state["segments"])
+        
+        collection_dir = self._collection_dir(name)
+        for filename in os.listdir(collection_dir):
+            if filename not in keep:
+                os.remove(os.path.join(collection_dir, filename))
+        
+        with open(os.path.join(collection_dir, WAL_FILE), "ab") as f:
+            f.truncate(state["wal_size"])
+    
+    def _read_wal(self, name: str, size: int) -> dict[int, list[str]]:
+        """Read the committed WAL records of a collection."""
+        with open(os.path.join(self._collection_dir(name), WAL_FILE), "rb") as f:
+            data = f.read(size)
+        
+        records = {}
+        for line in data.decode("utf-8").splitlines():
+            seq, _, joined = line.partition("\t")
+            records[int(seq)] = joined.split(",") if joined else []
+        return records
+    
+    def _read_manifest(self) -> dict:
+        """Read the manifest, or start an empty one."""
+        manifest = {"version": 1, "collections": {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        
+        for name in self.collections:
+            manifest["collections"].setdefault(name, {
+                "base": None,
+                "segments": [],
+                "wal_size": 0,
+                "next_seq": 1
+            })
+        return manifest
+    
+    def _write_manifest(self) -> None:
+        """Atomically replace the manifest on disk."""
+        data = json.dumps(self.manifest, indent=2).encode("utf-8")
+        self._write_atomic(self.manifest_path, lambda f: f.write(data))
+        self.manifest_stamp = self._manifest_stamp()
+    
+    def _manifest_stamp(self) -> Optional[tuple[int, int, int]]:
+        """Inode, modification time and size of the manifest, None if there is none."""
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        # Every commit renames a new file into place, so the inode changes even within one mtime tick
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+    
+    def _write_atomic(self, path: str, write: Callable) -> None:
+        """Write a file through a temporary file, fsync and rename."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._fsync_dir(os.path.dirname(path))
+    
+    @staticmethod
+    def _fsync_dir(path: str) -> None:
+        """Persist a rename in a directory, where the platform supports it."""
+        if not hasattr(os, "O_DIRECTORY"):
+            return
+        fd = os.open(path or ".", os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def _collection_dir(self, name: str) -> str:
+        return os.path.join(self.persist_dir, name)
+    
+    def _segment_path(self, name: str, seq: int) -> str:
+        return os.path.join(self._collection_dir(name), f"seg-{seq:06d}.npy")
+    
+    def _base_index_path(self, name: str, seq: int) -> str:
+        return os.path.join(self._collection_dir(name), f"base-{seq:06d}.index")
+    
+    def _base_ids_path(self, name: str, seq: int) -> str:
+        return os.path.join(self._collection_dir(name), f"base-{seq:06d}_ids.npy")
+
+    def _base_vectors_path(self, name: str, seq: int) -> str:
+        return os.path.join(self._collection_dir(name), f"base-{seq:06d}_vectors.npy")
@@ -0,0 +1,499 @@
+"""Staged ingestion pipeline shared by the corpus importers."""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Iterable, Optional, Type
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from db.bulk import bulk_insert, unique_key, DEFAULT_BATCH_SIZE
+from services.length_buckets import token_lengths, token_budget_batches
+from core.config import get_settings
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+STAGE_NAMES = ("parse", "insert", "embed", "index")
+
+# Marks the end of a stage's output
+_DONE = object()
+
+# How often blocked stages check whether the pipeline failed
+_POLL_SECONDS = 0.1
+
+# Longest text embedded per collection; hadith narrations can run to thousands of characters
+EMBED_TEXT_LIMITS = {"hadith": 1000}
+
+
+def embed_text(collection_name: str, translation: str) -> str:
+    """
+    Get the text embedded for a stored row's translation.
+    
+    Args:
+        collection_name: Vector store collection (quran, dua, hadith)
+        translation: Row translation
+        
+    Returns:
+        Translation cut to the collection's embedding limit
+    """
+    return translation[:EMBED_TEXT_LIMITS.get(collection_name)]
+
+
+class IngestBatch:
+    """Rows produced by an importer's source, inserted and embedded together."""
+    
+    def __init__(
+        self,
+        rows: list[dict],
+        texts: Optional[list[str]] = None,
+        key: Optional[str] = None,
+        ids: Optional[list[str]] = None
+    ):
+        """
+        Initialize ingest batch.
+        
+        Args:
+            rows: Column values of each row; keys that are not columns are ignored
+            texts: Text to embed for each row, or None to use the pipeline's text_of
+            key: Label passed to the on_inserted / on_indexed callbacks, e.g. a checkpoint unit
+            ids: Database IDs of rows that are already stored; such a batch is only embedded and indexed
+        """
+        self.rows = rows
+        self.texts = texts
+        self.key = key
+        self.ids = ids
+
+
+class StageStats:
+    """Throughput counters of one pipeline stage."""
+    
+    def __init__(self, name: str):
+        self.name = name
+        self.rows = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Rows per second of time spent working rather than waiting on neighbouring stages."""
+        return self.rows / self.busy_seconds if self.busy_seconds > 0 else 0.0
+
+
+class _Stopped(Exception):
+    """Raised inside a stage when another stage failed."""
+
+
+# Model of an embedding worker process
+_worker_model = None
+
+
+def _init_embed_worker(model_name: str, revision: Optional[str], threads: int) -> None:
+    """Load the sentence transformer once per worker process."""
+    global _worker_model
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    from sentence_transformers import SentenceTransformer
+    _worker_model = SentenceTransformer(model_name, revision=revision)
+
+
+def _encode_timed(model: Any, texts: list[str]) -> tuple[np.ndarray, float]:
+    """Encode texts in one forward pass, returning the embeddings and the seconds it took."""
+    start = time.perf_counter()
+    embeddings = np.asarray(model.encode(texts, batch_size=len(texts)), dtype="float32")
+    return embeddings, time.perf_counter() - start
+
+
+def _encode_in_worker(texts: list[str]) -> tuple[np.ndarray, float]:
+    """Encode texts in an embedding worker process."""
+    return _encode_timed(_worker_model, texts)
+
+
+def available_cores() -> int:
+    """Number of CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class IngestionPipeline:
+    """
+    Parse -> insert -> embed -> index pipeline for one collection.
+    
+    Each stage runs on its own thread (the insert stage on the caller's,
+    which owns the session), connected to the next by a bounded queue,
+    so the database insert of one batch overlaps the encoding of
+    the previous one and the parsing of the next. By default the vector
+    store's model encodes in-process; large imports (reindex, the full
+    Sunnah import) spread encoding over a pool of worker processes, one
+    per available core, each with its own copy of the model, which only
+    pays off once there are enough rows to amortize starting them. Within a batch, texts are sorted by
+    token length into encode calls of at most INGEST_EMBED_TOKEN_BUDGET
+    padded tokens, so short texts are not padded to the longest one;
+    batches keep their order through every stage.
+    
+    Without resume, only rows the insert stage actually added are
+    embedded. With resume, every stored row of a batch whose ID is not in
+    the index yet is embedded, which repairs imports interrupted between
+    insert and index.
+    """
+    
+    def __init__(
+        self,
+        db: Session,
+        vector_store,
+        model: Type,
+        collection_name: str,
+        text_of: Optional[Callable[[dict], str]] = None,
+        resume: bool = False,
+        on_inserted: Optional[Callable[[str], None]] = None,
+        on_indexed: Optional[Callable[[str], None]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        embed_workers: Optional[int] = None
+    ):
+        """
+        Initialize ingestion pipeline.
+        
+        Args:
+            db: Database session, used on the calling thread only
+            vector_store: Vector store receiving the embeddings
+            model: QuranAyah, Dua or Hadith
+            collection_name: Vector store collection (quran, dua, hadith)
+            text_of: Text to embed for a row, for batches without texts (default: embed_text of its translation)
+            resume: Also embed stored rows of each batch that are missing from the index
+            on_inserted: Called with a batch's key once its rows are committed
+            on_indexed: Called with a batch's key once its embeddings are persisted
+            batch_size: Rows per INSERT statement
+            embed_workers: Embedding processes, default INGEST_EMBED_WORKERS (1 = in-process, 0 = one per core)
+        """
+        self.db = db
+        self.vector_store = vector_store
+        self.model = model
+        self.collection_name = collection_name
+        self.text_of = text_of or (lambda row: embed_text(collection_name, row["translation"]))
+        self.resume = resume
+        self.on_inserted = on_inserted
+        self.on_indexed = on_indexed
+        self.batch_size = batch_size
+        self.embed_batch_size = settings.ingest_embed_batch_size
+        self.embed_token_budget = settings.ingest_embed_token_budget
+        self.queue_size = settings.ingest_queue_size
+        
+        workers = settings.ingest_embed_workers if embed_workers is None else embed_workers
+        self.embed_workers = workers if workers > 0 else available_cores()
+        
+        self.columns = set(model.__table__.columns.keys())
+        self.key_column = unique_key(model)
+        if resume and self.key_column is None:
+            raise ValueError(f"Resuming needs a unique key, which {model.__tablename__} lacks")
+        
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+        self._embedded_ids: set[str] = set()
+        self._cached_rows = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def run(self, source: Iterable[IngestBatch]) -> dict[str, StageStats]:
+        """
+        Ingest every batch of a source and compact the collection.
+        
+        The collection is only compacted once, at the end: automatic
+        compaction is deferred for the run, since each one rewrites the
+        whole base and a long import would otherwise rewrite it every
+        VECTOR_STORE_MAX_SEGMENTS batches.
+        
+        Args:
+            source: Batches to ingest; iterated on the parse stage's thread
+            
+        Returns:
+            Stats of each stage by name
+            
+        Raises:
+            The first exception raised by any stage
+        """
+        self._stop.clear()
+        self._errors = []
+        self._cached_rows = 0
+        if self.resume:
+            self._embedded_ids = set(self.vector_store.get_ids(self.collection_name))
+        
+        stats = {name: StageStats(name) for name in STAGE_NAMES}
+        to_insert, to_embed, to_index = (queue.Queue(maxsize=self.queue_size) for _ in range(3))
+        
+        if self.embed_workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.embed_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_embed_worker,
+                initargs=(
+                    settings.embedding_model,
+                    settings.embedding_model_revision,
+                    max(1, available_cores() // self.embed_workers)
+                )
+            )
+        
+        stages = [
+            threading.Thread(target=self._parse_stage, args=(stats["parse"], source, to_insert), name="ingest-parse"),
+            threading.Thread(target=self._embed_stage, args=(stats["embed"], to_embed, to_index), name="ingest-embed"),
+            threading.Thread(
+                target=self._stage,
+                args=(stats["index"], to_index, None, self._index, lambda item: len(item[0])),
+                name="ingest-index"
+            ),
+        ]
+        start = time.perf_counter()
+        with self.vector_store.deferred_compaction(self.collection_name):
+            try:
+                for thread in stages:
+                    thread.start()
+                self._stage(stats["insert"], to_insert, to_embed, self._insert, lambda batch: len(batch.rows))
+            except BaseException:
+                self._stop.set()
+                raise
+            finally:
+                for thread in stages:
+                    thread.join()
+                if self._pool is not None:
+                    self._pool.shutdown(cancel_futures=True)
+                    self._pool = None
+        
+            if self._errors:
+                raise self._errors[0]
+        
+            if stats["index"].rows:
+                self.vector_store.compact(self.collection_name)
+        self._log_stats(stats, time.perf_counter() - start)
+        return stats
+    
+    def _insert(self, batch: IngestBatch) -> tuple[list[str], list[str], Optional[str]]:
+        """Bulk insert a batch and select the rows to embed."""
+        texts = batch.texts if batch.texts is not None else [self.text_of(row) for row in batch.rows]
+        if batch.ids is not None:
+            return batch.ids, texts, batch.key
+        
+        rows = [{key: value for key, value in row.items() if key in self.columns} for row in batch.rows]
+        inserted = bulk_insert(self.db, self.model, rows, self.batch_size)
+        self.db.commit()
+        if batch.key is not None and self.on_inserted is not None:
+            self.on_inserted(batch.key)
+        
+        if not self.resume:
+            text_by_row = {id(row): text for row, text in zip(rows, texts)}
+            return [str(row_id) for row_id, _ in inserted], [text_by_row[id(row)] for _, row in inserted], batch.key
+        
+        # Look up every row of the batch, including ones stored by an earlier run
+        text_by_key = {row[self.key_column]: text for row, text in zip(rows, texts)}
+        keys = list(text_by_key)
+        column = getattr(self.model, self.key_column)
+        stored = []
+        for start in range(0, len(keys), self.batch_size):
+            stored.extend(
+                self.db.query(self.model.id, column)
+                .filter(column.in_(keys[start:start + self.batch_size]))
+                .all()
+            )
+        
+        ids, pending_texts = [], []
+        for row_id, row_key in sorted(stored):
+            if str(row_id) in self._embedded_ids:
+                continue
+            # Claim the ID now so a later batch sharing the row does not embed it again
+            self._embedded_ids.add(str(row_id))
+            ids.append(str(row_id))
+            pending_texts.append(text_by_key[row_key])
+        return ids, pending_texts, batch.key
+    
+    def _index(self, item: tuple[list[str], np.ndarray, Optional[str]]) -> None:
+        """Persist a batch's embeddings."""
+        ids, embeddings, key = item
+        if ids:
+            self.vector_store.add_embeddings(embeddings, ids, self.collection_name)
+        if key is not None and self.on_indexed is not None:
+            self.on_indexed(key)
+    
+    def _cached(self, texts: list[str]) -> tuple[np.ndarray, list[int]]:
+        """
+        Look texts up in the document embedding cache.
+        
+        Returns:
+            (embeddings with the cached rows filled in, positions of the texts still to encode)
+        """
+        if self.vector_store.embedding_cache is None:
+            return np.empty((len(texts), self.vector_store.dimension), dtype="float32"), list(range(len(texts)))
+        return self.vector_store.embedding_cache.get_many(texts)
+    
+    def _plan(self, texts: list[str]) -> list[list[int]]:
+        """Group texts of similar token length into encode calls within the token budget."""
+        lengths = token_lengths(self.vector_store.model, texts)
+        return token_budget_batches(lengths, self.embed_token_budget, self.embed_batch_size)
+    
+    def _submit(self, chunks: list[list[str]]) -> list[Future]:
+        """Start encoding chunks of texts, one forward pass each."""
+        futures = []
+        for chunk in chunks:
+            if self._pool is not None:
+                futures.append(self._pool.submit(_encode_in_worker, chunk))
+            else:
+                future = Future()
+                future.set_result(_encode_timed(self.vector_store.model, chunk))
+                futures.append(future)
+        return futures
+    
+    def _embed_stage(self, stats: StageStats, inbox: queue.Queue, outbox: queue.Queue) -> None:
+        """Encode batches, keeping up to one batch per worker in flight while preserving order."""
+        in_flight = deque()
+        
+        def finish() -> None:
+            (ids, key), embeddings, encoded_texts, positions, futures = in_flight.popleft()
+            results = [self._wait(future) for future in futures]
+            if results:
+                start = time.perf_counter()
+                # Chunks come back in length order; scatter them to their rows
+                encoded = np.vstack([chunk for chunk, _ in results])
+                embeddings[positions] = encoded
+                if self.vector_store.embedding_cache is not None:
+                    self.vector_store.embedding_cache.put_many(encoded_texts, encoded)
+                stats.busy_seconds += time.perf_counter() - start
+            stats.rows += len(ids)
+            stats.batches += 1
+            stats.busy_seconds += sum(seconds for _, seconds in results) / self.embed_workers
+            self._put(outbox, (ids, embeddings, key))
+        
+        try:
+            while True:
+                item = self._get(inbox)
+                if item is _DONE:
+                    break
+                ids, texts, key = item
+                start = time.perf_counter()
+                embeddings, missing = self._cached(texts)
+                self._cached_rows += len(texts) - len(missing)
+                chunks = self._plan([texts[position] for position in missing])
+                positions = [missing[index] for chunk in chunks for index in chunk]
+                encoded_texts = [texts[position] for position in positions]
+                stats.busy_seconds += time.perf_counter() - start
+                futures = self._submit([[texts[missing[index]] for index in chunk] for chunk in chunks])
+                in_flight.append(((ids, key), embeddings, encoded_texts, positions, futures))
+                while in_flight and (len(in_flight) > self.embed_workers or all(f.done() for f in in_flight[0][4])):
+                    finish()
+            while in_flight:
+                finish()
+        except _Stopped:
+            pass
+        except BaseException as e:
+            self._fail(stats.name, e)
+        finally:
+            self._close(outbox)
+    
+    def _parse_stage(self, stats: StageStats, source: Iterable[IngestBatch], outbox: queue.Queue) -> None:
+        """Pull batches from the source."""
+        try:
+            iterator = iter(source)
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                batch = next(iterator, _DONE)
+                stats.busy_seconds += time.perf_counter() - start
+                if batch is _DONE:
+                    break
+                stats.rows += len(batch.rows)
+                stats.batches += 1
+                self._put(outbox, batch)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            self._fail(stats.name, e)
+        finally:
+            self._close(outbox)
+    
+    def _stage(
+        self,
+        stats: StageStats,
+        inbox: queue.Queue,
+        outbox: Optional[queue.Queue],
+        work: Callable[[Any], Any],
+        count: Callable[[Any], int]
+    ) -> None:
+        """Apply work to every item of the inbox, passing results on to the outbox."""
+        try:
+            while True:
+                item = self._get(inbox)
+                if item is _DONE:
+                    break
+                start = time.perf_counter()
+                result = work(item)
+                stats.busy_seconds += time.perf_counter() - start
+                stats.rows += count(item)
+                stats.batches += 1
+                if outbox is not None:
+                    self._put(outbox, result)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            self._fail(stats.name, e)
+        finally:
+            if outbox is not None:
+                self._close(outbox)
+    
+    def _get(self, inbox: queue.Queue) -> Any:
+        """Take the next item, giving up if the pipeline failed."""
+        while True:
+            try:
+                return inbox.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                if self._stop.is_set():
+                    raise _Stopped()
+    
+    def _put(self, outbox: queue.Queue, item: Any) -> None:
+        """Hand an item to the next stage, giving up if the pipeline failed."""
+        while True:
+            try:
+                outbox.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                if self._stop.is_set():
+                    raise _Stopped()
+    
+    def _wait(self, future: Future) -> Any:
+        """Wait for an encode, giving up if the pipeline failed."""
+        while True:
+            try:
+                return future.result(timeout=_POLL_SECONDS)
+            except FutureTimeoutError:
+                if self._stop.is_set():
+                    raise _Stopped()
+    
+    def _close(self, outbox: queue.Queue) -> None:
+        """Tell the next stage no more items follow."""
+        try:
+            self._put(outbox, _DONE)
+        except _Stopped:
+            pass
+    
+    def _fail(self, stage: str, error: BaseException) -> None:
+        """Record a stage failure and stop the other stages."""
+        logger.error(f"Ingestion {stage} stage failed: {error}")
+        self._errors.append(error)
+        self._stop.set()
+    
+    def _log_stats(self, stats: dict[str, StageStats], elapsed: float) -> None:
+        """Log rows/sec per stage; the slowest stage bounds the pipeline."""
+        logger.info(f"Ingested {stats['index'].rows} {self.collection_name} rows in {elapsed:.1f}s")
+        logger.info(f"{'stage':<8} {'rows':>8} {'busy s':>8} {'rows/sec':>10}")
+        for stage in stats.values():
+            logger.info(f"{stage.name:<8} {stage.rows:>8} {stage.busy_seconds:>8.2f} {stage.rows_per_second:>10.0f}")
+        busy = [stage for stage in stats.values() if stage.rows]
+        if busy:
+            logger.info(f"Bottleneck: {min(busy, key=lambda stage: stage.rows_per_second).name} stage")
+        if self.vector_store.embedding_cache is not None:
+            logger.info(
+                f"Document embedding cache: {self._cached_rows} of {stats['embed'].rows} rows reused, "
+                f"{len(self.vector_store.embedding_cache)} entries"
+            )
@@ -0,0 +1,116 @@
+"""Incremental parsing of large JSON documents."""
+import json
+from typing import Any, Iterator, Optional, TextIO
+
+# Characters read from the file at a time
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]}"
+
+
+class _Reader:
+    """Buffered cursor over a text stream that reads ahead only as needed."""
+    
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+    
+    def _fill(self) -> bool:
+        """Drop consumed text and read another chunk; False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Next non-whitespace character, or an empty string at end of file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+    
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be char."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} but found {found or 'end of file'!r}")
+        self.pos += 1
+    
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input until it is whole."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number is only complete once a delimiter follows it ("1" may be the start of "1.5")
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if is_number and not self.eof and (end == len(self.buffer) or self.buffer[end] not in _DELIMITERS):
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_items(
+    stream: TextIO,
+    key: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array one at a time.
+    
+    Only the element being decoded is held in memory, so arbitrarily
+    large files can be processed with bounded memory.
+    
+    Args:
+        stream: Text stream of a JSON document
+        key: Member holding the array when the document is an object; a
+            document that is itself an array is read directly
+        chunk_size: Characters read at a time
+        
+    Yields:
+        Decoded array elements in document order
+        
+    Raises:
+        ValueError: If the document is malformed or the array is missing
+    """
+    reader = _Reader(stream, chunk_size)
+    
+    if key is not None and reader.peek() == "{":
+        reader.expect("{")
+        while True:
+            if reader.peek() == "}":
+                raise ValueError(f"No {key!r} member in JSON object")
+            name = reader.value()
+            reader.expect(":")
+            if name == key:
+                break
+            reader.value()
+            if reader.peek() == ",":
+                reader.pos += 1
+    
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        if reader.peek() == "]":
+            return
+        reader.expect(",")
@@ -0,0 +1,65 @@
+"""Length-bucketed batching of texts for bulk encoding."""
+from typing import Any
+
+
+def token_lengths(model: Any, texts: list[str]) -> list[int]:
+    """
+    Count the tokens each text is encoded with.
+    
+    Args:
+        model: Sentence transformer; its tokenizer is used when it has one
+        texts: Texts to encode
+        
+    Returns:
+        Token count of each text, capped at the model's max_seq_length
+    """
+    max_length = getattr(model, "max_seq_length", None) or 512
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        # Roughly four characters per token of English text
+        return [min(max_length, len(text) // 4 + 2) for text in texts]
+    
+    input_ids = tokenizer(texts, add_special_tokens=True, truncation=True, max_length=max_length)["input_ids"]
+    return [min(max_length, len(ids)) for ids in input_ids]
+
+
+def token_budget_batches(lengths: list[int], token_budget: int, max_batch_size: int) -> list[list[int]]:
+    """
+    Group texts of similar length into batches that fit a token budget.
+    
+    Texts are sorted longest first, so each batch is padded only to the
+    length of its first member, and a batch grows while its padded size
+    (members x longest member) stays within the budget.
+    
+    Args:
+        lengths: Token count of each text
+        token_budget: Maximum padded tokens per batch; a longer text gets a batch of its own
+        max_batch_size: Maximum texts per batch
+        
+    Returns:
+        Batches of positions into lengths; every position appears exactly once
+    """
+    order = sorted(range(len(lengths)), key=lambda position: lengths[position], reverse=True)
+    batches, batch = [], []
+    for position in order:
+        if batch and ((len(batch) + 1) * lengths[batch[0]] > token_budget or len(batch) >= max_batch_size):
+            batches.append(batch)
+            batch = []
+        batch.append(position)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def padded_tokens(lengths: list[int], batches: list[list[int]]) -> int:
+    """
+    Count the tokens the model processes for batches, padding included.
+    
+    Args:
+        lengths: Token count of each text
+        batches: Batches of positions into lengths
+        
+    Returns:
+        Sum over batches of members x longest member
+    """
+    return sum(len(batch) * max(lengths[position] for position in batch) for batch in batches if batch)
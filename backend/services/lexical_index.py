@@ -0,0 +1,268 @@
+"""In-memory BM25 index over the corpus text, for hybrid search."""
+import numpy as np
+from collections import Counter
+from typing import Collection, Optional
+from sqlalchemy.orm import Session
+
+from db.session import SessionLocal
+from models.database import CORPUS_MODELS
+from services.vector_store import VectorStoreService, get_vector_store
+from services.search_filter import SearchFilter
+from services.text_normalization import tokenize
+from core.config import get_settings
+from core.logging import get_logger
+from core.exceptions import DatabaseException
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Terms found in more documents than this share of the corpus (and than
+# STOPWORD_MIN_DOCUMENTS) are treated as stopwords and not indexed: they
+# carry almost no BM25 weight but have by far the longest postings
+STOPWORD_DOCUMENT_RATIO = 0.1
+STOPWORD_MIN_DOCUMENTS = 1000
+
+
+class LexicalIndex:
+    """
+    BM25 index over the translation and normalized Arabic text of every collection.
+    
+    Documents are numbered collection by collection in vector position
+    order, so a document number is its collection's offset plus its
+    vector position. Postings are stored CSR-style: the documents and
+    precomputed BM25 weights of term t are docs[indptr[t]:indptr[t + 1]]
+    and weights[indptr[t]:indptr[t + 1]]. Scoring a query is then one
+    bincount over the postings of its terms; stopwords have no postings.
+    """
+    
+    def __init__(
+        self,
+        vocabulary: dict[str, int],
+        indptr: np.ndarray,
+        docs: np.ndarray,
+        weights: np.ndarray,
+        offsets: dict[str, tuple[int, int]],
+        version: int
+    ):
+        """
+        Initialize lexical index.
+        
+        Args:
+            vocabulary: Term -> term number
+            indptr: int64 start of each term's postings, plus the total
+            docs: int32 document numbers of all postings
+            weights: float32 BM25 weight of each posting
+            offsets: (first document, document count) by result type (Quran, Dua, Hadith)
+            version: Vector store version the positions belong to
+        """
+        self.vocabulary = vocabulary
+        self.indptr = indptr
+        self.docs = docs
+        self.weights = weights
+        self.offsets = offsets
+        self.version = version
+        self.size = sum(count for _, count in offsets.values())
+    
+    @classmethod
+    def build(cls, texts: dict[str, list[str]], version: int = 0) -> "LexicalIndex":
+        """
+        Index the texts of each collection.
+        
+        Args:
+            texts: Texts in vector position order, by result type
+            version: Vector store version the positions belong to
+            
+        Returns:
+            Built lexical index
+        """
+        vocabulary: dict[str, int] = {}
+        offsets = {}
+        posting_terms, posting_docs, posting_tfs, lengths = [], [], [], []
+        doc = 0
+        for item_type, collection_texts in texts.items():
+            offsets[item_type] = (doc, len(collection_texts))
+            for text in collection_texts:
+                tokens = tokenize(text)
+                lengths.append(len(tokens))
+                for term, tf in Counter(tokens).items():
+                    posting_terms.append(vocabulary.setdefault(term, len(vocabulary)))
+                    posting_docs.append(doc)
+                    posting_tfs.append(tf)
+                doc += 1
+        
+        terms = np.array(posting_terms, dtype=np.int64)
+        docs = np.array(posting_docs, dtype=np.int32)
+        tfs = np.array(posting_tfs, dtype=np.float32)
+        lengths = np.array(lengths, dtype=np.float32)
+        
+        order = np.argsort(terms, kind="stable")
+        terms, docs, tfs = terms[order], docs[order], tfs[order]
+        df = np.bincount(terms, minlength=len(vocabulary))
+        stopwords = df > max(STOPWORD_DOCUMENT_RATIO * doc, STOPWORD_MIN_DOCUMENTS)
+        indexed = ~stopwords[terms]
+        terms, docs, tfs = terms[indexed], docs[indexed], tfs[indexed]
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.where(stopwords, 0, df), out=indptr[1:])
+        
+        idf = np.log1p((doc - df + 0.5) / (df + 0.5)).astype(np.float32)
+        average_length = max(float(lengths.mean()), 1.0) if doc else 1.0
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length)
+        weights = idf[terms] * tfs * (BM25_K1 + 1) / (tfs + norms[docs])
+        return cls(vocabulary, indptr, docs, weights.astype(np.float32), offsets, version)
+    
+    @classmethod
+    def load(cls, db: Session, vector_store: VectorStoreService) -> "LexicalIndex":
+        """
+        Stream every collection's text from the database and index it.
+        
+        Args:
+            db: Database session
+            vector_store: Vector store whose positions the index follows
+            
+        Returns:
+            Loaded lexical index
+        """
+        version = vector_store.version
+        try:
+            texts = {}
+            for item_type, model in CORPUS_MODELS.items():
+                ids = vector_store.get_ids(item_type.lower()).as_array()
+                positions: dict[int, list[int]] = {}
+                for position, item_id in enumerate(ids.tolist()):
+                    positions.setdefault(item_id, []).append(position)
+                
+                collection_texts = [""] * len(ids)
+                rows = db.query(model.id, model.translation, model.arabic_text).yield_per(5000)
+                for row_id, translation, arabic_text in rows:
+                    for position in positions.get(row_id, ()):
+                        collection_texts[position] = f"{translation} {arabic_text}"
+                texts[item_type] = collection_texts
+        except Exception as e:
+            logger.error(f"Failed to load lexical index: {e}")
+            raise DatabaseException(f"Lexical index load failed: {e}")
+        
+        index = cls.build(texts, version)
+        logger.info(
+            f"Lexical index: {index.size} documents, {len(index.vocabulary)} terms, "
+            f"{len(index.docs)} postings ({index.nbytes / (1024 * 1024):.1f} MB)"
+        )
+        return index
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the postings arrays."""
+        return self.indptr.nbytes + self.docs.nbytes + self.weights.nbytes
+    
+    def query_terms(self, query: str) -> frozenset[int]:
+        """
+        Numbers of the query's terms that have postings, which alone decide its matches.
+        
+        Args:
+            query: Query text
+            
+        Returns:
+            Term numbers, without unknown terms and stopwords
+        """
+        terms = (self.vocabulary.get(token) for token in tokenize(query))
+        return frozenset(
+            term for term in terms
+            if term is not None and self.indptr[term] < self.indptr[term + 1]
+        )
+    
+    def match(self, query: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the documents holding any query term and their BM25 scores.
+        
+        Few postings are accumulated sparsely; many are summed into a dense
+        score array, which is cheaper than sorting them.
+        
+        Args:
+            query: Query text
+            
+        Returns:
+            Matching document numbers in ascending order, and their scores
+        """
+        slices = [slice(self.indptr[term], self.indptr[term + 1]) for term in self.query_terms(query)]
+        if not slices:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        if len(slices) == 1:
+            docs, weights = self.docs[slices[0]], self.weights[slices[0]]
+            return docs.astype(np.int64), weights.astype(np.float64)
+        
+        docs = np.concatenate([self.docs[s] for s in slices])
+        weights = np.concatenate([self.weights[s] for s in slices])
+        if len(docs) * 8 < self.size:
+            matched, inverse = np.unique(docs, return_inverse=True)
+            return matched.astype(np.int64), np.bincount(inverse, weights)
+        scores = np.bincount(docs, weights, minlength=self.size)
+        matched = np.flatnonzero(scores)
+        return matched, scores[matched]
+    
+    def search(
+        self,
+        query: str,
+        top_k_per_type: int,
+        collections: Optional[Collection[str]] = None,
+        search_filter: Optional[SearchFilter] = None
+    ) -> list[dict]:
+        """
+        Find the best BM25 matches of a query in each collection.
+        
+        Args:
+            query: Query text
+            top_k_per_type: Number of results per collection type
+            collections: Result types to search (Quran, Dua, Hadith), default all
+            search_filter: Positions each filtered collection may return
+            
+        Returns:
+            Matches with type, vector position and score, best first
+        """
+        matched, scores = self.match(query)
+        hits = []
+        for item_type, (start, count) in self.offsets.items():
+            if collections is not None and item_type not in collections:
+                continue
+            first, last = np.searchsorted(matched, (start, start + count))
+            positions, collection_scores = matched[first:last] - start, scores[first:last]
+            bitmap = search_filter.bitmaps.get(item_type) if search_filter is not None else None
+            if bitmap is not None:
+                allowed = (bitmap[positions >> 3] >> (positions & 7)) & 1 == 1
+                positions, collection_scores = positions[allowed], collection_scores[allowed]
+            if len(positions) > top_k_per_type:
+                best = np.argpartition(collection_scores, -top_k_per_type)[-top_k_per_type:]
+                positions, collection_scores = positions[best], collection_scores[best]
+            hits.extend(
+                {'type': item_type, 'position': int(position), 'score': float(score)}
+                for position, score in zip(positions, collection_scores)
+            )
+        hits.sort(key=lambda hit: hit['score'], reverse=True)
+        return hits
+
+
+# Global instance
+_lexical_index: Optional[LexicalIndex] = None
+
+
+def get_lexical_index() -> Optional[LexicalIndex]:
+    """
+    Get the lexical index, or None when search fusion is disabled.
+    
+    The index is built again whenever the vector store has changed, and
+    attached to the vector store, whose searches fuse its matches.
+    """
+    global _lexical_index
+    if settings.search_fusion == "none":
+        return None
+    vector_store = get_vector_store()
+    if _lexical_index is None or _lexical_index.version != vector_store.version:
+        db = SessionLocal()
+        try:
+            _lexical_index = LexicalIndex.load(db, vector_store)
+        finally:
+            db.close()
+        vector_store.lexical_index = _lexical_index
+    return _lexical_index
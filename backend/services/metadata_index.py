@@ -0,0 +1,227 @@
+"""Per-position metadata of the vector store collections, for filtered search."""
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Collection, Optional
+from sqlalchemy.orm import Session
+
+from db.session import SessionLocal
+from models.database import CORPUS_MODELS
+from services.vector_store import VectorStoreService, get_vector_store
+from services.search_filter import SearchFilter, pack_positions
+from services.index_storage import IdList
+from core.config import get_settings
+from core.logging import get_logger
+from core.exceptions import DatabaseException
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Result type -> column whose values a search can be filtered by
+FACET_COLUMNS = {
+    "Hadith": "book",
+    "Quran": "surah_number",
+}
+
+
+class Facet:
+    """
+    Values of one column, aligned with a collection's vector positions.
+    
+    Each distinct value keeps a precomputed position bitmap, so the
+    bitmap of a filter is the OR of a few small arrays.
+    """
+    
+    def __init__(self, values: list, bitmaps: list[np.ndarray], size: int):
+        """
+        Initialize facet.
+        
+        Args:
+            values: Distinct column values, sorted
+            bitmaps: Packed position bitmap of each value
+            size: Number of vector positions
+        """
+        self.values = values
+        self.bitmaps = bitmaps
+        self.size = size
+        self._codes = {value: code for code, value in enumerate(values)}
+    
+    def bitmap(self, values: Collection) -> np.ndarray:
+        """
+        Bitmap of the positions holding any of some values.
+        
+        Args:
+            values: Column values to match; unknown values match nothing
+            
+        Returns:
+            Packed position bitmap
+        """
+        bitmap = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        for value in values:
+            code = self._codes.get(value)
+            if code is not None:
+                np.bitwise_or(bitmap, self.bitmaps[code], out=bitmap)
+        return bitmap
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the bitmaps."""
+        return sum(bitmap.nbytes for bitmap in self.bitmaps)
+    
+    @classmethod
+    def load(cls, db: Session, model, column: str, vector_ids: IdList) -> "Facet":
+        """
+        Stream a column into bitmaps aligned with the vector store IDs.
+        
+        Args:
+            db: Database session
+            model: ORM model of the collection
+            column: Column to index
+            vector_ids: Database IDs in vector position order
+            
+        Returns:
+            Loaded facet
+        """
+        ids = vector_ids.as_array()
+        positions: dict[int, list[int]] = {}
+        for position, item_id in enumerate(ids.tolist()):
+            positions.setdefault(item_id, []).append(position)
+        
+        positions_by_value: dict = {}
+        for row_id, value in db.query(model.id, getattr(model, column)).yield_per(5000):
+            for position in positions.get(row_id, ()):
+                positions_by_value.setdefault(value, []).append(position)
+        
+        values = sorted(positions_by_value)
+        bitmaps = []
+        for value in values:
+            mask = np.zeros(len(ids), dtype=bool)
+            mask[positions_by_value[value]] = True
+            bitmaps.append(pack_positions(mask))
+        return cls(values, bitmaps, len(ids))
+
+
+class MetadataIndex:
+    """Filterable column values of the vector store collections, keyed by position."""
+    
+    # Distinct filters kept, so repeated filters reuse their bitmaps
+    FILTER_CACHE_SIZE = 256
+    
+    def __init__(self, facets: dict[str, Facet], version: int):
+        """
+        Initialize metadata index.
+        
+        Args:
+            facets: Loaded facets by result type (Quran, Hadith)
+            version: Vector store version the positions belong to
+        """
+        self.facets = facets
+        self.version = version
+        self._filters: OrderedDict[tuple, SearchFilter] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def load(cls, db: Session, vector_store: VectorStoreService) -> "MetadataIndex":
+        """
+        Load the facets of every filterable collection.
+        
+        Args:
+            db: Database session
+            vector_store: Vector store whose positions the index follows
+            
+        Returns:
+            Loaded metadata index
+        """
+        version = vector_store.version
+        try:
+            facets = {
+                item_type: Facet.load(
+                    db, CORPUS_MODELS[item_type], column, vector_store.get_ids(item_type.lower())
+                )
+                for item_type, column in FACET_COLUMNS.items()
+            }
+        except Exception as e:
+            logger.error(f"Failed to load metadata index: {e}")
+            raise DatabaseException(f"Metadata index load failed: {e}")
+        
+        for item_type, facet in facets.items():
+            logger.info(
+                f"Metadata index: {item_type} {FACET_COLUMNS[item_type]} has {len(facet.values)} values "
+                f"over {facet.size} vectors ({facet.nbytes / 1024:.1f} KB)"
+            )
+        return cls(facets, version)
+    
+    @property
+    def books(self) -> list[str]:
+        """Hadith books that can be filtered by."""
+        return list(self.facets["Hadith"].values)
+    
+    def search_filter(
+        self,
+        books: Optional[Collection[str]] = None,
+        surahs: Optional[tuple[int, int]] = None
+    ) -> Optional[SearchFilter]:
+        """
+        Get the search filter of some metadata conditions.
+        
+        Each condition only restricts its own collection: books the Hadith
+        results and surahs the Quran results.
+        
+        Args:
+            books: Hadith books to keep
+            surahs: Inclusive range of surah numbers to keep
+            
+        Returns:
+            Search filter, or None when there are no conditions
+            
+        Raises:
+            ValueError: If a book is not in the index
+        """
+        if books is not None:
+            unknown = set(books) - set(self.books)
+            if unknown:
+                raise ValueError(
+                    f"Unknown books: {', '.join(sorted(unknown))}; valid books: {', '.join(self.books)}"
+                )
+        key = (frozenset(books) if books is not None else None, surahs)
+        if key == (None, None):
+            return None
+        
+        with self._lock:
+            search_filter = self._filters.get(key)
+            if search_filter is not None:
+                self._filters.move_to_end(key)
+                return search_filter
+        
+        bitmaps = {}
+        if books is not None:
+            bitmaps["Hadith"] = self.facets["Hadith"].bitmap(books)
+        if surahs is not None:
+            first, last = surahs
+            bitmaps["Quran"] = self.facets["Quran"].bitmap(range(first, last + 1))
+        search_filter = SearchFilter(bitmaps, {item_type: self.facets[item_type].size for item_type in bitmaps})
+        
+        with self._lock:
+            # A concurrent request may have built the same filter; keep one instance
+            search_filter = self._filters.setdefault(key, search_filter)
+            self._filters.move_to_end(key)
+            if len(self._filters) > self.FILTER_CACHE_SIZE:
+                self._filters.popitem(last=False)
+        return search_filter
+
+
+# Global instance
+_metadata_index: Optional[MetadataIndex] = None
+
+
+def get_metadata_index() -> MetadataIndex:
+    """Get the metadata index, loading it again whenever the vector store has changed."""
+    global _metadata_index
+    vector_store = get_vector_store()
+    if _metadata_index is None or _metadata_index.version != vector_store.version:
+        db = SessionLocal()
+        try:
+            _metadata_index = MetadataIndex.load(db, vector_store)
+        finally:
+            db.close()
+    return _metadata_index
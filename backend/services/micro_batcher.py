@@ -0,0 +1,109 @@
+"""Dynamic micro-batching of work submitted from concurrent threads."""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class MicroBatcher:
+    """
+    Gathers items submitted concurrently and processes them as one batch.
+    
+    A worker thread waits for the first item, then keeps collecting items
+    until the window has passed since that first item or the batch is
+    full, and hands the whole batch to the process function. With a zero
+    window it only takes the items already queued, so batches form
+    naturally while the previous batch is being processed. Each caller
+    blocks until its own result is ready, so the latency added to a
+    request is bounded by the window.
+    """
+    
+    def __init__(
+        self,
+        process: Callable[[list[Any]], list[Any]],
+        window_ms: float,
+        max_batch_size: int,
+        name: str = "micro-batcher"
+    ):
+        """
+        Initialize micro-batcher and start its worker thread.
+        
+        Args:
+            process: Function mapping a list of items to a list of results in the same order
+            window_ms: How long to keep collecting after the first item of a batch
+            max_batch_size: Process a batch as soon as it has this many items
+            name: Worker thread name
+        """
+        self.process = process
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._queue: queue.Queue[tuple[Any, Future]] = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+    
+    def submit(self, item: Any) -> Any:
+        """
+        Process an item as part of the next batch.
+        
+        Args:
+            item: Input for the process function
+            
+        Returns:
+            The process function's result for this item
+        """
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future.result()
+    
+    def stats(self) -> dict:
+        """
+        Get batching counters.
+        
+        Returns:
+            Number of batches, items and the mean batch size
+        """
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0
+            }
+    
+    def _run(self) -> None:
+        """Collect and process batches until the process exits."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    # Past the deadline, still take whatever is already queued
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            items = [item for item, _ in batch]
+            try:
+                results = self.process(items)
+            except Exception as e:
+                logger.error(f"Batch of {len(items)} failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            with self._lock:
+                self.batches += 1
+                self.items += len(items)
@@ -0,0 +1,181 @@
+"""Semantic cache of guidance results for near-duplicate queries."""
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+import faiss
+import numpy as np
+
+from models.schemas import GuidanceResult
+from core.config import get_settings
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Neighbours checked per lookup, in case the closest ones were answered with other parameters
+SEARCH_NEIGHBOURS = 8
+
+
+class SemanticResponseCache:
+    """
+    LRU cache of guidance results keyed by query embedding.
+    
+    Answered queries are kept in a small inner-product FAISS index over
+    their normalized embeddings. A lookup whose cosine similarity to a
+    cached query reaches the threshold, with the same request parameters,
+    returns that query's results. Every entry belongs to one version of
+    the vector store; the cache empties itself when the version changes.
+    """
+    
+    def __init__(self, dimension: int, max_entries: int, threshold: float):
+        """
+        Initialize semantic response cache.
+        
+        Args:
+            dimension: Query embedding dimension
+            max_entries: Maximum number of cached queries
+            threshold: Minimum cosine similarity for a hit
+        """
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+        self._entries: OrderedDict[int, tuple[Hashable, list[GuidanceResult], int]] = OrderedDict()
+        self._bytes = 0
+        self._next_id = 0
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(
+        self,
+        query_embedding: np.ndarray,
+        params: Hashable,
+        version: int
+    ) -> Optional[list[GuidanceResult]]:
+        """
+        Look up the results of a previously answered, similar query.
+        
+        Args:
+            query_embedding: float32 matrix of shape (1, dimension)
+            params: Request parameters the results must have been computed with
+            version: Current vector store version
+            
+        Returns:
+            Cached results, or None on a miss
+        """
+        query = self._normalize(query_embedding)
+        with self._lock:
+            self._check_version(version)
+            if self.index.ntotal > 0:
+                similarities, entry_ids = self.index.search(query, min(SEARCH_NEIGHBOURS, self.index.ntotal))
+                for similarity, entry_id in zip(similarities[0], entry_ids[0]):
+                    if entry_id < 0 or similarity < self.threshold:
+                        break
+                    entry = self._entries[int(entry_id)]
+                    if entry[0] == params:
+                        self._entries.move_to_end(int(entry_id))
+                        self.hits += 1
+                        return list(entry[1])
+            self.misses += 1
+            return None
+    
+    def put(
+        self,
+        query_embedding: np.ndarray,
+        params: Hashable,
+        results: list[GuidanceResult],
+        version: int
+    ) -> None:
+        """
+        Cache the results of an answered query, evicting least recently used entries.
+        
+        Args:
+            query_embedding: float32 matrix of shape (1, dimension)
+            params: Request parameters the results were computed with
+            results: Guidance results
+            version: Vector store version the results were computed against
+        """
+        if self.max_entries <= 0:
+            return
+        
+        query = self._normalize(query_embedding)
+        size = query.nbytes + sum(
+            len(r.arabic_text.encode("utf-8")) + len(r.translation.encode("utf-8")) + len(r.citation)
+            for r in results
+        )
+        with self._lock:
+            self._check_version(version)
+            entry_id = self._next_id
+            self._next_id += 1
+            self.index.add_with_ids(query, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = (params, list(results), size)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries:
+                oldest_id, (_, _, oldest_size) = self._entries.popitem(last=False)
+                self.index.remove_ids(np.array([oldest_id], dtype=np.int64))
+                self._bytes -= oldest_size
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._clear()
+    
+    def stats(self) -> dict:
+        """
+        Get cache counters for sizing the cache.
+        
+        Returns:
+            Entry count, bytes, hits, misses, evictions and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+    
+    def _check_version(self, version: int) -> None:
+        """Drop entries computed against another vector store version; the lock must be held."""
+        if version != self._version:
+            if self._entries:
+                logger.info("Vector store changed, clearing semantic response cache")
+            self._clear()
+            self._version = version
+    
+    def _clear(self) -> None:
+        """Drop every entry; the lock must be held."""
+        self.index.reset()
+        self._entries.clear()
+        self._bytes = 0
+    
+    @staticmethod
+    def _normalize(query_embedding: np.ndarray) -> np.ndarray:
+        """Scale an embedding to unit length so inner product is cosine similarity."""
+        query = np.array(query_embedding, dtype=np.float32).reshape(1, -1)
+        norm = np.linalg.norm(query)
+        return query / norm if norm > 0 else query
+
+
+# Global instance
+_response_cache: Optional[SemanticResponseCache] = None
+
+
+def get_response_cache() -> Optional[SemanticResponseCache]:
+    """Get or create the semantic response cache, or None when it is disabled."""
+    global _response_cache
+    if _response_cache is None and settings.semantic_cache_size > 0:
+        _response_cache = SemanticResponseCache(
+            settings.embedding_dimension,
+            settings.semantic_cache_size,
+            settings.semantic_cache_threshold
+        )
+    return _response_cache
@@ -0,0 +1,58 @@
+"""Position bitmaps that restrict a vector search to matching rows."""
+from typing import Optional
+
+import faiss
+import numpy as np
+
+
+def pack_positions(mask: np.ndarray) -> np.ndarray:
+    """
+    Pack a boolean mask over vector positions into a FAISS bitmap.
+    
+    Args:
+        mask: bool array, True at the positions a search may return
+        
+    Returns:
+        uint8 bitmap; bit i (least significant first, as faiss.IDSelectorBitmap reads it) is position i
+    """
+    return np.packbits(mask, bitorder="little")
+
+
+class SearchFilter:
+    """
+    Vector positions a filtered search may return, one bitmap per filtered collection.
+    
+    Collections without a bitmap are searched unfiltered. Filters compare
+    by identity: MetadataIndex hands out one instance per distinct filter,
+    so identical filtered queries still share micro-batched searches.
+    """
+    
+    def __init__(self, bitmaps: dict[str, np.ndarray], sizes: dict[str, int]):
+        """
+        Initialize search filter.
+        
+        Args:
+            bitmaps: Packed position bitmaps by result type (Quran, Dua, Hadith)
+            sizes: Number of positions of each filtered collection
+        """
+        self.bitmaps = bitmaps
+        self.sizes = sizes
+        self.counts = {type_name: int(np.unpackbits(bitmap).sum()) for type_name, bitmap in bitmaps.items()}
+    
+    def positions(self, type_name: str) -> Optional[np.ndarray]:
+        """Matching positions of a collection in ascending order, or None if it is unfiltered."""
+        bitmap = self.bitmaps.get(type_name)
+        if bitmap is None:
+            return None
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.sizes[type_name], bitorder="little"))
+    
+    def selector(self, type_name: str) -> Optional[faiss.IDSelector]:
+        """
+        FAISS selector of a collection's matching positions, or None if it is unfiltered.
+        
+        The selector reads the bitmap in place, so this filter must outlive the search.
+        """
+        bitmap = self.bitmaps.get(type_name)
+        if bitmap is None:
+            return None
+        return faiss.IDSelectorBitmap(self.sizes[type_name], faiss.swig_ptr(bitmap))
@@ -0,0 +1,84 @@
+"""Collections and record normalization of the sunnah.com hadith dataset."""
+import html
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+# Hadith collections of the dataset
+COLLECTIONS = [
+    {"name": "bukhari", "display": "Sahih Bukhari", "books": 97},
+    {"name": "muslim", "display": "Sahih Muslim", "books": 56},
+    {"name": "abudawud", "display": "Sunan Abu Dawud", "books": 43},
+    {"name": "tirmidhi", "display": "Jami' at-Tirmidhi", "books": 49},
+    {"name": "nasai", "display": "Sunan an-Nasa'i", "books": 51},
+    {"name": "ibnmajah", "display": "Sunan Ibn Majah", "books": 37},
+    {"name": "malik", "display": "Muwatta Malik", "books": 61},
+    {"name": "riyadussalihin", "display": "Riyad as-Salihin", "books": 19},
+    {"name": "nawawi40", "display": "40 Hadith Nawawi", "books": 1},
+    {"name": "qudsi40", "display": "40 Hadith Qudsi", "books": 1},
+    {"name": "bulugh", "display": "Bulugh al-Maram", "books": 16},
+]
+
+# Longest text stored per field
+MAX_TEXT_LENGTH = 5000
+
+_TAG = re.compile(r"<[^>]+>")
+_SPACE = re.compile(r"\s+")
+_BOOK_SUFFIX = re.compile(r"\d+$")
+
+
+def clean_text(text: str) -> str:
+    """
+    Strip HTML tags and entities and collapse whitespace.
+    
+    Args:
+        text: Raw text from the dataset
+        
+    Returns:
+        Plain text
+    """
+    return _SPACE.sub(" ", html.unescape(_TAG.sub(" ", text))).strip()
+
+
+def hadith_row(hadith_data: Dict, display_name: str) -> Optional[Dict]:
+    """
+    Convert a dataset record to Hadith column values.
+    
+    Args:
+        hadith_data: Record with hadithNumber, hadithArabic and hadithEnglish
+        display_name: Collection name used for book and citation
+        
+    Returns:
+        Row values, or None if the record lacks the Arabic or English text
+    """
+    arabic_text = clean_text(hadith_data.get('hadithArabic') or '')
+    english_text = clean_text(hadith_data.get('hadithEnglish') or '')
+    if not english_text or not arabic_text:
+        return None
+    
+    hadith_number = str(hadith_data.get('hadithNumber', '')).strip()
+    return {
+        "book": display_name,
+        "hadith_number": hadith_number,
+        "arabic_text": arabic_text[:MAX_TEXT_LENGTH],
+        "translation": english_text[:MAX_TEXT_LENGTH],
+        "citation": f"{display_name} {hadith_number}"
+    }
+
+
+def collection_for_file(path: Path) -> Dict:
+    """
+    Identify the collection of a dataset file such as bukhari.json or bukhari12.json.
+    
+    Args:
+        path: JSON file, named after the collection or placed in a directory that is
+        
+    Returns:
+        Collection entry; unknown names get a display name derived from the file name
+    """
+    for name in (_BOOK_SUFFIX.sub("", path.stem), path.parent.name):
+        for collection in COLLECTIONS:
+            if collection["name"] == name.lower():
+                return collection
+    name = _BOOK_SUFFIX.sub("", path.stem)
+    return {"name": name, "display": name.replace("_", " ").title(), "books": 0}
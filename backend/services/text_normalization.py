@@ -0,0 +1,73 @@
+"""Text normalization shared by the lexical search indexes."""
+import re
+import unicodedata
+
+# Harakat, Quranic annotation marks, superscript alef and tatweel are dropped
+_ARABIC_DROPPED = (
+    [chr(code) for code in range(0x0610, 0x061B)]
+    + [chr(code) for code in range(0x064B, 0x0660)]
+    + ["ٰ", "ـ"]
+    + [chr(code) for code in range(0x06D6, 0x06EE)]
+)
+
+# Letter variants written interchangeably are folded into one form
+_ARABIC_FOLDED = {
+    "آ": "ا",  # alef with madda
+    "أ": "ا",  # alef with hamza above
+    "إ": "ا",  # alef with hamza below
+    "ٱ": "ا",  # alef wasla
+    "ى": "ي",  # alef maqsura
+    "ئ": "ي",  # ya with hamza above
+    "ی": "ي",  # farsi ya
+    "ة": "ه",  # ta marbuta
+}
+
+_ARABIC_TABLE = str.maketrans({**dict.fromkeys(_ARABIC_DROPPED), **_ARABIC_FOLDED})
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_arabic(text: str) -> str:
+    """
+    Normalize Arabic text so that spelling variants compare equal.
+    
+    Harakat and other diacritics, Quranic annotation marks and tatweel are
+    removed, and alef, ya and ta marbuta variants are unified. Other
+    characters are left as they are.
+    
+    Args:
+        text: Text, with or without tashkeel
+        
+    Returns:
+        Normalized text
+    """
+    return unicodedata.normalize("NFKC", text).translate(_ARABIC_TABLE)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into case-folded word tokens, with Arabic normalized.
+    
+    Args:
+        text: English or Arabic text
+        
+    Returns:
+        Tokens in text order
+    """
+    return _TOKEN_PATTERN.findall(normalize_arabic(text).casefold())
+
+
+def normalize_fragment(text: str) -> str:
+    """
+    Normalize a text for substring search.
+    
+    The tokens of the text are joined by single spaces, so fragments match
+    regardless of tashkeel, letter variants, punctuation and spacing.
+    
+    Args:
+        text: English or Arabic text
+        
+    Returns:
+        Normalized text
+    """
+    return " ".join(tokenize(text))
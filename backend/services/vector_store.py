@@ -3,39 +3,138 @@ import faiss
 import numpy as np
 import pickle
 import os
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import Collection, Iterator, Optional
 from sentence_transformers import SentenceTransformer
 
 from core.config import get_settings
 from core.logging import get_logger
 from core.exceptions import VectorStoreException, EmbeddingException
+from services.embedding_cache import QueryEmbeddingCache, DocumentEmbeddingCache
+from services.micro_batcher import MicroBatcher
+from services.bulk_ingest import BulkIngestSession
+from services.search_filter import SearchFilter
+from services.index_storage import SegmentedIndexStorage, IdList, VectorRows, COLLECTION_NAMES
+from services.index_factory import (
+    build_index,
+    configure_search,
+    configured_encoding,
+    configured_index_type,
+    encoding_of,
+    index_type_of,
+    needs_rebuild,
+    new_index,
+    search_parameters
+)
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 
+def _nearest(
+    query_embeddings: np.ndarray,
+    vectors: np.ndarray,
+    positions: np.ndarray,
+    k: int
+) -> list[tuple[np.ndarray, np.ndarray]]:
+    """Exact squared L2 distances and positions of the k vectors nearest to each query."""
+    distances = (
+        (query_embeddings ** 2).sum(axis=1)[:, np.newaxis]
+        - 2 * query_embeddings @ vectors.T
+        + (vectors ** 2).sum(axis=1)[np.newaxis, :]
+    )
+    nearest = []
+    for row in distances:
+        top = np.argpartition(row, k - 1)[:k] if k < len(row) else np.arange(len(row))
+        order = top[np.argsort(row[top])]
+        nearest.append((row[order], positions[order]))
+    return nearest
+
+
 class VectorStoreService:
     """Service for managing vector embeddings and similarity search."""
     
-    def __init__(self):
-        """Initialize vector store service."""
+    def __init__(self, persist_dir: Optional[str] = None):
+        """
+        Initialize vector store service.
+        
+        Args:
+            persist_dir: Directory of the indexes, default VECTOR_STORE_PERSIST_DIR
+        """
         try:
-            self.model = SentenceTransformer(settings.embedding_model)
+            self.model = SentenceTransformer(settings.embedding_model, revision=settings.embedding_model_revision)
             self.dimension = settings.embedding_dimension
             
             # Initialize FAISS indexes
-            self.quran_index = faiss.IndexFlatL2(self.dimension)
-            self.dua_index = faiss.IndexFlatL2(self.dimension)
-            self.hadith_index = faiss.IndexFlatL2(self.dimension)
+            self.quran_index = self._new_index("quran")
+            self.dua_index = self._new_index("dua")
+            self.hadith_index = self._new_index("hadith")
             
             # Store metadata
-            self.quran_ids: list[str] = []
-            self.dua_ids: list[str] = []
-            self.hadith_ids: list[str] = []
+            self.quran_ids = IdList()
+            self.dua_ids = IdList()
+            self.hadith_ids = IdList()
+            
+            # Full-precision vectors for re-ranking, kept only for compressed collections
+            self.quran_vectors: Optional[VectorRows] = None
+            self.dua_vectors: Optional[VectorRows] = None
+            self.hadith_vectors: Optional[VectorRows] = None
+            
+            # Bumped whenever indexed content changes, to invalidate cached results
+            self.version = 0
+            self._refresh_lock = threading.Lock()
+            
+            # Collections whose automatic compaction is held off, with the number of holders
+            self._deferred_compactions: dict[str, int] = {}
+            
+            # BM25 index fused into searches, attached by services.lexical_index
+            self.lexical_index = None
+            
+            # Cache of query embeddings, keyed by normalized query text
+            self.query_cache: Optional[QueryEmbeddingCache] = None
+            if settings.query_embedding_cache_size > 0:
+                self.query_cache = QueryEmbeddingCache(
+                    settings.query_embedding_cache_size,
+                    settings.query_embedding_cache_max_bytes,
+                    settings.query_embedding_cache_ttl_seconds
+                )
+            
+            # Micro-batch the encodes and searches of concurrent queries
+            self.encode_batcher: Optional[MicroBatcher] = None
+            self.search_batcher: Optional[MicroBatcher] = None
+            if settings.micro_batch_window_ms > 0:
+                self.encode_batcher = MicroBatcher(
+                    self._encode_batch,
+                    settings.micro_batch_window_ms,
+                    settings.micro_batch_max_size,
+                    name="encode-batcher"
+                )
+                # Queries leave the encode batcher together, so searches need no window
+                self.search_batcher = MicroBatcher(
+                    self._search_batch,
+                    0,
+                    settings.micro_batch_max_size,
+                    name="search-batcher"
+                )
             
             # Setup persistence
-            self.persist_dir = settings.vector_store_persist_dir
-            os.makedirs(self.persist_dir, exist_ok=True)
+            self.persist_dir = persist_dir or settings.vector_store_persist_dir
+            self.read_only = settings.vector_store_read_only
+            if not self.read_only:
+                os.makedirs(self.persist_dir, exist_ok=True)
+            self.storage = SegmentedIndexStorage(self.persist_dir, COLLECTION_NAMES)
+            
+            # Embeddings of indexed texts by content hash, so re-imports skip the model
+            self.embedding_cache: Optional[DocumentEmbeddingCache] = None
+            if settings.document_embedding_cache_dir and not self.read_only:
+                self.embedding_cache = DocumentEmbeddingCache(
+                    settings.document_embedding_cache_dir,
+                    self.dimension,
+                    settings.embedding_model,
+                    settings.embedding_model_revision or "default",
+                    f"max_seq_length={getattr(self.model, 'max_seq_length', None)}"
+                )
             
             # Load existing indexes
             self._load_indexes()
@@ -45,47 +144,106 @@ class VectorStoreService:
             logger.error(f"Failed to initialize vector store: {e}")
             raise VectorStoreException(f"Vector store initialization failed: {e}")
     
+    def _new_index(self, name: str) -> faiss.Index:
+        """Create an empty index of the collection's configured type and encoding."""
+        return new_index(configured_index_type(name), configured_encoding(name), self.dimension)
+    
+    def _load_rerank_vectors(self, name: str) -> None:
+        """Attach the full-precision vectors of a collection if its index is compressed."""
+        vectors = None
+        if settings.vector_rerank_factor > 0 and encoding_of(getattr(self, f"{name}_index")) != "float32":
+            vectors = self.storage.load_vectors(name, self.dimension)
+        setattr(self, f"{name}_vectors", vectors)
+    
     def _load_indexes(self) -> None:
         """Load indexes from disk if they exist."""
-        try:
-            collections = [
-                ("quran", self.quran_index, self.quran_ids),
-                ("dua", self.dua_index, self.dua_ids),
-                ("hadith", self.hadith_index, self.hadith_ids)
-            ]
+        if not self.storage.exists():
+            self._migrate_legacy_indexes()
+            return
+        
+        for name in COLLECTION_NAMES:
+            index, ids = self.storage.load(
+                name,
+                lambda: self._new_index(name),
+                mmap=self.read_only
+            )
+            setattr(self, f"{name}_index", configure_search(index))
+            setattr(self, f"{name}_ids", ids)
+            self._load_rerank_vectors(name)
+            logger.info(
+                f"Loaded {name} {index_type_of(index)}/{encoding_of(index)} index with {len(ids)} entries"
+            )
+    
+    def refresh(self) -> bool:
+        """
+        Reload the indexes if another process committed changes to them.
+        
+        Imports, reindexes and compactions run by the scripts write the
+        manifest from their own process; reloading bumps the version, so
+        the document store, lexical, metadata and Arabic indexes and the
+        response cache follow. If the reload fails, e.g. because a
+        compaction removed the files it was reading, the indexes already
+        loaded keep being served and the next call tries again.
+        
+        Returns:
+            Whether the indexes were reloaded
+        """
+        if not self.storage.changed_on_disk():
+            return False
+        
+        with self._refresh_lock:
+            if not self.storage.changed_on_disk():
+                return False
+            try:
+                storage = SegmentedIndexStorage(self.persist_dir, COLLECTION_NAMES)
+                loaded = {
+                    name: storage.load(name, lambda: self._new_index(name), mmap=self.read_only)
+                    for name in COLLECTION_NAMES
+                }
+            except Exception as e:
+                logger.warning(f"Indexes changed on disk but could not be reloaded yet: {e}")
+                return False
             
-            for name, index_attr, ids_list in collections:
+            self.storage = storage
+            for name, (index, ids) in loaded.items():
+                setattr(self, f"{name}_index", configure_search(index))
+                setattr(self, f"{name}_ids", ids)
+                self._load_rerank_vectors(name)
+            self.version += 1
+            logger.info(
+                "Reloaded indexes changed on disk: "
+                + ", ".join(f"{name} {len(ids)} entries" for name, (_, ids) in loaded.items())
+            )
+            return True
+    
+    def _migrate_legacy_indexes(self) -> None:
+        """Load pre-segmented {name}.index / {name}_ids.pkl files and rewrite them as a base."""
+        try:
+            migrated = []
+            for name in COLLECTION_NAMES:
                 index_path = f"{self.persist_dir}/{name}.index"
                 ids_path = f"{self.persist_dir}/{name}_ids.pkl"
                 
                 if os.path.exists(index_path) and os.path.exists(ids_path):
                     setattr(self, f"{name}_index", faiss.read_index(index_path))
                     with open(ids_path, 'rb') as f:
-                        loaded_ids = pickle.load(f)
-                        ids_list.clear()
-                        ids_list.extend(loaded_ids)
-                    logger.info(f"Loaded {name} index with {len(loaded_ids)} entries")
+                        legacy_ids = [int(item_id) for item_id in pickle.load(f)]
+                    setattr(self, f"{name}_ids", IdList(np.array(legacy_ids, dtype=np.int64)))
+                    migrated.append(name)
+                    logger.info(f"Loaded legacy {name} index with {len(self.get_ids(name))} entries")
         except Exception as e:
             logger.warning(f"Could not load indexes: {e}")
+            return
     
-    def _save_indexes(self) -> None:
-        """Save indexes to disk."""
-        try:
-            collections = [
-                ("quran", self.quran_index, self.quran_ids),
-                ("dua", self.dua_index, self.dua_ids),
-                ("hadith", self.hadith_index, self.hadith_ids)
-            ]
-            
-            for name, index, ids in collections:
-                faiss.write_index(index, f"{self.persist_dir}/{name}.index")
-                with open(f"{self.persist_dir}/{name}_ids.pkl", 'wb') as f:
-                    pickle.dump(ids, f)
-            
-            logger.info("Indexes saved successfully")
-        except Exception as e:
-            logger.error(f"Failed to save indexes: {e}")
-            raise VectorStoreException(f"Failed to save indexes: {e}")
+        if migrated and not self.read_only:
+            # Legacy indexes are flat, so their vectors can be reconstructed exactly
+            for name in COLLECTION_NAMES:
+                index = getattr(self, f"{name}_index")
+                vectors = np.empty((0, self.dimension), dtype=np.float32)
+                if index.ntotal > 0:
+                    vectors = index.reconstruct_n(0, index.ntotal)
+                self._compact(name, vectors)
+            logger.info(f"Migrated {', '.join(migrated)} indexes to segmented storage")
     
     def add_texts(
         self,
@@ -102,80 +260,710 @@ class VectorStoreService:
             collection_name: Name of collection (quran, dua, hadith)
         """
         try:
+            self._check_writable()
+            
             if len(texts) != len(ids):
                 raise ValueError("Texts and IDs must have the same length")
             
-            embeddings = self.model.encode(texts)
-            embeddings = np.array(embeddings).astype('float32')
-            
-            if collection_name == "quran":
-                self.quran_index.add(embeddings)
-                self.quran_ids.extend(ids)
-            elif collection_name == "dua":
-                self.dua_index.add(embeddings)
-                self.dua_ids.extend(ids)
-            elif collection_name == "hadith":
-                self.hadith_index.add(embeddings)
-                self.hadith_ids.extend(ids)
-            else:
-                raise ValueError(f"Invalid collection name: {collection_name}")
-            
-            self._save_indexes()
-            logger.info(f"Added {len(texts)} texts to {collection_name} collection")
+            self.add_embeddings(self.encode_texts(texts), ids, collection_name)
+        except EmbeddingException:
+            raise
         except Exception as e:
             logger.error(f"Failed to add texts: {e}")
             raise EmbeddingException(f"Failed to add texts: {e}")
     
+    def encode_texts(self, texts: list[str]) -> np.ndarray:
+        """
+        Embed document texts, reusing cached embeddings of unchanged texts.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            float32 matrix with one row per text
+        """
+        if self.embedding_cache is None:
+            return np.array(self.model.encode(texts)).astype('float32')
+        
+        embeddings, missing = self.embedding_cache.get_many(texts)
+        if missing:
+            missing_texts = [texts[position] for position in missing]
+            encoded = np.array(self.model.encode(missing_texts)).astype('float32')
+            embeddings[missing] = encoded
+            self.embedding_cache.put_many(missing_texts, encoded)
+        return embeddings
+    
+    def add_embeddings(
+        self,
+        embeddings: np.ndarray,
+        ids: list[str],
+        collection_name: str
+    ) -> None:
+        """
+        Add precomputed embeddings to the specified collection.
+        
+        Args:
+            embeddings: float32 matrix with one row per ID
+            ids: List of corresponding IDs
+            collection_name: Name of collection (quran, dua, hadith)
+        """
+        try:
+            self._check_writable()
+            
+            if len(embeddings) != len(ids):
+                raise ValueError("Embeddings and IDs must have the same length")
+            
+            if collection_name not in COLLECTION_NAMES:
+                raise ValueError(f"Invalid collection name: {collection_name}")
+            
+            embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+            
+            # Persist the new segment first so memory never runs ahead of disk
+            self.storage.append(collection_name, embeddings, ids)
+            getattr(self, f"{collection_name}_index").add(embeddings)
+            getattr(self, f"{collection_name}_ids").extend(ids)
+            rerank_vectors = getattr(self, f"{collection_name}_vectors")
+            if rerank_vectors is not None:
+                rerank_vectors.append(embeddings)
+            self.version += 1
+            
+            if (
+                self.storage.segment_count(collection_name) >= settings.vector_store_max_segments
+                and not self._deferred_compactions.get(collection_name)
+            ):
+                self.compact(collection_name)
+            
+            logger.info(f"Added {len(ids)} texts to {collection_name} collection")
+        except Exception as e:
+            logger.error(f"Failed to add embeddings: {e}")
+            raise EmbeddingException(f"Failed to add embeddings: {e}")
+    
+    @contextmanager
+    def bulk_ingest(self, collection_name: str) -> Iterator[BulkIngestSession]:
+        """
+        Stage vectors for a collection and add them all at once.
+        
+        The session buffers every vector added to it. On a clean exit they
+        are added to the index and persisted as one segment; if the block
+        raises they are discarded and the collection is left untouched, so
+        a rolled-back database transaction leaves no orphan vectors.
+        
+            with vector_store.bulk_ingest("dua") as session:
+                session.add_texts(texts, ids)
+                db.commit()
+                
+        Args:
+            collection_name: Name of collection (quran, dua, hadith)
+            
+        Yields:
+            Session to add texts or embeddings to
+        """
+        self._check_writable()
+        if collection_name not in COLLECTION_NAMES:
+            raise VectorStoreException(f"Invalid collection name: {collection_name}")
+        
+        session = BulkIngestSession(
+            collection_name,
+            self.dimension,
+            self.encode_texts,
+            settings.vector_store_bulk_buffer_rows
+        )
+        try:
+            yield session
+        except BaseException:
+            logger.warning(f"Discarded {len(session)} staged {collection_name} vectors")
+            session.discard()
+            raise
+        
+        if len(session):
+            self.add_embeddings(session.embeddings, session.ids, collection_name)
+        session.discard()
+    
+    @contextmanager
+    def deferred_compaction(self, collection_name: str) -> Iterator[None]:
+        """
+        Hold off automatic compaction of a collection while a block adds to it.
+        
+        Each compaction rewrites the collection's whole base, so compacting
+        every VECTOR_STORE_MAX_SEGMENTS appends makes the bytes written by a
+        long import quadratic in its size. Inside the block segments
+        accumulate instead; the caller compacts once at the end, or the
+        next append outside the block does.
+        
+            with vector_store.deferred_compaction("hadith"):
+                for embeddings, ids in batches:
+                    vector_store.add_embeddings(embeddings, ids, "hadith")
+                vector_store.compact("hadith")
+                
+        Args:
+            collection_name: Name of collection (quran, dua, hadith)
+        """
+        self._deferred_compactions[collection_name] = self._deferred_compactions.get(collection_name, 0) + 1
+        try:
+            yield
+        finally:
+            self._deferred_compactions[collection_name] -= 1
+    
+    def compact(self, collection_name: Optional[str] = None) -> None:
+        """
+        Merge the on-disk segments of a collection into one base index.
+        
+        Args:
+            collection_name: Collection to compact, or None for all of them
+        """
+        self._check_writable()
+        
+        try:
+            names = COLLECTION_NAMES if collection_name is None else (collection_name,)
+            for name in names:
+                self._compact(name)
+        except Exception as e:
+            logger.error(f"Failed to compact indexes: {e}")
+            raise VectorStoreException(f"Failed to compact indexes: {e}")
+    
+    def clear(self, collection_name: str) -> None:
+        """
+        Remove every vector of a collection.
+        
+        Args:
+            collection_name: Name of collection (quran, dua, hadith)
+        """
+        self._check_writable()
+        if collection_name not in COLLECTION_NAMES:
+            raise VectorStoreException(f"Invalid collection name: {collection_name}")
+        
+        try:
+            index = self._new_index(collection_name)
+            ids = IdList()
+            self.storage.compact(collection_name, index, ids, np.empty((0, self.dimension), dtype='float32'))
+            setattr(self, f"{collection_name}_index", index)
+            setattr(self, f"{collection_name}_ids", ids)
+            self._load_rerank_vectors(collection_name)
+            self.version += 1
+            logger.info(f"Cleared {collection_name} collection")
+        except Exception as e:
+            logger.error(f"Failed to clear {collection_name}: {e}")
+            raise VectorStoreException(f"Failed to clear {collection_name}: {e}")
+    
+    def copy_collection(self, collection_name: str, source_dir: str) -> None:
+        """
+        Replace a collection with the committed vectors of another persist directory.
+        
+        The source's base and segments are compacted into one base here,
+        rebuilt if the configured index type or encoding differs; the
+        source is only read.
+        
+        Args:
+            collection_name: Name of collection (quran, dua, hadith)
+            source_dir: Persist directory to copy from
+        """
+        self._check_writable()
+        if collection_name not in COLLECTION_NAMES:
+            raise VectorStoreException(f"Invalid collection name: {collection_name}")
+        
+        source = SegmentedIndexStorage(source_dir, COLLECTION_NAMES)
+        if not source.exists():
+            raise VectorStoreException(f"No committed indexes in {source_dir}")
+        
+        try:
+            index, ids = source.load(collection_name, lambda: self._new_index(collection_name))
+            if index.d != self.dimension:
+                raise VectorStoreException(
+                    f"{collection_name} vectors in {source_dir} have dimension {index.d}, not {self.dimension}"
+                )
+            vectors = source.read_vectors(collection_name, self.dimension)
+            setattr(self, f"{collection_name}_index", configure_search(index))
+            setattr(self, f"{collection_name}_ids", ids)
+            self._compact(collection_name, vectors)
+            logger.info(f"Copied {collection_name} collection ({len(ids)} entries) from {source_dir}")
+        except Exception as e:
+            logger.error(f"Failed to copy {collection_name} from {source_dir}: {e}")
+            raise VectorStoreException(f"Failed to copy {collection_name} from {source_dir}: {e}")
+    
+    def remove_ids(self, collection_name: str, ids: list[str]) -> int:
+        """
+        Remove the vectors of some IDs from a collection.
+        
+        The remaining vectors are read back from storage and rebuilt into
+        a compacted index of the configured type, so nothing is re-embedded.
+        
+        Args:
+            collection_name: Name of collection (quran, dua, hadith)
+            ids: IDs to remove; every vector of an ID listed more than once is removed
+            
+        Returns:
+            Number of vectors removed
+        """
+        self._check_writable()
+        if collection_name not in COLLECTION_NAMES:
+            raise VectorStoreException(f"Invalid collection name: {collection_name}")
+        
+        try:
+            current = self.get_ids(collection_name).as_array()
+            keep = ~np.isin(current, np.array([int(item_id) for item_id in ids], dtype=np.int64))
+            removed = int(len(current) - keep.sum())
+            if not removed:
+                return 0
+            
+            vectors = self.storage.read_vectors(collection_name, self.dimension)[keep]
+            index = build_index(configured_index_type(collection_name), configured_encoding(collection_name), vectors)
+            setattr(self, f"{collection_name}_index", configure_search(index))
+            setattr(self, f"{collection_name}_ids", IdList(current[keep]))
+            self.storage.compact(collection_name, index, self.get_ids(collection_name), vectors)
+            self._load_rerank_vectors(collection_name)
+            self.version += 1
+            logger.info(f"Removed {removed} vectors from {collection_name} collection")
+            return removed
+        except Exception as e:
+            logger.error(f"Failed to remove vectors from {collection_name}: {e}")
+            raise VectorStoreException(f"Failed to remove vectors from {collection_name}: {e}")
+    
+    def _compact(self, name: str, vectors: Optional[np.ndarray] = None) -> None:
+        """
+        Compact one collection, rebuilding its index if the configured type or encoding changed.
+        
+        Args:
+            name: Collection name
+            vectors: Full-precision vectors, read from storage when needed if not given
+        """
+        index = getattr(self, f"{name}_index")
+        index_type = configured_index_type(name)
+        encoding = configured_encoding(name)
+        
+        if needs_rebuild(index, index_type, encoding):
+            if vectors is None:
+                vectors = self.storage.read_vectors(name, self.dimension)
+            index = build_index(index_type, encoding, vectors)
+            setattr(self, f"{name}_index", index)
+            logger.info(
+                f"Rebuilt {name} index as {index_type_of(index)}/{encoding_of(index)} ({index.ntotal} entries)"
+            )
+        
+        self.storage.compact(name, index, self.get_ids(name), vectors)
+        self._load_rerank_vectors(name)
+        self.version += 1
+    
+    def _check_writable(self) -> None:
+        """Reject writes when serving memory-mapped, read-only indexes."""
+        if self.read_only:
+            raise VectorStoreException("Vector store is read-only (VECTOR_STORE_READ_ONLY is set)")
+    
+    def get_ids(self, collection_name: str) -> IdList:
+        """
+        Get the database IDs of a collection in vector position order.
+        
+        Args:
+            collection_name: Name of collection (quran, dua, hadith)
+            
+        Returns:
+            List of IDs where entry i belongs to vector i
+        """
+        if collection_name not in COLLECTION_NAMES:
+            raise VectorStoreException(f"Invalid collection name: {collection_name}")
+        return getattr(self, f"{collection_name}_ids")
+    
+    def encode_query(self, query: str) -> np.ndarray:
+        """
+        Embed a search query, serving repeated queries from the cache.
+        
+        Args:
+            query: Search query text
+            
+        Returns:
+            float32 matrix of shape (1, dimension)
+        """
+        if self.query_cache is not None:
+            cached = self.query_cache.get(query)
+            if cached is not None:
+                return cached
+        
+        if self.encode_batcher is not None:
+            query_embedding = self.encode_batcher.submit(query)
+        else:
+            query_embedding = np.array(self.model.encode([query])).astype('float32')
+        if self.query_cache is not None:
+            self.query_cache.put(query, query_embedding)
+        return query_embedding
+    
+    def encode_queries(self, queries: list[str]) -> np.ndarray:
+        """
+        Embed several search queries in one forward pass, serving repeated queries from the cache.
+        
+        Args:
+            queries: Search query texts
+            
+        Returns:
+            float32 matrix of shape (len(queries), dimension)
+        """
+        query_embeddings = np.empty((len(queries), self.dimension), dtype=np.float32)
+        missing = []
+        for position, query in enumerate(queries):
+            cached = self.query_cache.get(query) if self.query_cache is not None else None
+            if cached is not None:
+                query_embeddings[position] = cached[0]
+            else:
+                missing.append(position)
+        
+        if missing:
+            unique = list(dict.fromkeys(queries[position] for position in missing))
+            encoded = np.array(self.model.encode(unique)).astype('float32')
+            rows = dict(zip(unique, encoded))
+            for position in missing:
+                query_embeddings[position] = rows[queries[position]]
+            if self.query_cache is not None:
+                for query, row in rows.items():
+                    self.query_cache.put(query, row[np.newaxis])
+        return query_embeddings
+    
     def search_all(
         self,
         query: str,
-        top_k_per_type: Optional[int] = None
+        top_k_per_type: Optional[int] = None,
+        collections: Optional[Collection[str]] = None,
+        max_results: Optional[int] = None,
+        search_filter: Optional[SearchFilter] = None
     ) -> list[dict]:
         """
-        Search across all collections.
+        Search across all collections, or the requested ones.
         
         Args:
             query: Search query text
             top_k_per_type: Number of results per collection type
+            collections: Result types to search (Quran, Dua, Hadith), default all
+            max_results: Number of results returned, default MAX_RESULTS
+            search_filter: Positions each filtered collection may return
             
         Returns:
-            List of search results with type, id, and distance
+            List of search results with type, id, vector position, and distance
         """
         try:
-            if top_k_per_type is None:
-                top_k_per_type = settings.default_top_k_per_type
-            
-            query_embedding = self.model.encode([query])
-            query_embedding = np.array(query_embedding).astype('float32')
-            
-            all_results = []
+            query_embedding = self.encode_query(query)
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise VectorStoreException(f"Search failed: {e}")
+        return self.search_embedding(
+            query_embedding,
+            top_k_per_type,
+            collections,
+            max_results,
+            search_filter,
+            query
+        )
+    
+    def search_embedding(
+        self,
+        query_embedding: np.ndarray,
+        top_k_per_type: Optional[int] = None,
+        collections: Optional[Collection[str]] = None,
+        max_results: Optional[int] = None,
+        search_filter: Optional[SearchFilter] = None,
+        query: Optional[str] = None
+    ) -> list[dict]:
+        """
+        Search across all collections, or the requested ones, with an already encoded query.
+        
+        Args:
+            query_embedding: float32 matrix of shape (1, dimension)
+            top_k_per_type: Number of results per collection type
+            collections: Result types to search (Quran, Dua, Hadith), default all
+            max_results: Number of results returned, default MAX_RESULTS
+            search_filter: Positions each filtered collection may return
+            query: Query text, whose lexical matches are fused into the results
             
-            # Search each collection
-            collections = [
-                ("Quran", self.quran_index, self.quran_ids),
-                ("Dua", self.dua_index, self.dua_ids),
-                ("Hadith", self.hadith_index, self.hadith_ids)
-            ]
+        Returns:
+            List of search results with type, id, vector position, and distance
+        """
+        if top_k_per_type is None:
+            top_k_per_type = settings.default_top_k_per_type
+        collections = frozenset(collections) if collections is not None else None
             
-            for type_name, index, ids in collections:
-                if index.ntotal > 0:
-                    k = min(top_k_per_type, index.ntotal)
-                    distances, indices = index.search(query_embedding, k)
-                    
-                    for i, idx in enumerate(indices[0]):
-                        all_results.append({
-                            'type': type_name,
-                            'id': ids[idx],
-                            'distance': float(distances[0][i])
-                        })
+        try:
+            lexical_hits = self._lexical_hits(query, top_k_per_type, collections, search_filter)
+            if self.search_batcher is not None:
+                return self.search_batcher.submit(
+                    (query_embedding, lexical_hits, top_k_per_type, collections, max_results, search_filter)
+                )
+            return self.search_embeddings(
+                query_embedding,
+                top_k_per_type,
+                collections,
+                max_results,
+                search_filter,
+                [lexical_hits]
+            )[0]
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise VectorStoreException(f"Search failed: {e}")
+    
+    def search_embedding_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k_per_type: Optional[int] = None,
+        collections: Optional[Collection[str]] = None,
+        max_results: Optional[int] = None,
+        search_filter: Optional[SearchFilter] = None,
+        queries: Optional[list[str]] = None
+    ) -> list[list[dict]]:
+        """
+        Search with a matrix of queries, one index search per searched collection.
+        
+        Args:
+            query_embeddings: float32 matrix of shape (n, dimension)
+            top_k_per_type: Number of results per collection type
+            collections: Result types to search (Quran, Dua, Hadith), default all
+            max_results: Number of results returned per query, default MAX_RESULTS
+            search_filter: Positions each filtered collection may return
+            queries: Query texts, whose lexical matches are fused into the results
             
-            # Sort by distance and limit results
-            all_results.sort(key=lambda x: x['distance'])
-            return all_results[:settings.max_results]
+        Returns:
+            For each query, its search results with type, id, vector position, and distance
+        """
+        if top_k_per_type is None:
+            top_k_per_type = settings.default_top_k_per_type
         
+        try:
+            lexical_hits = None
+            if queries is not None:
+                lexical_hits = [
+                    self._lexical_hits(query, top_k_per_type, collections, search_filter)
+                    for query in queries
+                ]
+            return self.search_embeddings(
+                query_embeddings,
+                top_k_per_type,
+                collections,
+                max_results,
+                search_filter,
+                lexical_hits
+            )
         except Exception as e:
             logger.error(f"Search failed: {e}")
             raise VectorStoreException(f"Search failed: {e}")
+    
+    def search_embeddings(
+        self,
+        query_embeddings: np.ndarray,
+        top_k_per_type: int,
+        collections: Optional[Collection[str]] = None,
+        max_results: Optional[int] = None,
+        search_filter: Optional[SearchFilter] = None,
+        lexical_hits: Optional[list[Optional[list[dict]]]] = None
+    ) -> list[list[dict]]:
+        """
+        Search with a matrix of queries at once.
+        
+        Collections that were not requested are not searched at all. A
+        filter is applied inside the FAISS scan, so the k nearest matching
+        vectors are found without over-fetching; when few enough vectors of
+        a compressed collection match, they are compared exactly instead.
+        
+        Args:
+            query_embeddings: float32 matrix of shape (n, dimension)
+            top_k_per_type: Number of results per collection type
+            collections: Result types to search (Quran, Dua, Hadith), default all
+            max_results: Number of results returned per query, default MAX_RESULTS
+            search_filter: Positions each filtered collection may return
+            lexical_hits: For each query, its lexical matches to fuse in (see _fuse), or None
+            
+        Returns:
+            For each query, its search results with type, id, vector position, and distance
+        """
+        if max_results is None:
+            max_results = settings.max_results
+        all_results = [[] for _ in range(len(query_embeddings))]
+            
+        # Search each requested collection
+        searched = [
+            ("Quran", self.quran_index, self.quran_ids, self.quran_vectors),
+            ("Dua", self.dua_index, self.dua_ids, self.dua_vectors),
+            ("Hadith", self.hadith_index, self.hadith_ids, self.hadith_vectors)
+        ]
+        if collections is not None:
+            searched = [collection for collection in searched if collection[0] in collections]
+            
+        for type_name, index, ids, rerank_vectors in searched:
+            if index.ntotal == 0:
+                continue
+            
+            k = min(top_k_per_type, index.ntotal)
+            searchable = index.ntotal
+            selector = search_filter.selector(type_name) if search_filter is not None else None
+            params = None
+            if selector is not None:
+                searchable = min(search_filter.counts[type_name], index.ntotal)
+                k = min(k, searchable)
+                if k == 0:
+                    continue
+                params = search_parameters(index, selector)
+            
+            candidates = min(k * settings.vector_rerank_factor, searchable)
+            if selector is not None and (params is None or (rerank_vectors is not None and searchable <= candidates)):
+                # Compare the matching vectors directly: there are few of them, or the index cannot filter its scan
+                positions = search_filter.positions(type_name)
+                positions = positions[positions < index.ntotal]
+                if rerank_vectors is not None:
+                    vectors = rerank_vectors.take(positions)
+                else:
+                    vectors = index.reconstruct_batch(positions)
+                reranked = _nearest(query_embeddings, vectors, positions, k)
+            elif rerank_vectors is not None:
+                # Over-fetch from the compressed codes, then order each query exactly
+                _, candidate_indices = index.search(query_embeddings, candidates, params=params)
+                reranked = [
+                    rerank_vectors.rerank(query, row, k)
+                    for query, row in zip(query_embeddings, candidate_indices)
+                ]
+            else:
+                distances, indices = index.search(query_embeddings, k, params=params)
+                reranked = zip(distances, indices)
+                    
+            for results, (row_distances, row_indices) in zip(all_results, reranked):
+                for distance, idx in zip(row_distances, row_indices):
+                    if idx < 0:
+                        continue
+                    results.append({
+                        'type': type_name,
+                        'id': ids[idx],
+                        'position': int(idx),
+                        'distance': float(distance)
+                    })
+            
+        # Sort by distance, fuse in lexical matches and limit results
+        for results in all_results:
+            results.sort(key=lambda x: x['distance'])
+        if lexical_hits is not None:
+            for position, hits in enumerate(lexical_hits):
+                if hits:
+                    all_results[position] = self._fuse(query_embeddings[position], all_results[position], hits)
+        return [results[:max_results] for results in all_results]
+    
+    def lexical_key(self, query: str) -> Optional[frozenset[int]]:
+        """
+        What the lexical matches fused into a query's results depend on.
+        
+        Args:
+            query: Query text
+            
+        Returns:
+            Indexed terms of the query, or None when no lexical matches are fused
+        """
+        if not self._fuses_lexical():
+            return None
+        return self.lexical_index.query_terms(query)
+    
+    def _fuses_lexical(self) -> bool:
+        """Whether searches fuse lexical matches: fusion is on and the lexical index is up to date."""
+        return (
+            settings.search_fusion != "none"
+            and self.lexical_index is not None
+            and self.lexical_index.version == self.version
+        )
+    
+    def _lexical_hits(
+        self,
+        query: Optional[str],
+        top_k_per_type: int,
+        collections: Optional[Collection[str]],
+        search_filter: Optional[SearchFilter]
+    ) -> Optional[list[dict]]:
+        """Lexical matches of a query text, or None without a query or an up-to-date lexical index."""
+        if query is None or not self._fuses_lexical():
+            return None
+        return self.lexical_index.search(query, top_k_per_type, collections, search_filter)
+    
+    def _fuse(self, query_embedding: np.ndarray, results: list[dict], lexical_hits: list[dict]) -> list[dict]:
+        """
+        Merge the semantic results and lexical matches of a query by reciprocal rank fusion.
+        
+        An item ranked r in a list scores weight / (RRF_K + r), the semantic
+        ranks with weight 1 and the lexical ones with LEXICAL_WEIGHT, and
+        items are ordered by their summed score. Lexical matches the vector
+        search did not return get their distance computed here.
+        
+        Args:
+            query_embedding: float32 query vector of shape (dimension,)
+            results: Semantic results, nearest first
+            lexical_hits: Lexical matches, best first
+            
+        Returns:
+            Fused results with type, id, vector position, and distance
+        """
+        fused: dict[tuple[str, int], list] = {}
+        for rank, result in enumerate(results, 1):
+            fused[(result['type'], result['position'])] = [result, 1.0 / (settings.rrf_k + rank)]
+        
+        missing: dict[str, list[int]] = {}
+        for rank, hit in enumerate(lexical_hits, 1):
+            key = (hit['type'], hit['position'])
+            score = settings.lexical_weight / (settings.rrf_k + rank)
+            if key in fused:
+                fused[key][1] += score
+            else:
+                fused[key] = [None, score]
+                missing.setdefault(hit['type'], []).append(hit['position'])
+        
+        for type_name, positions in missing.items():
+            name = type_name.lower()
+            distances = self._distances_at(
+                getattr(self, f"{name}_index"),
+                getattr(self, f"{name}_vectors"),
+                query_embedding,
+                np.array(positions, dtype=np.int64)
+            )
+            ids = getattr(self, f"{name}_ids")
+            for position, distance in zip(positions, distances):
+                fused[(type_name, position)][0] = {
+                    'type': type_name,
+                    'id': ids[position],
+                    'position': position,
+                    'distance': float(distance)
+                }
+        
+        ordered = sorted(fused.values(), key=lambda entry: (-entry[1], entry[0]['distance']))
+        return [result for result, _ in ordered]
+    
+    @staticmethod
+    def _distances_at(
+        index: faiss.Index,
+        rerank_vectors: Optional[VectorRows],
+        query_embedding: np.ndarray,
+        positions: np.ndarray
+    ) -> np.ndarray:
+        """Squared L2 distances from a query to the vectors at some positions of a collection."""
+        if rerank_vectors is not None:
+            vectors = rerank_vectors.take(positions)
+        elif isinstance(index, faiss.IndexIVF):
+            # IVF lists cannot be read by position, so scan them all for just these positions
+            selector = faiss.IDSelectorBatch(len(positions), faiss.swig_ptr(positions))
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=index.nlist)
+            distances, found = index.search(query_embedding[np.newaxis], len(positions), params=params)
+            by_position = dict(zip(found[0].tolist(), distances[0].tolist()))
+            return np.array([by_position.get(position, np.inf) for position in positions.tolist()])
+        else:
+            vectors = index.reconstruct_batch(positions)
+        return ((vectors - query_embedding) ** 2).sum(axis=1)
+        
+    def _encode_batch(self, queries: list[str]) -> list[np.ndarray]:
+        """Encode a micro-batch of queries in one forward pass."""
+        embeddings = np.array(self.model.encode(queries)).astype('float32')
+        return [embeddings[i:i + 1] for i in range(len(queries))]
+    
+    def _search_batch(self, requests: list[tuple]) -> list[list[dict]]:
+        """
+        Search a micro-batch of (query embedding, lexical matches, top_k, collections,
+        max_results, filter) requests, one matrix per distinct set of parameters.
+        """
+        positions_by_params: dict[tuple, list[int]] = {}
+        for position, (_, _, *params) in enumerate(requests):
+            positions_by_params.setdefault(tuple(params), []).append(position)
+        
+        results: list[Optional[list[dict]]] = [None] * len(requests)
+        for params, positions in positions_by_params.items():
+            query_embeddings = np.concatenate([requests[position][0] for position in positions])
+            lexical_hits = [requests[position][1] for position in positions]
+            for position, hits in zip(positions, self.search_embeddings(query_embeddings, *params, lexical_hits)):
+                results[position] = hits
+        return results
 
 
 # Global instance
@@ -183,8 +971,10 @@ _vector_store: Optional[VectorStoreService] = None
 
 
 def get_vector_store() -> VectorStoreService:
-    """Get or create vector store instance."""
+    """Get or create vector store instance, reloading indexes another process has changed."""
     global _vector_store
     if _vector_store is None:
         _vector_store = VectorStoreService()
+    else:
+        _vector_store.refresh()
     return _vector_store
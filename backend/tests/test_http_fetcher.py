@@ -0,0 +1,119 @@
+"""Tests for HttpFetcher against a local HTTP server."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.http_fetcher import HttpFetcher
+
+ETAG = '"v1"'
+BODY = b'{"hadiths": []}'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves /data with an ETag, and /flaky with 503s before its first 200."""
+    
+    requests_seen: list[tuple[str, dict]] = []
+    failures_left = 0
+    
+    def do_GET(self):
+        type(self).requests_seen.append((self.path, dict(self.headers)))
+        if self.path == "/data":
+            if self.headers.get("If-None-Match") == ETAG:
+                self._respond(304)
+            else:
+                self._respond(200, BODY, {"ETag": ETAG})
+        elif self.path == "/flaky":
+            if type(self).failures_left > 0:
+                type(self).failures_left -= 1
+                self._respond(503)
+            else:
+                self._respond(200, BODY)
+        else:
+            self._respond(404)
+    
+    def _respond(self, status: int, body: bytes = b"", headers: dict = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    """Local stand-in for the dataset host, reset for each test."""
+    StandInHandler.requests_seen = []
+    StandInHandler.failures_left = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_fetcher(cache_dir, retries: int = 3) -> HttpFetcher:
+    return HttpFetcher(
+        cache_dir=str(cache_dir), concurrency=2, retries=retries, backoff_seconds=0.01, timeout_seconds=5
+    )
+
+
+def test_200_response_is_cached_with_its_etag(server, tmp_path):
+    fetcher = make_fetcher(tmp_path)
+    
+    assert fetcher.fetch(f"{server}/data") == BODY
+    
+    assert fetcher.downloaded == 1
+    assert fetcher.cached(f"{server}/data") == BODY
+    meta, _ = fetcher._read_cache(f"{server}/data")
+    assert meta["etag"] == ETAG
+
+
+def test_conditional_request_is_served_from_cache_on_304(server, tmp_path):
+    make_fetcher(tmp_path).fetch(f"{server}/data")
+    fetcher = make_fetcher(tmp_path)
+    
+    assert fetcher.fetch(f"{server}/data") == BODY
+    
+    assert fetcher.revalidated == 1
+    assert fetcher.downloaded == 0
+    path, headers = StandInHandler.requests_seen[-1]
+    assert path == "/data"
+    assert headers.get("If-None-Match") == ETAG
+
+
+def test_5xx_responses_are_retried(server, tmp_path):
+    StandInHandler.failures_left = 2
+    fetcher = make_fetcher(tmp_path)
+    
+    assert fetcher.fetch(f"{server}/flaky") == BODY
+    
+    assert [path for path, _ in StandInHandler.requests_seen] == ["/flaky"] * 3
+
+
+def test_gives_up_after_the_last_retry(server, tmp_path):
+    StandInHandler.failures_left = 10
+    fetcher = make_fetcher(tmp_path, retries=2)
+    
+    assert fetcher.fetch(f"{server}/flaky") is None
+    
+    assert len(StandInHandler.requests_seen) == 3
+    assert fetcher.cached(f"{server}/flaky") is None
+
+
+def test_falls_back_to_the_cached_body_after_the_last_retry(server, tmp_path):
+    make_fetcher(tmp_path).fetch(f"{server}/flaky")
+    StandInHandler.failures_left = 10
+    fetcher = make_fetcher(tmp_path, retries=2)
+    
+    assert fetcher.fetch(f"{server}/flaky") == BODY
+    
+    assert len(StandInHandler.requests_seen) == 4
+    assert fetcher.downloaded == 0
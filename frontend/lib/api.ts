@@ -18,6 +18,9 @@ export interface GuidanceResponse {
 
 export interface GuidanceRequest {
   emotion_query: string;
+  collections?: GuidanceResult["type"][];
+  top_k_per_type?: number;
+  max_results?: number;
 }
 
 // Custom error class
@@ -78,19 +81,16 @@ export const getGuidance = async (
     emotion_query: query.trim(),
   };
 
+  // Only search the Dua and Hadith indexes when Quran results are not wanted
+  if (excludeQuran) {
+    requestData.collections = ["Dua", "Hadith"];
+  }
+
   const response = await apiClient.post<GuidanceResponse>(
     ROUTES.GUIDANCE,
     requestData
   );
 
-  // Filter out Quran results if excludeQuran is true
-  if (excludeQuran) {
-    response.data.results = response.data.results.filter(
-      (result) => result.type !== "Quran"
-    );
-    response.data.total_results = response.data.results.length;
-  }
-
   return response.data;
 };
 